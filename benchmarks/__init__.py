@@ -0,0 +1 @@
+"""Offline benchmarks: a generated fixture site and an end-to-end hover harness."""
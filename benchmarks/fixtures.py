@@ -0,0 +1,256 @@
+"""
+Generated fixture site for offline hover benchmarks.
+
+Every page exercises one kind of hover behavior, so both speed and detection
+can be checked without network access:
+
+    css_dropdown   CSS :hover dropdown menus
+    js_menu        menus shown by JS mouseenter handlers (aria-expanded)
+    tooltip        JS tooltips (role=tooltip)
+    delayed        content revealed 400 ms after mouseenter
+    nested         three levels of nested :hover submenus
+    large_1k/10k/50k  a dropdown nav on top of ~1k/10k/50k DOM nodes
+
+Usage:
+    with FixtureSite() as site:
+        url = site.url("css_dropdown")
+"""
+
+import threading
+import tempfile
+from functools import partial
+from pathlib import Path
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# Behavior the detector should report for at least one element per page
+EXPECTED_BEHAVIORS = {
+    "css_dropdown": "dropdown",
+    "js_menu": "dropdown",
+    "tooltip": "tooltip",
+    "delayed": "content_revealed",
+    "nested": "dropdown",
+    "large_1k": "dropdown",
+    "large_10k": "dropdown",
+    "large_50k": "dropdown",
+}
+
+LARGE_PAGE_NODES = {"large_1k": 1_000, "large_10k": 10_000, "large_50k": 50_000}
+
+_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+nav > ul { display: flex; gap: 24px; list-style: none; margin: 0; padding: 12px; background: #223; }
+nav a, nav button { color: #fff; text-decoration: none; background: none; border: 0; font-size: 16px; cursor: pointer; }
+li.has-dropdown { position: relative; }
+ul.dropdown { display: none; position: absolute; top: 100%; left: 0; list-style: none; padding: 8px;
+              background: #fff; box-shadow: 0 2px 6px #0004; min-width: 180px; z-index: 10; }
+ul.dropdown a { color: #223; }
+li.has-dropdown:hover > ul.dropdown { display: block; }
+ul.dropdown li.has-dropdown > ul.dropdown { top: 0; left: 100%; }
+.menu-panel { position: absolute; background: #fff; padding: 8px; box-shadow: 0 2px 6px #0004; }
+.menu-panel a { display: block; color: #223; }
+.tooltip { position: absolute; background: #000; color: #fff; padding: 4px 8px; border-radius: 4px; }
+.card { display: inline-block; width: 200px; margin: 16px; padding: 16px; border: 1px solid #ccc; cursor: pointer; }
+.card .details { display: none; }
+.card.open .details { display: block; }
+.grid span { display: inline-block; width: 40px; }
+"""
+
+
+def _page(title: str, body: str, script: str = "") -> str:
+    return (
+        f"<!doctype html><html><head><meta charset='utf-8'><title>{title}</title>"
+        f"<style>{_STYLE}</style></head><body>{body}"
+        f"{f'<script>{script}</script>' if script else ''}</body></html>"
+    )
+
+
+def _dropdown(label: str, links: int, prefix: str) -> str:
+    items = "".join(f"<li><a href='/{prefix}/{i}'>{label} item {i}</a></li>" for i in range(links))
+    return f"<li class='has-dropdown'><a href='/{prefix}'>{label}</a><ul class='dropdown'>{items}</ul></li>"
+
+
+def css_dropdown_page() -> str:
+    """Navigation bar with pure CSS :hover dropdowns."""
+    menus = "".join(_dropdown(label, 5, label.lower()) for label in ("Products", "Solutions", "Resources"))
+    return _page("CSS dropdowns", f"<nav><ul>{menus}<li><a href='/about'>About</a></li></ul></nav>")
+
+
+def js_menu_page() -> str:
+    """Menus rendered on mouseenter by JS, toggling aria-expanded."""
+    buttons = "".join(
+        f"<li><button class='menu-trigger' aria-haspopup='true' aria-expanded='false' data-menu='{name}'>"
+        f"{name}</button></li>"
+        for name in ("Platform", "Pricing", "Company")
+    )
+    script = """
+    document.querySelectorAll('.menu-trigger').forEach((button) => {
+        let panel = null;
+        const item = button.parentElement;
+        item.addEventListener('mouseenter', () => {
+            panel = document.createElement('div');
+            panel.className = 'menu-panel';
+            panel.setAttribute('role', 'menu');
+            for (let i = 0; i < 4; i++) {
+                const link = document.createElement('a');
+                link.href = '/' + button.dataset.menu.toLowerCase() + '/' + i;
+                link.textContent = button.dataset.menu + ' link ' + i;
+                link.setAttribute('role', 'menuitem');
+                panel.appendChild(link);
+            }
+            item.appendChild(panel);
+            button.setAttribute('aria-expanded', 'true');
+        });
+        item.addEventListener('mouseleave', () => {
+            if (panel) panel.remove();
+            panel = null;
+            button.setAttribute('aria-expanded', 'false');
+        });
+    });
+    """
+    return _page("JS menus", f"<nav><ul>{buttons}</ul></nav>", script)
+
+
+def tooltip_page() -> str:
+    """Icons that show a role=tooltip element on mouseenter."""
+    icons = "".join(
+        f"<p>Setting {i} <span class='info' data-tooltip='Explains setting {i}' "
+        f"style='cursor:pointer'>&#9432;</span></p>"
+        for i in range(6)
+    )
+    script = """
+    document.querySelectorAll('.info').forEach((icon) => {
+        let tip = null;
+        icon.addEventListener('mouseenter', () => {
+            tip = document.createElement('div');
+            tip.className = 'tooltip';
+            tip.setAttribute('role', 'tooltip');
+            tip.textContent = icon.dataset.tooltip;
+            document.body.appendChild(tip);
+        });
+        icon.addEventListener('mouseleave', () => { if (tip) tip.remove(); tip = null; });
+    });
+    """
+    return _page("Tooltips", f"<main>{icons}</main>", script)
+
+
+def delayed_page() -> str:
+    """Cards that reveal extra content 400 ms after the pointer enters."""
+    cards = "".join(
+        f"<div class='card' tabindex='0'>Card {i}<div class='details'><p>Details for card {i}</p>"
+        f"<p>More text about card {i}</p></div></div>"
+        for i in range(6)
+    )
+    script = """
+    document.querySelectorAll('.card').forEach((card) => {
+        let timer = null;
+        card.addEventListener('mouseenter', () => {
+            timer = setTimeout(() => card.classList.add('open'), 400);
+        });
+        card.addEventListener('mouseleave', () => { clearTimeout(timer); card.classList.remove('open'); });
+    });
+    """
+    return _page("Delayed reveals", f"<main>{cards}</main>", script)
+
+
+def nested_page() -> str:
+    """Three levels of :hover submenus."""
+    def level(label: str, depth: int) -> str:
+        if depth == 0:
+            return f"<li><a href='/{label}'>{label}</a></li>"
+        children = "".join(level(f"{label}-{i}", depth - 1) for i in range(3))
+        return f"<li class='has-dropdown'><a href='/{label}'>{label}</a><ul class='dropdown'>{children}</ul></li>"
+
+    menus = "".join(level(label, 3) for label in ("Catalog", "Services"))
+    return _page("Nested submenus", f"<nav><ul>{menus}</ul></nav>")
+
+
+def large_page(nodes: int) -> str:
+    """A dropdown nav above a grid padding the DOM to roughly `nodes` elements."""
+    nav = f"<nav><ul>{_dropdown('Products', 5, 'products')}<li><a href='/blog'>Blog</a></li></ul></nav>"
+    # Each row is 1 div + 10 spans + 1 link = 12 nodes
+    rows = []
+    for r in range(max(1, nodes // 12)):
+        cells = "".join(f"<span>{r}.{c}</span>" for c in range(10))
+        rows.append(f"<div class='row'>{cells}<a href='/item/{r}'>Item {r}</a></div>")
+    return _page(f"Large page ({nodes} nodes)", f"{nav}<main class='grid'>{''.join(rows)}</main>")
+
+
+def build_pages() -> Dict[str, str]:
+    """HTML of every fixture page, keyed by page name."""
+    pages = {
+        "css_dropdown": css_dropdown_page(),
+        "js_menu": js_menu_page(),
+        "tooltip": tooltip_page(),
+        "delayed": delayed_page(),
+        "nested": nested_page(),
+    }
+    for name, nodes in LARGE_PAGE_NODES.items():
+        pages[name] = large_page(nodes)
+    index = "".join(f"<li><a href='/{name}.html'>{name}</a></li>" for name in pages)
+    pages["index"] = _page("Hover fixture site", f"<main><ul>{index}</ul></main>")
+    return pages
+
+
+def write_site(root: Path) -> Dict[str, Path]:
+    """Write the fixture pages into root; returns page name -> file path."""
+    root.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name, html in build_pages().items():
+        path = root / f"{name}.html"
+        path.write_text(html, encoding="utf-8")
+        paths[name] = path
+    return paths
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureSite:
+    """
+    The fixture site served from a local HTTP server on a free port.
+
+    Usage:
+        with FixtureSite() as site:
+            await manager.navigate(site.url("tooltip"))
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self._tmp = None if root else tempfile.TemporaryDirectory(prefix="hover-fixtures-")
+        self.root = Path(root) if root else Path(self._tmp.name)
+        self.pages = write_site(self.root)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, page: str = "index") -> str:
+        """URL of a fixture page."""
+        return f"{self.base_url}/{page}.html"
+
+    def start(self) -> "FixtureSite":
+        handler = partial(_QuietHandler, directory=str(self.root))
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
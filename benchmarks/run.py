@@ -0,0 +1,267 @@
+"""
+End-to-end hover benchmark against the local fixture site.
+
+Drives BrowserManager directly (navigate, structure extraction, hovers) and
+the LangChain tools (same calls through the tool layer and session pool),
+then reports:
+
+    - hovers/sec per page
+    - latency percentiles (p50/p90/p99/max) per phase, including the
+      hover_and_detect phases (hover.reset, hover.settle, ...)
+    - structure extraction time, cold and cached
+    - whether the expected behavior was detected on each page
+    - peak RSS of this process plus its browser processes
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --pages css_dropdown,large_10k --repeat 3 --json bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import resource
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from src.browser import BrowserManager, BrowserPool, close_browser
+from src.main import collect_candidates
+from src.timing import percentile
+from .fixtures import EXPECTED_BEHAVIORS, FixtureSite
+
+DEFAULT_PAGES = list(EXPECTED_BEHAVIORS)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p90/p99/max of a list of milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "p50": round(percentile(ordered, 50), 1),
+        "p90": round(percentile(ordered, 90), 1),
+        "p99": round(percentile(ordered, 99), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+class PeakRSS:
+    """
+    Samples resident memory of this process and its children (the browser).
+
+    Needs psutil for the browser processes; without it only this process's
+    peak (getrusage) is reported.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> int:
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.peak_bytes = max(self.peak_bytes, self._sample())
+            except psutil.Error:
+                pass
+
+    def __enter__(self) -> "PeakRSS":
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def result(self) -> dict:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        own_bytes = own if sys.platform == "darwin" else own * 1024
+        return {
+            "python_peak_mb": round(own_bytes / 2**20, 1),
+            "total_peak_mb": round(self.peak_bytes / 2**20, 1) if self.peak_bytes else None,
+        }
+
+
+async def _timed(phases: Dict[str, List[float]], phase: str, coro):
+    started = time.perf_counter()
+    result = await coro
+    phases.setdefault(phase, []).append((time.perf_counter() - started) * 1000)
+    return result
+
+
+async def bench_manager(site: FixtureSite, pages: List[str], output_dir: str, repeat: int,
+                        max_elements: Optional[int], capture_screenshots: bool) -> dict:
+    """Benchmark BrowserManager directly, page by page."""
+    manager = BrowserManager(headless=True, output_dir=output_dir, session_id="bench-manager")
+    phases: Dict[str, List[float]] = {}
+    per_page = {}
+    try:
+        for name in pages:
+            hover_seconds, hovers, detected = 0.0, 0, set()
+            for _ in range(repeat):
+                await _timed(phases, "navigate", manager.navigate(site.url(name)))
+                structure = await _timed(phases, "structure_cold", manager.get_page_structure())
+                await _timed(phases, "structure_cached", manager.get_page_structure())
+                hoverables = await _timed(phases, "hoverables", manager.find_hoverable_elements())
+                targets = collect_candidates(structure, hoverables, max_elements=max_elements)
+
+                started = time.perf_counter()
+                for target in targets:
+                    result = await _timed(phases, "hover", manager.hover_and_detect(
+                        target["selector"], element_name=target["description"],
+                        capture_screenshots=capture_screenshots,
+                    ))
+                    detected.add(result.get("behavior"))
+                    # Phase spans recorded inside hover_and_detect
+                    for phase, ms in result.get("timings", {}).items():
+                        phases.setdefault(f"hover.{phase}", []).append(ms)
+                hover_seconds += time.perf_counter() - started
+                hovers += len(targets)
+
+            per_page[name] = {
+                "hovers": hovers,
+                "hovers_per_sec": round(hovers / hover_seconds, 2) if hover_seconds else None,
+                "structure_cold_ms": round(phases["structure_cold"][-1], 1),
+                "behaviors": sorted(b for b in detected if b),
+                "expected_detected": EXPECTED_BEHAVIORS.get(name) in detected,
+            }
+    finally:
+        await manager.close()
+    return {"pages": per_page, "phases": {phase: percentiles(v) for phase, v in phases.items()}}
+
+
+async def bench_tools(site: FixtureSite, output_dir: str, repeat: int) -> dict:
+    """Benchmark the same calls through the LangChain tools and the session pool."""
+    from src import browser
+    from src.tools import set_session_id, navigate_to_url, get_page_structure, hover_element
+
+    with browser._pool_lock:
+        browser._pool = BrowserPool(headless=True, output_dir=output_dir)
+    set_session_id("bench-tools")
+    # Live report refreshes write under ./output, keep the benchmark self-contained
+    live_report = os.environ.get("LIVE_REPORT")
+    os.environ["LIVE_REPORT"] = "0"
+    phases: Dict[str, List[float]] = {}
+    try:
+        for _ in range(repeat):
+            await _timed(phases, "tool_navigate", navigate_to_url.ainvoke({"url": site.url("css_dropdown")}))
+            await _timed(phases, "tool_structure", get_page_structure.ainvoke({}))
+            await _timed(phases, "tool_hover", hover_element.ainvoke({
+                "selector": 'text="Products"', "description": "Products menu",
+            }))
+    finally:
+        await close_browser()
+        if live_report is None:
+            os.environ.pop("LIVE_REPORT", None)
+        else:
+            os.environ["LIVE_REPORT"] = live_report
+    return {"phases": {phase: percentiles(v) for phase, v in phases.items()}}
+
+
+async def run_benchmarks(pages: List[str], repeat: int = 1, max_elements: Optional[int] = 20,
+                         capture_screenshots: bool = True, tools: bool = True) -> dict:
+    """
+    Run the whole suite against a freshly served fixture site.
+
+    Args:
+        pages: Fixture page names (see benchmarks.fixtures.EXPECTED_BEHAVIORS)
+        repeat: Passes over each page
+        max_elements: Cap on hovered elements per page
+        capture_screenshots: Capture before/after screenshots like real runs
+        tools: Also benchmark the tool layer
+
+    Returns:
+        dict with manager and tool results and peak memory
+    """
+    output_dir = tempfile.mkdtemp(prefix="hover-bench-")
+    started = time.perf_counter()
+    try:
+        with FixtureSite() as site, PeakRSS() as rss:
+            results = {"manager": await bench_manager(site, pages, output_dir, repeat, max_elements,
+                                                      capture_screenshots)}
+            if tools:
+                results["tools"] = await bench_tools(site, output_dir, repeat)
+        results["memory"] = rss.result()
+        results["seconds"] = round(time.perf_counter() - started, 1)
+        return results
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def format_results(results: dict) -> str:
+    """Human-readable tables of a run_benchmarks result."""
+    lines = ["| Page | Hovers | Hovers/sec | Structure (cold ms) | Behaviors | Expected |",
+             "|------|--------|------------|---------------------|-----------|----------|"]
+    for name, page in results["manager"]["pages"].items():
+        lines.append(
+            f"| {name} | {page['hovers']} | {page['hovers_per_sec']} | {page['structure_cold_ms']} "
+            f"| {', '.join(page['behaviors'])} | {'yes' if page['expected_detected'] else 'NO'} |"
+        )
+    lines += ["", "| Phase | n | p50 ms | p90 ms | p99 ms | max ms |",
+              "|-------|---|--------|--------|--------|--------|"]
+    all_phases = dict(results["manager"]["phases"])
+    all_phases.update(results.get("tools", {}).get("phases", {}))
+    for phase, stats in all_phases.items():
+        lines.append(f"| {phase} | {stats['n']} | {stats['p50']} | {stats['p90']} | {stats['p99']} | {stats['max']} |")
+    memory = results["memory"]
+    lines += ["", f"Peak RSS: python {memory['python_peak_mb']} MB, "
+                  f"with browser {memory['total_peak_mb'] if memory['total_peak_mb'] else 'n/a (install psutil)'} MB",
+              f"Total time: {results['seconds']}s"]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="Offline hover benchmark on a local fixture site.")
+    parser.add_argument("--pages", default=",".join(DEFAULT_PAGES),
+                        help=f"Comma-separated fixture pages (default: all of {', '.join(DEFAULT_PAGES)})")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over each page (default: 1)")
+    parser.add_argument("--max-elements", type=int, default=20, help="Hovered elements per page (default: 20)")
+    parser.add_argument("--no-screenshots", action="store_true", help="Skip before/after screenshots")
+    parser.add_argument("--no-tools", action="store_true", help="Skip the tool-layer benchmark")
+    parser.add_argument("--json", help="Also write the raw results to this file")
+    args = parser.parse_args(argv)
+
+    pages = [p.strip() for p in args.pages.split(",") if p.strip()]
+    unknown = [p for p in pages if p not in EXPECTED_BEHAVIORS]
+    if unknown:
+        parser.error(f"Unknown fixture pages: {', '.join(unknown)}")
+
+    results = asyncio.run(run_benchmarks(
+        pages, repeat=max(1, args.repeat), max_elements=args.max_elements,
+        capture_screenshots=not args.no_screenshots, tools=not args.no_tools,
+    ))
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0 if all(p["expected_detected"] for p in results["manager"]["pages"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
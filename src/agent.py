@@ -5,6 +5,7 @@ Exposes a graph that can be served via LangGraph CLI.
 """
 
 import os
+import asyncio
 from pathlib import Path
 from typing import Annotated, TypedDict, Literal
 
@@ -19,7 +20,8 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 
-from src.tools import get_all_tools, set_session_id
+from src.tools import calls_conflict, get_all_tools, set_session_id, tool_resources
+from src.history import compact_history
 from src.browser import close_browser
 
 
@@ -39,18 +41,28 @@ STEP 1: Call navigate_to_url with the provided URL
 STEP 2: Call get_page_structure to understand the page using accessibility tree
          - This shows menus, buttons, links, and hover_candidates
          - Use this to identify which elements are likely to have hover effects
+         - Rows are sorted by "score" (likelihood of a hover behavior): test high scores
+           first and skip elements scoring below zero (e.g. footer links) unless time allows
 STEP 3: Call find_hoverable_elements to get CSS-based hoverable elements
-STEP 4: For EACH element that looks promising:
-         a) Call hover_element(selector, description) to test the hover interaction
+
+         Tool outputs are compact tables: a header "name[rows]{col1|col2}:" followed by one
+         "|"-separated row per element ("sel" is the selector to hover). If an output ends with
+         "more: N rows not shown, call again with cursor=K", call the same tool with cursor=K
+         to see the remaining rows.
+STEP 4: Test the promising elements. Prefer hover_elements_batch to test many elements
+         in one call (e.g. all menu items and hover_candidates at once); use hover_element
+         for single retries (e.g. with force=True). For EACH tested element:
+         a) hover_element / hover_elements_batch tests the hover interaction
             - This automatically saves behavior data to disk for the final report
             - Screenshots are captured automatically (before/after)
 
-         b) Check the hover result behavior type:
+         b) Check the hover result behavior type ("beh"; "id" is the behavior_id):
             - If behavior is "dropdown", "tooltip", or "content_revealed" → call save_gherkin_scenario
-            - If behavior is "no_change" or "unreachable" → DO NOT call save_gherkin_scenario (skip to next element)
+              and pass the result's behavior_id so the scenario is linked to its screenshots
+            - If behavior is "no_change", "style_change" or "unreachable" → DO NOT call save_gherkin_scenario (skip to next element)
 
          IMPORTANT: Only create Gherkin scenarios for INTERACTIVE behaviors!
-         Elements with no_change or unreachable will be summarized in the TLDR only.
+         Elements with no_change, style_change (appearance-only hover effect) or unreachable will be summarized in the TLDR only.
          Note: "unreachable" means the element couldn't be hovered (out of viewport, hidden, or dynamically loaded) - this is normal for modern websites.
 
          Example Gherkin format (ONLY for dropdown/tooltip/content_revealed):
@@ -89,15 +101,16 @@ STEP 7: Provide your summary with the report path and key findings
 
 Available tools:
 - navigate_to_url(url): Navigate to a URL - MUST be called first
-- get_page_structure(): Get accessibility tree analysis - shows menus, buttons, links, hover candidates
-- find_hoverable_elements(): Get CSS-based hoverable elements with selectors
+- get_page_structure(cursor): Get accessibility tree analysis - shows menus, buttons, links, hover candidates
+- find_hoverable_elements(cursor): Get CSS-based hoverable elements with selectors
 - hover_element(selector, description): Test hover - captures screenshots AND saves behavior to disk automatically
-- save_gherkin_scenario(element_name, gherkin_content): Save YOUR custom Gherkin scenario for the element
+- hover_elements_batch(elements, max_seconds): Test many hovers in one call - same as hover_element for each {selector, description}; with max_seconds, elements not reached in time are listed as skipped
+- save_gherkin_scenario(element_name, gherkin_content, behavior_id): Save YOUR custom Gherkin scenario for the element (behavior_id from the hover result)
 - generate_tldr(website_name): Generate executive summary with key metrics and findings - call BEFORE generate_report
 - generate_report(report_title): Generate markdown report (auto-loads behaviors, scenarios, and TLDR from disk)
 
 CRITICAL: You must ALWAYS start by calling navigate_to_url.
-CRITICAL: Only call save_gherkin_scenario for behaviors: dropdown, tooltip, content_revealed. SKIP scenarios for no_change and unreachable behaviors.
+CRITICAL: Only call save_gherkin_scenario for behaviors: dropdown, tooltip, content_revealed. SKIP scenarios for no_change, style_change and unreachable behaviors.
 CRITICAL: After testing all hovers, you MUST call generate_tldr FIRST, then generate_report to create the full documentation."""
 
 
@@ -151,6 +164,60 @@ def get_llm() -> BaseChatModel:
     )
 
 
+async def run_tool_calls(tool_calls: list, tools_by_name: dict) -> list:
+    """
+    Execute one turn's tool calls, concurrently where they don't conflict.
+
+    Calls touching the same resource (see TOOL_RESOURCES in tools.py) run in
+    the order the model issued them; the rest overlap.
+
+    Returns:
+        ToolMessages in the same order as tool_calls
+    """
+    async def run_tool(tool_call: dict, after: list) -> ToolMessage:
+        # Wait for earlier calls that touch the same resources
+        if after:
+            await asyncio.gather(*after, return_exceptions=True)
+
+        tool_name = tool_call["name"]
+        tool_args = tool_call["args"]
+        tool_id = tool_call["id"]
+
+        if tool_name in tools_by_name:
+            tool = tools_by_name[tool_name]
+            try:
+                # Use ainvoke for async tools
+                result = await tool.ainvoke(tool_args)
+                return ToolMessage(
+                    content=str(result),
+                    tool_call_id=tool_id,
+                    name=tool_name
+                )
+            except Exception as e:
+                return ToolMessage(
+                    content=f"Error: {str(e)}",
+                    tool_call_id=tool_id,
+                    name=tool_name
+                )
+        return ToolMessage(
+            content=f"Error: Unknown tool {tool_name}",
+            tool_call_id=tool_id,
+            name=tool_name
+        )
+
+    # Independent calls run concurrently; conflicting ones keep their issue order
+    tasks = []
+    resources = []
+    for tool_call in tool_calls:
+        needs = tool_resources(tool_call["name"], tool_call["args"])
+        after = [task for task, used in zip(tasks, resources) if calls_conflict(used, needs)]
+        tasks.append(asyncio.create_task(run_tool(tool_call, after)))
+        resources.append(needs)
+
+    # gather returns results in call order, so message order is preserved
+    return list(await asyncio.gather(*tasks))
+
+
 def create_graph():
     """Create the LangGraph workflow with LLM tool calling."""
     # Get tools
@@ -189,35 +256,7 @@ def create_graph():
             log.warning("No tool calls found, returning empty messages")
             return {"messages": []}
 
-        tool_messages = []
-        for tool_call in last_message.tool_calls:
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"]
-            tool_id = tool_call["id"]
-
-            if tool_name in tools_by_name:
-                tool = tools_by_name[tool_name]
-                try:
-                    # Use ainvoke for async tools
-                    result = await tool.ainvoke(tool_args)
-                    tool_messages.append(ToolMessage(
-                        content=str(result),
-                        tool_call_id=tool_id,
-                        name=tool_name
-                    ))
-                except Exception as e:
-                    tool_messages.append(ToolMessage(
-                        content=f"Error: {str(e)}",
-                        tool_call_id=tool_id,
-                        name=tool_name
-                    ))
-            else:
-                tool_messages.append(ToolMessage(
-                    content=f"Error: Unknown tool {tool_name}",
-                    tool_call_id=tool_id,
-                    name=tool_name
-                ))
-
+        tool_messages = await run_tool_calls(last_message.tool_calls, tools_by_name)
         return {"messages": tool_messages}
 
     # Define the agent node
@@ -233,6 +272,9 @@ def create_graph():
         if not any(isinstance(m, SystemMessage) for m in messages):
             messages = [SystemMessage(content=SYSTEM_PROMPT)] + list(messages)
 
+        # Summarize old tool traffic; the state itself keeps the full history
+        messages = compact_history(messages)
+
         response = await llm_with_tools.ainvoke(messages)
         return {"messages": [response]}
 
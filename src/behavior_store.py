@@ -0,0 +1,257 @@
+"""
+Indexed store of hover behavior records for one session.
+
+Replaces one pretty-printed JSON file per hover with a single SQLite file
+(output/<session_id>/behaviors.db) indexed by behavior type, selector,
+description and scenario file. Counts and lookups used by the TLDR and
+report are queries instead of globbing and parsing every file.
+
+Page-level timings (navigation, structure extraction) live in the same file,
+next to the hover records that carry their own per-phase timings.
+
+Sessions written before the store existed (behaviors/*.json) are imported
+automatically the first time they are opened.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_logger = logging.getLogger("behavior_store")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS behaviors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        element_description TEXT,
+        selector TEXT,
+        behavior TEXT,
+        link_count INTEGER NOT NULL DEFAULT 0,
+        scenario_file TEXT,
+        data TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_behaviors_behavior ON behaviors(behavior);
+    CREATE INDEX IF NOT EXISTS idx_behaviors_selector ON behaviors(selector);
+    CREATE INDEX IF NOT EXISTS idx_behaviors_description ON behaviors(element_description);
+    CREATE INDEX IF NOT EXISTS idx_behaviors_scenario ON behaviors(scenario_file);
+    CREATE TABLE IF NOT EXISTS timings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        ms REAL NOT NULL,
+        url TEXT,
+        created_at REAL NOT NULL
+    );
+"""
+
+
+class BehaviorStore:
+    """
+    SQLite-backed behavior records for a session output directory.
+
+    Each call opens its own short-lived connection, so the store can be used
+    from the playwright thread, tool threads and parallel workers alike.
+
+    Usage:
+        store = BehaviorStore("output/my-session")
+        behavior_id = store.add("Products menu", {"selector": "#products", "behavior": "dropdown"})
+        store.counts()  # {"dropdown": 1}
+    """
+
+    FILENAME = "behaviors.db"
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / self.FILENAME
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Connection for one transaction: committed on success, rolled back on
+        error and always closed. Creates the schema (and imports legacy files) once.
+        """
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self.output_dir.mkdir(parents=True, exist_ok=True)
+                    is_new = not self.path.exists()
+                    conn = sqlite3.connect(self.path, timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                        if is_new:
+                            self._import_legacy_files(conn)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    self._ready = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy_files(self, conn: sqlite3.Connection) -> None:
+        """Import behaviors/*.json from sessions written before the store existed."""
+        behaviors_dir = self.output_dir / "behaviors"
+        if not behaviors_dir.exists():
+            return
+        imported = 0
+        for bf in sorted(behaviors_dir.glob("*.json")):
+            try:
+                data = json.loads(bf.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, IOError) as e:
+                _logger.warning(f"Failed to load behavior file {bf}: {e}")
+                continue
+            self._insert(conn, data.get("element_description", ""), data)
+            imported += 1
+        if imported:
+            _logger.info(f"Imported {imported} legacy behavior files from {behaviors_dir}")
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, element_description: str, data: dict) -> int:
+        cursor = conn.execute(
+            "INSERT INTO behaviors (element_description, selector, behavior, link_count, scenario_file, data, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                element_description,
+                data.get("selector"),
+                data.get("behavior"),
+                len(data.get("revealed_links") or []),
+                data.get("scenario_file"),
+                json.dumps(data, ensure_ascii=False),
+                time.time(),
+            ),
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> dict:
+        record = json.loads(row["data"])
+        record["id"] = row["id"]
+        if row["element_description"]:
+            record.setdefault("element_description", row["element_description"])
+        if row["scenario_file"]:
+            record["scenario_file"] = row["scenario_file"]
+        return record
+
+    def _query(self, where: str = "", params: tuple = ()) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM behaviors {where} ORDER BY id", params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def add(self, element_description: str, data: dict) -> int:
+        """
+        Append a behavior record.
+
+        Args:
+            element_description: Human-readable element description
+            data: hover_and_detect result
+
+        Returns:
+            ID of the new record
+        """
+        with self._connect() as conn:
+            return self._insert(conn, element_description, data)
+
+    def get(self, behavior_id: int) -> Optional[dict]:
+        """Get one record by ID."""
+        records = self._query("WHERE id = ?", (behavior_id,))
+        return records[0] if records else None
+
+    def all(self) -> List[dict]:
+        """All records in insertion order (each with its "id")."""
+        return self._query()
+
+    def find_by_behavior(self, behavior: str) -> List[dict]:
+        """Records with the given behavior type."""
+        return self._query("WHERE behavior = ?", (behavior,))
+
+    def find_by_selector(self, selector: str) -> List[dict]:
+        """Records hovered with the given selector."""
+        return self._query("WHERE selector = ?", (selector,))
+
+    def find_by_description(self, element_description: str) -> List[dict]:
+        """Records with the given element description."""
+        return self._query("WHERE element_description = ?", (element_description,))
+
+    def link_scenario(self, behavior_id: int, scenario_file: str) -> bool:
+        """
+        Record which scenario file documents a behavior.
+
+        Returns:
+            True if the behavior record exists
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE behaviors SET scenario_file = ? WHERE id = ?", (scenario_file, behavior_id)
+            )
+        return cursor.rowcount > 0
+
+    def latest_unlinked(self, element_description: Optional[str] = None,
+                        behaviors: Optional[Iterable[str]] = None) -> Optional[dict]:
+        """
+        Most recent record without a scenario file.
+
+        Args:
+            element_description: Only consider records with exactly this description
+            behaviors: Only consider these behavior types
+
+        Returns:
+            The record, or None
+        """
+        clauses = ["scenario_file IS NULL"]
+        params: list = []
+        if element_description is not None:
+            clauses.append("element_description = ?")
+            params.append(element_description)
+        if behaviors:
+            behaviors = list(behaviors)
+            clauses.append(f"behavior IN ({', '.join('?' * len(behaviors))})")
+            params.extend(behaviors)
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT * FROM behaviors WHERE {' AND '.join(clauses)} ORDER BY id DESC LIMIT 1", params
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of records per behavior type."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT behavior, COUNT(*) AS n FROM behaviors GROUP BY behavior").fetchall()
+        return {row["behavior"]: row["n"] for row in rows}
+
+    def total(self) -> int:
+        """Number of records."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM behaviors").fetchone()[0]
+
+    def link_total(self, behavior: str) -> int:
+        """Total revealed links across records of a behavior type."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(link_count), 0) FROM behaviors WHERE behavior = ?", (behavior,)
+            ).fetchone()
+        return row[0]
+
+    def add_timing(self, kind: str, ms: float, url: Optional[str] = None) -> None:
+        """Record a page-level timing (e.g. "navigate", "extract") in milliseconds."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO timings (kind, ms, url, created_at) VALUES (?, ?, ?, ?)",
+                (kind, round(ms, 1), url, time.time()),
+            )
+
+    def timings(self) -> List[dict]:
+        """All page-level timings, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, ms, url FROM timings ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
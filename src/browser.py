@@ -1,19 +1,27 @@
 """
 Browser session management for Playwright.
-Maintains a single persistent browser session across all tool calls.
+Maintains persistent browser sessions across tool calls, one per thread,
+pooled inside a single shared Chromium process.
 
 Uses synchronous Playwright API internally to avoid event loop conflicts
 with LangGraph server on Windows (which uses SelectorEventLoop).
 """
 
+import os
 import sys
+import time
 import asyncio
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urljoin
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor
 from functools import partial
+from contextlib import contextmanager, nullcontext
+from itertools import count
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(name)s - %(levelname)s - %(message)s')
@@ -21,6 +29,14 @@ _logger = logging.getLogger("browser")
 
 from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, Playwright
 
+from .visual_diff import compute_visual_diff
+from .behavior_store import BehaviorStore
+from .runtime import BrowserRuntime, run_on
+from .timing import PhaseTimer
+from .profiling import PROFILE_DIRNAME, PageProfiler, profiling_enabled
+from .recycling import HeapProbe, RecyclePolicy
+from .scheduling import past_deadline, sort_by_score
+
 
 @dataclass
 class BrowserSession:
@@ -29,19 +45,620 @@ class BrowserSession:
     browser: Optional[Browser] = None
     context: Optional[BrowserContext] = None
     page: Optional[Page] = None
+    # False when the browser belongs to a SharedBrowser and only the context is ours
+    owns_browser: bool = True
 
     def is_active(self) -> bool:
         """Check if session is active."""
         return self.page is not None and not self.page.is_closed()
 
 
-# Thread pool for running sync Playwright operations
-_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+# Dedicated thread for sync Playwright operations (see runtime.py)
+_executor = BrowserRuntime("playwright")
+
+
+# Settle detection: resolve as soon as the page is visually stable, i.e. no DOM
+# mutations and no running (finite) CSS transitions/animations for a few
+# consecutive animation frames. The old fixed sleeps are only an upper bound.
+SETTLE_QUIET_FRAMES = 2
+# Floor after hovering, so hover-intent handlers (delayed mouseenter) can fire
+HOVER_SETTLE_MIN_MS = 100
+
+# One animation frame of settle detection: installs the mutation observer on
+# first use and reports how many mutations happened since the previous call
+# and whether a (finite) CSS transition/animation is still running.
+_SETTLE_FRAME_JS = """
+    () => {
+        let state = window.__hoverSettle;
+        if (!state) {
+            state = window.__hoverSettle = { mutations: 0 };
+            state.observer = new MutationObserver(records => { state.mutations += records.length; });
+            state.observer.observe(document.documentElement, {
+                subtree: true, childList: true, attributes: true, characterData: true
+            });
+        }
+
+        // Infinite animations (spinners, carousels) never finish, so ignore them
+        const animating = () => {
+            if (!document.getAnimations) return false;
+            return document.getAnimations().some(a =>
+                a.playState === 'running' &&
+                !(a.effect && a.effect.getTiming().iterations === Infinity)
+            );
+        };
+        // rAF stalls in hidden tabs, so race it with a short timer
+        return new Promise(resolve => {
+            let done = false;
+            const report = () => {
+                if (done) return;
+                done = true;
+                const mutations = state.mutations;
+                state.mutations = 0;
+                resolve({ mutations, animating: animating() });
+            };
+            requestAnimationFrame(report);
+            setTimeout(report, 50);
+        });
+    }
+"""
+
+_SETTLE_DONE_JS = """
+    () => {
+        const state = window.__hoverSettle;
+        if (state) {
+            state.observer.disconnect();
+            delete window.__hoverSettle;
+        }
+    }
+"""
+
+
+# Elements whose appearance on hover signals a menu, tooltip or revealed content
+_DIFF_SELECTORS = """[
+    'ul', 'li', 'a', 'button',
+    '[class*="dropdown"]', '[class*="menu"]', '[class*="submenu"]',
+    '[class*="popup"]', '[class*="tooltip"]', '[class*="popover"]',
+    '[role="menu"]', '[role="listbox"]', '[role="tooltip"]'
+].join(', ')"""
+
+# Shared in-page helpers: visibility test (cheap rect checks before computed style)
+# and the element description sent back to Python
+_DIFF_HELPERS_JS = """
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width <= 0 || rect.height <= 0) return false;
+        if (rect.top >= window.innerHeight || rect.bottom <= 0) return false;
+        const style = window.getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+    };
+    const describe = (el) => {
+        const rect = el.getBoundingClientRect();
+        const className = typeof el.className === 'string' ? el.className : '';
+        const text = (el.innerText || '').trim();
+        return {
+            tag: el.tagName,
+            className: className,
+            id: el.id || '',
+            text: text.substring(0, 50),
+            href: el.getAttribute('href') || '',
+            top: Math.round(rect.top),
+            left: Math.round(rect.left),
+            // Create unique key for comparison
+            key: `${el.tagName}-${className}-${text.substring(0, 30)}-${Math.round(rect.top)}-${Math.round(rect.left)}`
+        };
+    };
+"""
+
+# "scan" diff mode: list every visible candidate (run before and after the hover)
+_VISIBLE_ELEMENTS_JS = """
+    () => {
+        %s
+        const elements = [];
+        document.querySelectorAll(%s).forEach(el => {
+            if (isVisible(el)) elements.push(describe(el));
+        });
+        return elements;
+    }
+""" % (_DIFF_HELPERS_JS, _DIFF_SELECTORS)
+
+# "observer" diff mode: remember what is visible and watch mutations in the page,
+# then return only the delta. Elements stay in page memory instead of being
+# serialized across CDP twice per hover.
+_HOVER_DIFF_START_JS = """
+    () => {
+        %s
+        const SELECTOR = %s;
+        if (window.__hoverDiff) window.__hoverDiff.observer.disconnect();
+
+        const baseline = new WeakSet();
+        document.querySelectorAll(SELECTOR).forEach(el => {
+            if (isVisible(el)) baseline.add(el);
+        });
+
+        // Nodes added, un-hidden or restyled while the hover is active
+        const touched = new Set();
+        const HIDDEN_STYLE = /display:\\s*none|visibility:\\s*hidden|opacity:\\s*0(?![.\\d])/;
+        const record = (records) => {
+            for (const r of records) {
+                if (r.type === 'childList') {
+                    r.addedNodes.forEach(n => { if (n.nodeType === 1) touched.add(n); });
+                } else if (r.target.nodeType === 1) {
+                    const name = r.attributeName;
+                    const wasHidden = (
+                        name === 'hidden' || name === 'aria-hidden' || name === 'open' ||
+                        (name === 'style' && HIDDEN_STYLE.test(r.oldValue || ''))
+                    );
+                    if (wasHidden || r.target.matches(SELECTOR)) touched.add(r.target);
+                }
+            }
+        };
+        const observer = new MutationObserver(record);
+        observer.observe(document.documentElement, {
+            subtree: true, childList: true, attributes: true, attributeOldValue: true,
+            attributeFilter: ['style', 'class', 'hidden', 'aria-hidden', 'aria-expanded', 'open']
+        });
+        window.__hoverDiff = { baseline, touched, observer, record, selector: SELECTOR };
+        return true;
+    }
+""" % (_DIFF_HELPERS_JS, _DIFF_SELECTORS)
+
+_HOVER_DIFF_COLLECT_JS = """
+    () => {
+        %s
+        const state = window.__hoverDiff;
+        if (!state) return null;
+        state.record(state.observer.takeRecords());
+        state.observer.disconnect();
+        delete window.__hoverDiff;
+
+        const out = [];
+        const seen = new Set();
+        const consider = (el) => {
+            if (seen.has(el) || state.baseline.has(el)) return;
+            seen.add(el);
+            if (isVisible(el)) out.push(describe(el));
+        };
+        // CSS :hover reveals produce no mutations, so re-check candidates
+        // that were not visible before (visible ones are skipped outright)
+        document.querySelectorAll(state.selector).forEach(consider);
+        state.touched.forEach(el => {
+            if (el.isConnected) consider(el);
+        });
+        return out;
+    }
+""" % _DIFF_HELPERS_JS
+
+
+# Single-pass page extractor shared by get_page_structure and find_hoverable_elements.
+# Visits every element once, computes its rect once and its computed style only
+# when a style-dependent category (hover candidate, hoverable) could apply.
+_EXTRACT_PAGE_JS = """
+    () => {
+        const menus = { menubar: [], menu: [], menuitem: [], menuitemcheckbox: [], menuitemradio: [] };
+        const buttons = { role: [], tag: [] };
+        const links = { role: [], tag: [] };
+        const landmarks = {
+            navigation: [], banner: [], main: [], complementary: [],
+            NAV: [], HEADER: [], MAIN: [], ASIDE: []
+        };
+        const hover_candidates = [];
+        const hoverables = [];
+        const seenHoverables = new Set();
+        let hoverableIndex = 0;
+        const has = (obj, key) => Object.prototype.hasOwnProperty.call(obj, key);
+
+        // Scoring features (see scheduling.py)
+        const LANDMARK_ROLES = { NAV: 'navigation', HEADER: 'banner', FOOTER: 'contentinfo', MAIN: 'main', ASIDE: 'complementary' };
+        const LANDMARK_SELECTOR = 'nav, header, footer, main, aside, [role="navigation"], [role="banner"], ' +
+            '[role="contentinfo"], [role="main"], [role="complementary"]';
+        const LIST_SELECTOR = 'ul, ol, [role="menu"], [role="listbox"]';
+        const DROPDOWN_CLASS = /dropdown|submenu|sub-menu|menu|mega|flyout/i;
+
+        // Helper to build selector for an element
+        function buildSelector(el, text) {
+            if (el.id) return '#' + el.id;
+            if (el.getAttribute('data-testid')) return `[data-testid="${el.getAttribute('data-testid')}"]`;
+
+            if (text && text.length < 30 && text.length > 0) {
+                return `text="${text}"`;
+            }
+
+            // Fallback to tag + class
+            let selector = el.tagName.toLowerCase();
+            if (el.className && typeof el.className === 'string') {
+                const mainClass = el.className.split(' ')[0];
+                if (mainClass) selector += '.' + mainClass;
+            }
+            return selector;
+        }
+
+        for (const el of document.getElementsByTagName('*')) {
+            const tag = el.tagName;
+            const role = el.getAttribute('role');
+            const cls = el.getAttribute('class') || '';
+
+            // Matches for find_hoverable_elements are counted before visibility,
+            // like the querySelectorAll index they replace
+            const isHoverable = (
+                tag === 'A' || tag === 'BUTTON' || role === 'button' || role === 'menuitem' ||
+                cls.includes('dropdown') || cls.includes('menu')
+            );
+            const index = isHoverable ? hoverableIndex++ : -1;
+
+            const rect = el.getBoundingClientRect();
+            if (rect.width === 0 || rect.height === 0) continue;
+
+            let text;
+            const getText = () => {
+                if (text === undefined) text = (el.innerText || el.getAttribute('aria-label') || '').trim();
+                return text;
+            };
+            const hasPopup = el.getAttribute('aria-haspopup');
+            const expanded = el.getAttribute('aria-expanded');
+            // Landmark and list lookups only for elements that get collected
+            let features;
+            const getFeatures = () => {
+                if (features === undefined) {
+                    const landmark = el.closest(LANDMARK_SELECTOR);
+                    const parent = el.parentElement;
+                    features = {
+                        landmark: landmark ? (landmark.getAttribute('role') || LANDMARK_ROLES[landmark.tagName]) : null,
+                        childList: el.querySelector(LIST_SELECTOR) !== null || (
+                            parent !== null && parent.tagName === 'LI' &&
+                            Array.from(parent.children).some(c => c !== el && c.matches(LIST_SELECTOR))
+                        ),
+                        dropdownClass: DROPDOWN_CLASS.test(cls),
+                    };
+                }
+                return features;
+            };
+
+            // Collect menu elements
+            if (role && has(menus, role)) {
+                menus[role].push({
+                    role: role,
+                    name: getText().substring(0, 50),
+                    selector: buildSelector(el, getText()),
+                    hasPopup: hasPopup,
+                    expanded: expanded,
+                    ...getFeatures(),
+                });
+            }
+
+            // Collect buttons
+            if (role === 'button' || tag === 'BUTTON') {
+                const item = {
+                    role: 'button',
+                    name: getText().substring(0, 50),
+                    selector: buildSelector(el, getText()),
+                    hasPopup: hasPopup,
+                    expanded: expanded,
+                    ...getFeatures(),
+                };
+                if (role === 'button') buttons.role.push(item);
+                if (tag === 'BUTTON') buttons.tag.push(item);
+            }
+
+            // Collect links (skip links without text)
+            const isHrefLink = tag === 'A' && el.hasAttribute('href');
+            if ((role === 'link' || isHrefLink) && getText()) {
+                const item = {
+                    role: 'link',
+                    name: getText().substring(0, 50),
+                    href: el.getAttribute('href'),
+                    selector: buildSelector(el, getText()),
+                    hasPopup: hasPopup,
+                    ...getFeatures(),
+                };
+                if (role === 'link') links.role.push(item);
+                if (isHrefLink) links.tag.push(item);
+            }
+
+            // Collect landmarks
+            const landmarkKeys = [];
+            if (role && has(landmarks, role) && role === role.toLowerCase()) landmarkKeys.push(role);
+            if (has(landmarks, tag)) landmarkKeys.push(tag);
+            landmarkKeys.forEach(key => landmarks[key].push({
+                role: role || tag.toLowerCase(),
+                name: el.getAttribute('aria-label') || '',
+                selector: buildSelector(el, getText()),
+            }));
+
+            // Computed style only for elements that could need it
+            const hasAriaExpanded = expanded !== null;
+            const hasDataToggle = el.getAttribute('data-toggle') || el.getAttribute('data-bs-toggle');
+            const hasDropdownClass = cls.includes('dropdown') || cls.includes('menu') || cls.includes('nav');
+            if (!(hasPopup || hasAriaExpanded || hasDataToggle || hasDropdownClass || isHoverable)) continue;
+
+            const style = window.getComputedStyle(el);
+            if (style.display === 'none' || style.visibility === 'hidden') continue;
+            const hasPointerCursor = style.cursor === 'pointer';
+
+            // Hover candidates - elements likely to have hover behavior
+            if (hasPopup || hasAriaExpanded || hasDataToggle || (hasDropdownClass && hasPointerCursor)) {
+                hover_candidates.push({
+                    tag: tag,
+                    name: getText().substring(0, 50),
+                    selector: buildSelector(el, getText()),
+                    ariaPopup: hasPopup,
+                    ariaExpanded: expanded,
+                    dataToggle: hasDataToggle || null,
+                    role: role,
+                    ...getFeatures(),
+                });
+            }
+
+            // Hoverable elements (find_hoverable_elements)
+            if (isHoverable) {
+                const hoverText = getText().substring(0, 50);
+                const key = `${tag}-${hoverText}`;
+
+                // Skip duplicates
+                if (seenHoverables.has(key)) continue;
+                seenHoverables.add(key);
+
+                // Build a reliable selector
+                let selector = '';
+                if (el.id) {
+                    selector = `#${el.id}`;
+                } else if (el.getAttribute('data-testid')) {
+                    selector = `[data-testid="${el.getAttribute('data-testid')}"]`;
+                } else if (hoverText && hoverText.length > 0 && hoverText.length < 30) {
+                    selector = `text="${hoverText}"`;
+                } else {
+                    selector = `${tag.toLowerCase()}:nth-of-type(${index + 1})`;
+                }
+
+                hoverables.push({
+                    tag: tag,
+                    text: hoverText,
+                    selector: selector,
+                    hasExpandButton: el.querySelector('[class*="expand"], [class*="arrow"], [class*="caret"]') !== null,
+                    cursor: style.cursor,
+                    ...getFeatures(),
+                });
+            }
+        }
 
+        return {
+            title: document.title,
+            url: location.href,
+            menus: Object.values(menus).flat(),
+            buttons: [...buttons.role, ...buttons.tag],
+            links: [...links.role, ...links.tag],
+            landmarks: Object.values(landmarks).flat(),
+            hover_candidates: hover_candidates,
+            hoverables: hoverables,
+        };
+    }
+"""
 
-def _run_in_thread(func, *args, **kwargs):
-    """Run a sync function in the playwright thread."""
-    return _executor.submit(func, *args, **kwargs).result()
+
+_SCROLL_POSITION_JS = "() => [Math.round(window.scrollX), Math.round(window.scrollY)]"
+
+# Cheap DOM fingerprint for the structure cache: URL, element count and a hash of
+# every element's tag and state attributes, so a menu opened or closed by a class
+# or aria-expanded toggle invalidates the cache even when no node was added
+_DOM_FINGERPRINT_JS = """
+    () => {
+        let hash = 5381;
+        const mix = (value) => {
+            for (let i = 0; i < value.length; i++) hash = ((hash << 5) + hash + value.charCodeAt(i)) | 0;
+        };
+        // Attributes that open, close or restyle menus without adding nodes
+        const STATE_ATTRS = ['class', 'style', 'hidden', 'open', 'aria-expanded', 'aria-hidden'];
+        const all = document.body ? document.body.getElementsByTagName('*') : [];
+        for (let i = 0; i < all.length; i++) {
+            const el = all[i];
+            mix(el.tagName);
+            for (const name of STATE_ATTRS) {
+                const value = el.getAttribute(name);
+                if (value !== null) mix(name + '=' + value);
+            }
+        }
+        return `${location.href}|${all.length}|${(hash >>> 0).toString(16)}`;
+    }
+"""
+
+# Page extractions kept per session (different DOM states of the current URL)
+STRUCTURE_CACHE_SIZE = 4
+
+# Component fingerprint per selector: where the element sits (landmark + path
+# inside it) and a structural hash of its component subtree (the enclosing
+# menu item, or the element itself). The same header nav on two pages of a
+# site gets the same fingerprint, so its hover result can be reused.
+# With withStyles, computed styles of the subtree and the text of every
+# :hover rule that can apply to it are hashed too, so a CSS-only change to a
+# hover effect changes the fingerprint (used by incremental runs).
+_COMPONENT_FINGERPRINT_JS = """
+    ([elements, withStyles]) => {
+        const STYLE_PROPS = ['display', 'visibility', 'opacity', 'position', 'transform',
+            'transition', 'color', 'background-color', 'z-index'];
+        const MAX_STYLED_NODES = 50;
+        const LANDMARKS = 'header, nav, footer, main, aside, [role="banner"], [role="navigation"], '
+            + '[role="contentinfo"], [role="main"], [role="complementary"]';
+        const MAX_NODES = 400;
+        const hash = (value, seed) => {
+            let h = seed >>> 0;
+            for (let i = 0; i < value.length; i++) {
+                h ^= value.charCodeAt(i);
+                h = Math.imul(h, 16777619);
+            }
+            return (h >>> 0).toString(16).padStart(8, '0');
+        };
+        const pathFrom = (ancestor, el) => {
+            const parts = [];
+            for (let node = el; node && node !== ancestor && node.parentElement; node = node.parentElement) {
+                let index = 1;
+                for (let sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+                    if (sib.tagName === node.tagName) index++;
+                }
+                parts.unshift(node.tagName.toLowerCase() + ':' + index);
+            }
+            return parts.join('>');
+        };
+        const subtree = (root) => {
+            const parts = [];
+            const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+            for (let node = root; node && parts.length < MAX_NODES; node = walker.nextNode()) {
+                parts.push([
+                    node.tagName,
+                    node.getAttribute('role') || '',
+                    [...node.classList].sort().join('.'),
+                    node.getAttribute('href') || '',
+                    node.childElementCount,
+                ].join('|'));
+            }
+            return parts.join(';');
+        };
+
+        // :hover rules as {bases: selectors with the :hover part cut off, text}
+        let hoverRules = null;
+        const collectHoverRules = () => {
+            const rules = [];
+            const visit = (list) => {
+                for (const rule of list) {
+                    if (rule.selectorText) {
+                        if (rule.selectorText.includes(':hover')) rules.push({
+                            bases: rule.selectorText.split(',')
+                                .map(part => part.split(':hover')[0].trim())
+                                .filter(Boolean),
+                            text: rule.cssText,
+                        });
+                    } else if (rule.cssRules) {
+                        visit(rule.cssRules);
+                    }
+                }
+            };
+            for (const sheet of document.styleSheets) {
+                // Cross-origin sheets can't be read; their URL still counts
+                try { visit(sheet.cssRules); } catch (e) { rules.push({bases: [], text: 'sheet:' + sheet.href}); }
+            }
+            return rules;
+        };
+        const styleState = (el, root) => {
+            hoverRules = hoverRules || collectHoverRules();
+            const nodes = [el, root, ...root.querySelectorAll('*')].slice(0, MAX_STYLED_NODES);
+            const parts = nodes.map(node => {
+                const style = getComputedStyle(node);
+                return STYLE_PROPS.map(prop => style.getPropertyValue(prop)).join(',');
+            });
+            for (const rule of hoverRules) {
+                const applies = !rule.bases.length || rule.bases.some(base => {
+                    try { return root.closest(base) || root.querySelector(base); } catch (e) { return false; }
+                });
+                if (applies) parts.push(rule.text);
+            }
+            return parts.join(';');
+        };
+
+        return elements.map(el => {
+            if (!el) return null;
+            const landmark = el.closest(LANDMARKS);
+            const where = landmark
+                ? (landmark.getAttribute('role') || landmark.tagName.toLowerCase())
+                    + '[' + (landmark.getAttribute('aria-label') || '') + ']'
+                : 'body';
+            const root = el.closest('li, [role="menuitem"]') || el;
+            const text = (el.innerText || el.textContent || '').trim().replace(/\\s+/g, ' ').slice(0, 80);
+            const parts = [where, pathFrom(landmark || document.body, el), text, subtree(root)];
+            if (withStyles) parts.push(styleState(el, root));
+            const key = parts.join('#');
+            return hash(key, 2166136261) + hash(key, 374761393);
+        });
+    }
+"""
+
+
+def _classify_new_elements(new_elements: list) -> tuple:
+    """
+    Classify hover behavior from the elements that appeared.
+
+    Returns:
+        (behavior, revealed_links)
+    """
+    # Filter to get only links from new elements
+    revealed_links = [
+        {"text": el['text'], "href": el['href']}
+        for el in new_elements
+        if el['tag'] == 'A' and el['href']
+    ]
+
+    # Determine behavior
+    behavior = "no_change"
+    if len(new_elements) > 0:
+        # Check what type of elements appeared
+        has_menu_items = any(
+            'menu' in el.get('className', '').lower() or
+            'dropdown' in el.get('className', '').lower() or
+            el['tag'] in ('LI', 'UL')
+            for el in new_elements
+        )
+        has_tooltip = any(
+            'tooltip' in el.get('className', '').lower() or
+            'popover' in el.get('className', '').lower()
+            for el in new_elements
+        )
+
+        if has_menu_items or len(revealed_links) > 0:
+            behavior = "dropdown"
+        elif has_tooltip:
+            behavior = "tooltip"
+        else:
+            behavior = "content_revealed"
+
+    return behavior, revealed_links
+
+
+def _prepare_thread_loop() -> None:
+    """On Windows, ensure ProactorEventLoop policy for the playwright thread."""
+    if sys.platform == "win32":
+        _logger.info("Setting ProactorEventLoop policy in thread")
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        # Create a new event loop for this thread with ProactorEventLoop
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+
+class SharedBrowser:
+    """
+    A single Playwright/Chromium process shared by pooled sessions.
+
+    Each BrowserManager attached to it opens its own BrowserContext, so
+    sessions stay isolated (cookies, storage, page state) without paying
+    for a Chromium launch per session. All methods run in the playwright thread.
+    """
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+
+    def is_connected(self) -> bool:
+        """Check if the shared browser is running."""
+        return self.browser is not None and self.browser.is_connected()
+
+    def _ensure_sync(self) -> Browser:
+        """Launch the browser if needed and return it (sync, runs in thread)."""
+        if not self.is_connected():
+            self._close_sync()
+            _prepare_thread_loop()
+            _logger.info("Launching shared browser")
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=self.headless)
+        return self.browser
+
+    def _close_sync(self) -> None:
+        """Close the shared browser (sync, runs in thread)."""
+        if self.browser:
+            try:
+                self.browser.close()
+            except Exception as e:
+                _logger.warning(f"Failed to close shared browser: {e}")
+        if self.playwright:
+            self.playwright.stop()
+        self.browser = None
+        self.playwright = None
 
 
 class BrowserManager:
@@ -58,10 +675,46 @@ class BrowserManager:
         await manager.close()
     """
 
-    def __init__(self, headless: bool = False, output_dir: str = "output", session_id: str = None):
+    def __init__(self, headless: bool = False, output_dir: str = "output", session_id: str = None,
+                 shared_browser: Optional[SharedBrowser] = None,
+                 executor: Optional[Executor] = None,
+                 settle: bool = True,
+                 diff_mode: str = "observer",
+                 profile: Optional[bool] = None,
+                 recycle_policy: Optional[RecyclePolicy] = None,
+                 storage_state: Optional[dict] = None,
+                 timing_prefix: str = ""):
         self.headless = headless
+        # Cookies and localStorage every new context starts with (parallel
+        # workers inherit the parent's consent banners and logins this way)
+        self.storage_state = storage_state
+        # Prepended to page-level timing kinds ("worker." keeps parallel
+        # workers' navigations out of the session's navigate stats)
+        self.timing_prefix = timing_prefix
+        # Wait for visual stability instead of fixed sleeps (False restores fixed delays)
+        self.settle = settle
+        # "observer": in-page delta of the hover window; "scan": full before/after lists
+        if diff_mode not in ("observer", "scan"):
+            raise ValueError(f"Unknown diff_mode: {diff_mode}")
+        self.diff_mode = diff_mode
+        # Playwright trace + CDP metrics per context (None: HOVER_PROFILE)
+        self.profile = profiling_enabled() if profile is None else profile
+        self._profiler: Optional[PageProfiler] = None
+        # Long-lived sessions replace their context past these thresholds
+        self.recycle_policy = recycle_policy or RecyclePolicy.from_env()
+        self.recycles = 0
+        self._hovers = 0
+        self._navigations = 0
+        self._heap_probe: Optional[HeapProbe] = None
         self._session = BrowserSession()
         self.session_id = session_id
+        self._shared_browser = shared_browser
+        # Operations started and not finished yet; BrowserPool never evicts a busy session
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        # Runtime thread this manager's Playwright objects live on (see runtime.py).
+        # Parallel hover workers pass their own BrowserRuntime.
+        self._executor = executor or _executor
 
         # Organize output by session_id if provided
         base_output = Path(output_dir)
@@ -72,96 +725,314 @@ class BrowserManager:
 
         self.screenshots_dir = self.output_dir / "screenshots"
         self.scenarios_dir = self.output_dir / "scenarios"
-        self.behaviors_dir = self.output_dir / "behaviors"
-        self._screenshot_counter = 0
-        self._behavior_counter = 0
+        self.behaviors = BehaviorStore(self.output_dir)
+        # Page extraction results keyed by DOM fingerprint (cleared on navigation)
+        self._extraction_cache: "OrderedDict[str, dict]" = OrderedDict()
+        # Shared with parallel hover workers so screenshot labels never collide
+        self._screenshot_seq = count(1)
 
     def _create_session_sync(self) -> None:
         """Create a new browser session (sync, runs in thread)."""
         _logger.info(f"_create_session_sync called, platform={sys.platform}")
 
-        # On Windows, ensure ProactorEventLoop policy for this thread
-        if sys.platform == "win32":
-            _logger.info("Setting ProactorEventLoop policy in thread")
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-            # Create a new event loop for this thread with ProactorEventLoop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        _logger.info("Starting sync_playwright")
-        self._session.playwright = sync_playwright().start()
-        _logger.info("sync_playwright started successfully")
-        self._session.browser = self._session.playwright.chromium.launch(
-            headless=self.headless
-        )
-        self._session.context = self._session.browser.new_context()
+        # Drop whatever is left of a previous (closed) page before starting over
+        self._close_sync()
+
+        if self._shared_browser is not None:
+            browser = self._shared_browser._ensure_sync()
+            self._session = BrowserSession(browser=browser, owns_browser=False)
+        else:
+            _prepare_thread_loop()
+            _logger.info("Starting sync_playwright")
+            self._session.playwright = sync_playwright().start()
+            _logger.info("sync_playwright started successfully")
+            self._session.browser = self._session.playwright.chromium.launch(
+                headless=self.headless
+            )
+        self._open_context_sync()
+
+    def _open_context_sync(self, storage_state: Optional[dict] = None) -> None:
+        """
+        Open a fresh context and page on the session's browser (sync, runs in thread).
+
+        Args:
+            storage_state: Cookies and localStorage to start from (default: self.storage_state)
+        """
+        storage_state = storage_state if storage_state is not None else self.storage_state
+        if storage_state is not None:
+            self._session.context = self._session.browser.new_context(storage_state=storage_state)
+        else:
+            self._session.context = self._session.browser.new_context()
         self._session.page = self._session.context.new_page()
+        self._hovers = 0
+        self._navigations = 0
+        self._heap_probe = None
+        if self.profile:
+            self._profiler = PageProfiler(self.output_dir / PROFILE_DIRNAME)
+            self._profiler.start(self._session.context, self._session.page)
+
+    def _maybe_recycle_sync(self, restore: bool) -> None:
+        """
+        Replace the context if the recycle policy says so (sync, runs in thread).
+
+        Args:
+            restore: Send the new page back to the current URL (False before a navigation)
+        """
+        policy = self.recycle_policy
+        heap = None
+        if policy.should_sample_heap(self._hovers + self._navigations):
+            if self._heap_probe is None:
+                self._heap_probe = HeapProbe(self._session.context, self._session.page)
+            heap = self._heap_probe.sample()
+        reason = policy.reason(self._hovers, self._navigations, heap)
+        if reason:
+            self._recycle_sync(reason, restore)
+
+    def _recycle_sync(self, reason: str, restore: bool = True) -> None:
+        """Close the page and context, open new ones and restore the URL (sync, runs in thread)."""
+        url = self._session.page.url if restore else None
+        _logger.info(f"Recycling browser context of session {self.session_id} after {reason}")
+        started = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler = None
+        # Carry logins and consent gained during the session into the new context
+        storage_state = None
+        try:
+            storage_state = self._session.context.storage_state()
+        except Exception as e:
+            _logger.warning(f"Failed to export storage state before recycling: {e}")
+        try:
+            self._session.context.close()
+        except Exception as e:
+            _logger.warning(f"Failed to close browser context: {e}")
+        self._open_context_sync(storage_state)
+        self._extraction_cache.clear()
+        self.recycles += 1
+        if url and url != "about:blank":
+            self._session.page.goto(url, wait_until="networkidle")
+        self._record_timing("recycle", started, url)
 
     def _close_sync(self) -> None:
         """Close browser and cleanup resources (sync, runs in thread)."""
-        if self._session.browser:
-            self._session.browser.close()
-        if self._session.playwright:
-            self._session.playwright.stop()
+        if self._profiler is not None:
+            # The trace has to be saved while the context is still open
+            self._profiler.stop()
+            self._profiler = None
+        if not self._session.owns_browser:
+            # Shared browser: only our context goes away
+            if self._session.context:
+                try:
+                    self._session.context.close()
+                except Exception as e:
+                    _logger.warning(f"Failed to close browser context: {e}")
+        else:
+            if self._session.browser:
+                self._session.browser.close()
+            if self._session.playwright:
+                self._session.playwright.stop()
         self._session = BrowserSession()
+        self._heap_probe = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether an operation on this session is in flight."""
+        return self._in_flight > 0
+
+    @contextmanager
+    def _busy(self):
+        """Mark the session busy for the duration of a block (nests)."""
+        with self._in_flight_lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    async def _run(self, func, *args):
+        """Run a sync method on this manager's runtime thread, marked busy meanwhile."""
+        with self._busy():
+            return await run_on(self._executor, func, *args)
 
     async def get_page(self) -> Page:
         """Get the current page, creating browser if needed."""
         if not self._session.is_active():
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(_executor, self._create_session_sync)
+            await self._run(self._create_session_sync)
         return self._session.page
 
     async def close(self) -> None:
         """Close browser and cleanup resources."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(_executor, self._close_sync)
+        await run_on(self._executor, self._close_sync)
+
+    def _storage_state_sync(self) -> Optional[dict]:
+        """Cookies and localStorage of the current context (sync, runs in thread)."""
+        if not self._session.is_active():
+            return None
+        return self._session.context.storage_state()
+
+    async def export_storage_state(self) -> Optional[dict]:
+        """Cookies and localStorage of the current context, or None without a session."""
+        return await self._run(self._storage_state_sync)
+
+    def _record_timing(self, kind: str, started: float, url: Optional[str] = None) -> None:
+        """Store a page-level timing for the session metrics (never raises)."""
+        try:
+            self.behaviors.add_timing(self.timing_prefix + kind, (time.perf_counter() - started) * 1000, url)
+        except Exception as e:
+            _logger.warning(f"Failed to record {kind} timing: {e}")
+
+    def _profiled(self, kind: str, label: Optional[str] = None):
+        """Profiler window around a block (no-op unless profiling is on)."""
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.window(kind, label)
 
     def _navigate_sync(self, url: str) -> str:
         """Navigate to URL (sync, runs in thread)."""
-        self._session.page.goto(url, wait_until="networkidle")
+        self._maybe_recycle_sync(restore=False)
+        self._navigations += 1
+        self._extraction_cache.clear()
+        started = time.perf_counter()
+        with self._profiled("navigate", url):
+            self._session.page.goto(url, wait_until="networkidle")
+        self._record_timing("navigate", started, url)
         return self._session.page.title()
 
     async def navigate(self, url: str) -> str:
         """Navigate to URL and return page title."""
         await self.get_page()  # Ensure session exists
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self._navigate_sync, url)
+        return await self._run(self._navigate_sync, url)
+
+    def _settle_sync(self, max_ms: int, min_ms: int = 0) -> int:
+        """
+        Wait until the page is visually stable, at most max_ms (sync, runs in thread).
+
+        Returns:
+            Milliseconds actually waited
+        """
+        page = self._session.page
+        if not self.settle:
+            page.wait_for_timeout(max_ms)
+            return max_ms
+        started = time.perf_counter()
+
+        def elapsed() -> int:
+            return round((time.perf_counter() - started) * 1000)
+
+        quiet = 0
+        try:
+            while elapsed() < max_ms:
+                frame = page.evaluate(_SETTLE_FRAME_JS)
+                if frame["mutations"] or frame["animating"]:
+                    quiet = 0
+                else:
+                    quiet += 1
+                    if quiet >= SETTLE_QUIET_FRAMES and elapsed() >= min_ms:
+                        break
+        except Exception as e:
+            # Execution context destroyed (e.g. navigation) - wait out the rest as a fixed delay
+            _logger.debug(f"Settle detection failed, using fixed delay: {e}")
+            page.wait_for_timeout(max(0, max_ms - elapsed()))
+            return max(max_ms, elapsed())
+        try:
+            page.evaluate(_SETTLE_DONE_JS)
+        except Exception:
+            pass  # the page navigated away, taking the observer with it
+        return elapsed()
+
+    def _store_screenshot(self, name: str, png: bytes) -> str:
+        """
+        Store PNG bytes under their content hash and record the label in the manifest.
+
+        Identical images (e.g. every "before" shot after the page reset) share one
+        blob, so only the first copy is written to disk.
+
+        Returns:
+            Path to the shared blob
+        """
+        import hashlib
 
-    def _take_screenshot_sync(self, name: str, full_page: bool = False) -> str:
-        """Take screenshot (sync, runs in thread)."""
         self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(png).hexdigest()[:20]
+        filepath = self.screenshots_dir / f"{digest}.png"
+        if not filepath.exists():
+            # Write-then-rename so parallel workers never see a partial blob
+            tmp_path = filepath.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(png)
+            os.replace(tmp_path, filepath)
+
+        self._record_screenshot(name, filepath)
+        return str(filepath)
+
+    def _record_screenshot(self, name: str, filepath: Path) -> None:
+        """Append a numbered label for a stored blob to the screenshot manifest."""
+        import json
+
         safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
-        self._screenshot_counter += 1
-        filename = f"{self._screenshot_counter:03d}_{safe_name}.png"
-        filepath = self.screenshots_dir / filename
-        self._session.page.screenshot(path=str(filepath), full_page=full_page)
+        label = f"{next(self._screenshot_seq):03d}_{safe_name}"
+        with open(self.screenshots_dir / "manifest.jsonl", "a", encoding="utf-8") as manifest:
+            manifest.write(json.dumps({"name": label, "blob": filepath.name}) + "\n")
+
+    def adopt_screenshot(self, source_path: str, name: str) -> Optional[str]:
+        """
+        Bring a screenshot blob from another session into this one.
+
+        Blobs are content-addressed, so the file keeps its name; it is hard-linked
+        when possible and copied otherwise.
+
+        Returns:
+            Path to the blob in this session, or None if the source no longer exists
+        """
+        import shutil
+
+        source = Path(source_path)
+        if not source.exists():
+            return None
+        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self.screenshots_dir / source.name
+        if not filepath.exists():
+            tmp_path = filepath.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, filepath)
+        self._record_screenshot(name, filepath)
         return str(filepath)
 
+    def _take_screenshot_sync(self, name: str, full_page: bool = False) -> str:
+        """Take screenshot (sync, runs in thread)."""
+        png = self._session.page.screenshot(full_page=full_page)
+        return self._store_screenshot(name, png)
+
     async def take_screenshot(self, name: str, full_page: bool = False) -> str:
         """
         Take a screenshot and save to output directory.
 
+        Screenshots are content-addressed: the file is named by its hash and
+        screenshots/manifest.jsonl maps each numbered name to its blob.
+
         Args:
-            name: Base name for the screenshot file (will be sanitized)
+            name: Label for the screenshot in the manifest (will be sanitized)
             full_page: Whether to capture the full scrollable page
 
         Returns:
             Path to the saved screenshot file
         """
         await self.get_page()  # Ensure session exists
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor, partial(self._take_screenshot_sync, name, full_page)
-        )
+        return await self._run(partial(self._take_screenshot_sync, name, full_page))
 
-    def save_scenario_file(self, element_name: str, gherkin_content: str) -> str:
+    def save_scenario_file(self, element_name: str, gherkin_content: str,
+                           behavior_id: Optional[int] = None) -> str:
         """
         Save an individual Gherkin scenario file.
 
         Args:
             element_name: Name of the element (used for filename)
             gherkin_content: Gherkin scenario content
+            behavior_id: Behavior record the scenario documents; it is linked
+                to the scenario file so the report needn't guess the match
 
         Returns:
             Path to the saved scenario file
@@ -171,27 +1042,22 @@ class BrowserManager:
         filename = f"{safe_name}.feature"
         filepath = self.scenarios_dir / filename
         filepath.write_text(gherkin_content, encoding="utf-8")
+        if behavior_id is not None and not self.behaviors.link_scenario(behavior_id, str(filepath)):
+            _logger.warning(f"Scenario {filename} references unknown behavior #{behavior_id}")
         return str(filepath)
 
-    def save_behavior_file(self, element_name: str, behavior_data: dict) -> str:
+    def save_behavior(self, element_name: str, behavior_data: dict) -> int:
         """
-        Save hover behavior data to a JSON file for report generation.
+        Record hover behavior data in the session's behavior store for report generation.
 
         Args:
-            element_name: Name of the element (used for filename)
+            element_name: Human-readable element description
             behavior_data: Dictionary containing hover detection results
 
         Returns:
-            Path to the saved behavior JSON file
+            ID of the stored behavior record
         """
-        import json
-        self.behaviors_dir.mkdir(parents=True, exist_ok=True)
-        self._behavior_counter += 1
-        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in element_name)[:50]
-        filename = f"{self._behavior_counter:03d}_{safe_name}.json"
-        filepath = self.behaviors_dir / filename
-        filepath.write_text(json.dumps(behavior_data, indent=2), encoding="utf-8")
-        return str(filepath)
+        return self.behaviors.add(element_name, behavior_data)
 
     def _get_snapshot_sync(self) -> dict:
         """Get accessibility snapshot (sync, runs in thread)."""
@@ -200,149 +1066,35 @@ class BrowserManager:
     async def get_snapshot(self) -> dict:
         """Get accessibility snapshot of current page."""
         await self.get_page()
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self._get_snapshot_sync)
-
-    def _get_page_structure_sync(self) -> dict:
-        """Get page structure (sync, runs in thread)."""
-        page = self._session.page
-
-        # Get all interactive elements using JavaScript with ARIA and accessibility info
-        structure = page.evaluate("""
-            () => {
-                const menus = [];
-                const buttons = [];
-                const links = [];
-                const hover_candidates = [];
-                const landmarks = [];
-
-                // Helper to build selector for an element
-                function buildSelector(el) {
-                    if (el.id) return '#' + el.id;
-                    if (el.getAttribute('data-testid')) return `[data-testid="${el.getAttribute('data-testid')}"]`;
-
-                    const text = (el.innerText || el.getAttribute('aria-label') || '').trim();
-                    if (text && text.length < 30 && text.length > 0) {
-                        return `text="${text}"`;
-                    }
-
-                    // Fallback to tag + class
-                    let selector = el.tagName.toLowerCase();
-                    if (el.className && typeof el.className === 'string') {
-                        const mainClass = el.className.split(' ')[0];
-                        if (mainClass) selector += '.' + mainClass;
-                    }
-                    return selector;
-                }
-
-                // Find elements by ARIA roles
-                const roleSelectors = {
-                    menus: ['[role="menubar"]', '[role="menu"]', '[role="menuitem"]', '[role="menuitemcheckbox"]', '[role="menuitemradio"]'],
-                    buttons: ['[role="button"]', 'button'],
-                    links: ['[role="link"]', 'a[href]'],
-                    landmarks: ['[role="navigation"]', '[role="banner"]', '[role="main"]', '[role="complementary"]', 'nav', 'header', 'main', 'aside']
-                };
-
-                // Collect menu elements
-                roleSelectors.menus.forEach(sel => {
-                    document.querySelectorAll(sel).forEach(el => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width === 0 || rect.height === 0) return;
-
-                        menus.push({
-                            role: el.getAttribute('role') || el.tagName.toLowerCase(),
-                            name: (el.innerText || el.getAttribute('aria-label') || '').trim().substring(0, 50),
-                            selector: buildSelector(el),
-                            hasPopup: el.getAttribute('aria-haspopup'),
-                            expanded: el.getAttribute('aria-expanded'),
-                        });
-                    });
-                });
-
-                // Collect buttons
-                roleSelectors.buttons.forEach(sel => {
-                    document.querySelectorAll(sel).forEach(el => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width === 0 || rect.height === 0) return;
-
-                        buttons.push({
-                            role: 'button',
-                            name: (el.innerText || el.getAttribute('aria-label') || '').trim().substring(0, 50),
-                            selector: buildSelector(el),
-                            hasPopup: el.getAttribute('aria-haspopup'),
-                            expanded: el.getAttribute('aria-expanded'),
-                        });
-                    });
-                });
+        return await self._run(self._get_snapshot_sync)
 
-                // Collect links
-                roleSelectors.links.forEach(sel => {
-                    document.querySelectorAll(sel).forEach(el => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width === 0 || rect.height === 0) return;
-
-                        const text = (el.innerText || el.getAttribute('aria-label') || '').trim();
-                        if (!text) return;  // Skip links without text
-
-                        links.push({
-                            role: 'link',
-                            name: text.substring(0, 50),
-                            href: el.getAttribute('href'),
-                            selector: buildSelector(el),
-                            hasPopup: el.getAttribute('aria-haspopup'),
-                        });
-                    });
-                });
-
-                // Collect landmarks
-                roleSelectors.landmarks.forEach(sel => {
-                    document.querySelectorAll(sel).forEach(el => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width === 0 || rect.height === 0) return;
-
-                        landmarks.push({
-                            role: el.getAttribute('role') || el.tagName.toLowerCase(),
-                            name: el.getAttribute('aria-label') || '',
-                            selector: buildSelector(el),
-                        });
-                    });
-                });
-
-                // Find hover candidates - elements likely to have hover behavior
-                document.querySelectorAll('*').forEach(el => {
-                    const style = window.getComputedStyle(el);
-                    const rect = el.getBoundingClientRect();
-
-                    if (rect.width === 0 || rect.height === 0) return;
-                    if (style.display === 'none' || style.visibility === 'hidden') return;
-
-                    const hasPointerCursor = style.cursor === 'pointer';
-                    const hasAriaPopup = el.getAttribute('aria-haspopup');
-                    const hasAriaExpanded = el.getAttribute('aria-expanded') !== null;
-                    const hasDataToggle = el.getAttribute('data-toggle') || el.getAttribute('data-bs-toggle');
-                    const hasDropdownClass = el.className && typeof el.className === 'string' && (
-                        el.className.includes('dropdown') ||
-                        el.className.includes('menu') ||
-                        el.className.includes('nav')
-                    );
+    def _extract_page_sync(self) -> dict:
+        """
+        Run the single-pass page extractor (sync, runs in thread).
 
-                    // Only include if it has hover-related attributes
-                    if (hasAriaPopup || hasAriaExpanded || hasDataToggle || (hasDropdownClass && hasPointerCursor)) {
-                        hover_candidates.push({
-                            tag: el.tagName,
-                            name: (el.innerText || el.getAttribute('aria-label') || '').trim().substring(0, 50),
-                            selector: buildSelector(el),
-                            ariaPopup: hasAriaPopup,
-                            ariaExpanded: el.getAttribute('aria-expanded'),
-                            dataToggle: hasDataToggle || null,
-                            role: el.getAttribute('role'),
-                        });
-                    }
-                });
+        Results are cached by URL + DOM fingerprint, so repeated structure
+        queries on an unchanged page skip the heavy scan.
+        """
+        page = self._session.page
+        fingerprint = page.evaluate(_DOM_FINGERPRINT_JS)
+        cached = self._extraction_cache.get(fingerprint)
+        if cached is not None:
+            self._extraction_cache.move_to_end(fingerprint)
+            _logger.info(f"Page structure served from cache: {fingerprint}")
+            return cached
+
+        started = time.perf_counter()
+        with self._profiled("extract"):
+            extraction = page.evaluate(_EXTRACT_PAGE_JS)
+        self._record_timing("extract", started, extraction.get("url"))
+        self._extraction_cache[fingerprint] = extraction
+        while len(self._extraction_cache) > STRUCTURE_CACHE_SIZE:
+            self._extraction_cache.popitem(last=False)
+        return extraction
 
-                return { menus, buttons, links, landmarks, hover_candidates };
-            }
-        """)
+    def _get_page_structure_sync(self) -> dict:
+        """Get page structure (sync, runs in thread)."""
+        structure = self._extract_page_sync()
 
         # Deduplicate by selector
         def dedupe(items):
@@ -355,15 +1107,16 @@ class BrowserManager:
                     result.append(item)
             return result
 
-        menus = dedupe(structure['menus'])
-        buttons = dedupe(structure['buttons'])
-        links = dedupe(structure['links'])
+        # Most likely hover targets first, so the truncated lists keep them
+        menus = sort_by_score(dedupe(structure['menus']))
+        buttons = sort_by_score(dedupe(structure['buttons']))
+        links = sort_by_score(dedupe(structure['links']))
         landmarks = dedupe(structure['landmarks'])
-        hover_candidates = dedupe(structure['hover_candidates'])
+        hover_candidates = sort_by_score(dedupe(structure['hover_candidates']))
 
         return {
-            "page_title": page.title(),
-            "url": page.url,
+            "page_title": structure['title'],
+            "url": structure['url'],
             "summary": {
                 "menus": len(menus),
                 "buttons": len(buttons),
@@ -384,111 +1137,85 @@ class BrowserManager:
         Returns interactive elements, their roles, and hierarchy.
         """
         await self.get_page()
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self._get_page_structure_sync)
+        return await self._run(self._get_page_structure_sync)
 
     def _find_hoverable_elements_sync(self) -> list:
         """Find hoverable elements (sync, runs in thread)."""
-        page = self._session.page
+        return list(self._extract_page_sync()['hoverables'])
 
-        return page.evaluate("""
-            () => {
-                const results = [];
-                const seen = new Set();
-
-                document.querySelectorAll('a, button, [role="button"], [role="menuitem"], [class*="dropdown"], [class*="menu"]').forEach((el, idx) => {
-                    const style = window.getComputedStyle(el);
-                    const rect = el.getBoundingClientRect();
-
-                    // Skip hidden or off-screen elements
-                    if (rect.width === 0 || rect.height === 0) return;
-                    if (style.display === 'none' || style.visibility === 'hidden') return;
-
-                    const text = (el.innerText || el.getAttribute('aria-label') || '').trim().substring(0, 50);
-                    const key = `${el.tagName}-${text}`;
-
-                    // Skip duplicates
-                    if (seen.has(key)) return;
-                    seen.add(key);
-
-                    // Build a reliable selector
-                    let selector = '';
-                    if (el.id) {
-                        selector = `#${el.id}`;
-                    } else if (el.getAttribute('data-testid')) {
-                        selector = `[data-testid="${el.getAttribute('data-testid')}"]`;
-                    } else if (text && text.length > 0 && text.length < 30) {
-                        selector = `text="${text}"`;
-                    } else {
-                        selector = `${el.tagName.toLowerCase()}:nth-of-type(${idx + 1})`;
-                    }
+    async def find_hoverable_elements(self) -> list:
+        """Find all potentially hoverable elements."""
+        await self.get_page()
+        return await self._run(self._find_hoverable_elements_sync)
 
-                    results.push({
-                        tag: el.tagName,
-                        text: text,
-                        selector: selector,
-                        hasExpandButton: el.querySelector('[class*="expand"], [class*="arrow"], [class*="caret"]') !== null,
-                        cursor: style.cursor
-                    });
-                });
+    def _resolve_element_sync(self, selector: str):
+        """First element matching a Playwright selector, or None (sync, runs in thread)."""
+        locator = self._session.page.locator(selector).first
+        try:
+            if locator.count() == 0:
+                return None
+            return locator.element_handle(timeout=1000)
+        except Exception as e:
+            _logger.debug(f"Could not resolve {selector}: {e}")
+            return None
+
+    def _component_fingerprints_sync(self, selectors: list, styles: bool = False) -> dict:
+        """Component fingerprint per selector, None if not found (sync, runs in thread)."""
+        selectors = list(selectors)
+        # Resolved through Playwright so text="..." and other engine selectors work
+        handles = [self._resolve_element_sync(selector) for selector in selectors]
+        try:
+            fingerprints = self._session.page.evaluate(_COMPONENT_FINGERPRINT_JS, [handles, styles])
+        finally:
+            for handle in handles:
+                if handle is not None:
+                    handle.dispose()
+        return dict(zip(selectors, fingerprints))
+
+    async def component_fingerprints(self, selectors: list, styles: bool = False) -> dict:
+        """
+        Fingerprint the components behind selectors on the current page.
 
-                return results;
-            }
-        """)
+        Args:
+            selectors: Playwright selectors of hover targets (CSS, text="...", ...)
+            styles: Also hash computed styles and applicable :hover rules
 
-    async def find_hoverable_elements(self) -> list:
-        """Find all potentially hoverable elements."""
+        Returns:
+            dict mapping each selector to a fingerprint string (None if the element is missing)
+        """
         await self.get_page()
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self._find_hoverable_elements_sync)
+        return await self._run(partial(self._component_fingerprints_sync, selectors, styles))
+
+    def _get_links_sync(self) -> list:
+        """Absolute, deduplicated hrefs of all text links on the page (sync, runs in thread)."""
+        extraction = self._extract_page_sync()
+        hrefs = []
+        seen = set()
+        for link in extraction['links']:
+            href = link.get('href')
+            if not href:
+                continue
+            absolute = urljoin(extraction['url'], href)
+            if absolute not in seen:
+                seen.add(absolute)
+                hrefs.append(absolute)
+        return hrefs
+
+    async def get_links(self) -> list:
+        """Get every link target on the current page, resolved against the page URL."""
+        await self.get_page()
+        return await self._run(self._get_links_sync)
 
     def _hover_and_detect_sync(self, selector: str, element_name: str, capture_screenshots: bool, force: bool = False) -> dict:
         """Hover and detect changes (sync, runs in thread)."""
-        page = self._session.page
+        self._maybe_recycle_sync(restore=True)
+        self._hovers += 1
+        with self._profiled("hover", element_name or selector):
+            return self._hover_and_detect_unprofiled_sync(selector, element_name, capture_screenshots, force)
 
-        # JavaScript to get all visible interactive elements with their positions
-        get_visible_elements_js = """
-            () => {
-                const elements = [];
-                const selectors = [
-                    'ul', 'li', 'a', 'button',
-                    '[class*="dropdown"]', '[class*="menu"]', '[class*="submenu"]',
-                    '[class*="popup"]', '[class*="tooltip"]', '[class*="popover"]',
-                    '[role="menu"]', '[role="listbox"]', '[role="tooltip"]'
-                ];
-
-                document.querySelectorAll(selectors.join(', ')).forEach(el => {
-                    const rect = el.getBoundingClientRect();
-                    const style = window.getComputedStyle(el);
-
-                    // Check if element is visible
-                    const isVisible = (
-                        rect.width > 0 &&
-                        rect.height > 0 &&
-                        style.display !== 'none' &&
-                        style.visibility !== 'hidden' &&
-                        style.opacity !== '0' &&
-                        rect.top < window.innerHeight &&
-                        rect.bottom > 0
-                    );
-
-                    if (isVisible) {
-                        elements.push({
-                            tag: el.tagName,
-                            className: el.className || '',
-                            id: el.id || '',
-                            text: (el.innerText || '').trim().substring(0, 50),
-                            href: el.getAttribute('href') || '',
-                            top: Math.round(rect.top),
-                            left: Math.round(rect.left),
-                            // Create unique key for comparison
-                            key: `${el.tagName}-${el.className}-${(el.innerText || '').trim().substring(0, 30)}-${Math.round(rect.top)}-${Math.round(rect.left)}`
-                        });
-                    }
-                });
-                return elements;
-            }
-        """
+    def _hover_and_detect_unprofiled_sync(self, selector: str, element_name: str, capture_screenshots: bool,
+                                          force: bool = False) -> dict:
+        page = self._session.page
 
         # Generate safe name for screenshots
         safe_name = element_name or selector
@@ -496,32 +1223,40 @@ class BrowserManager:
 
         screenshot_before = None
         screenshot_after = None
+        timer = PhaseTimer()
 
         try:
             # Reset page state before testing hover
-            # 1. Move mouse to neutral position (top-left corner)
-            page.mouse.move(0, 0)
-            page.wait_for_timeout(200)
+            with timer.phase("reset"):
+                # 1. Move mouse to neutral position (top-left corner)
+                page.mouse.move(0, 0)
+                self._settle_sync(200)
 
-            # 2. Press Escape to close any open dropdowns/modals
-            page.keyboard.press("Escape")
-            page.wait_for_timeout(200)
+                # 2. Press Escape to close any open dropdowns/modals
+                page.keyboard.press("Escape")
+                self._settle_sync(200)
 
-            # 3. Click on body to deselect/close any hover menus
-            page.click("body", position={"x": 10, "y": 10}, force=True)
-            page.wait_for_timeout(300)
+                # 3. Click on body to deselect/close any hover menus
+                page.click("body", position={"x": 10, "y": 10}, force=True)
+                self._settle_sync(300)
 
-            # 4. Move mouse away again after click
-            page.mouse.move(0, 0)
-            page.wait_for_timeout(300)
+                # 4. Move mouse away again after click
+                page.mouse.move(0, 0)
+                self._settle_sync(300)
 
             # Capture BEFORE state
-            before_elements = page.evaluate(get_visible_elements_js)
-            before_keys = set(el['key'] for el in before_elements)
+            with timer.phase("diff_start"), self._profiled("scan", "diff_start"):
+                if self.diff_mode == "observer":
+                    page.evaluate(_HOVER_DIFF_START_JS)
+                else:
+                    before_elements = page.evaluate(_VISIBLE_ELEMENTS_JS)
+                    before_keys = set(el['key'] for el in before_elements)
 
             # Take BEFORE screenshot
             if capture_screenshots:
-                screenshot_before = self._take_screenshot_sync(f"{safe_name}_before")
+                with timer.phase("screenshot_before"):
+                    scroll_before = page.evaluate(_SCROLL_POSITION_JS)
+                    screenshot_before = self._take_screenshot_sync(f"{safe_name}_before")
 
             # Perform HOVER with scroll into view and retry logic
             hover_success = False
@@ -534,18 +1269,21 @@ class BrowserManager:
             ]
 
             # First, try to scroll element into view
-            for strategy in strategies:
-                if strategy is None:
-                    continue
-                try:
-                    strategy()
-                    page.wait_for_timeout(300)
-                    break
-                except Exception:
-                    pass
+            with timer.phase("scroll"):
+                for strategy in strategies:
+                    if strategy is None:
+                        continue
+                    try:
+                        strategy()
+                        self._settle_sync(300)
+                        break
+                    except Exception:
+                        pass
 
             # Now try to hover with increased timeout
             # If force=True, skip normal hover and go straight to force hover
+            # (the fallback chain has many exits, so it is timed as one span)
+            hover_started = time.perf_counter()
             if force:
                 _logger.info(f"Using force hover for: {selector}")
                 try:
@@ -609,6 +1347,7 @@ class BrowserManager:
                                 _logger.info(f"Force hover succeeded")
                             except Exception as e3:
                                 hover_error = str(e2)
+            timer.add("hover", (time.perf_counter() - hover_started) * 1000)
 
             if not hover_success:
                 return {
@@ -618,51 +1357,32 @@ class BrowserManager:
                     "error": f"Could not hover element: {hover_error}",
                     "screenshot_before": screenshot_before,
                     "screenshot_after": None,
+                    "timings": timer.as_dict(),
                 }
 
-            page.wait_for_timeout(600)  # Wait for animations/transitions
+            # Wait for animations/transitions (600ms at most)
+            with timer.phase("settle"):
+                self._settle_sync(600, min_ms=HOVER_SETTLE_MIN_MS)
 
             # Take AFTER screenshot
             if capture_screenshots:
-                screenshot_after = self._take_screenshot_sync(f"{safe_name}_after")
-
-            # Capture AFTER state
-            after_elements = page.evaluate(get_visible_elements_js)
-            after_keys = set(el['key'] for el in after_elements)
-
-            # Find NEW elements (appeared after hover)
-            new_keys = after_keys - before_keys
-            new_elements = [el for el in after_elements if el['key'] in new_keys]
-
-            # Filter to get only links from new elements
-            revealed_links = [
-                {"text": el['text'], "href": el['href']}
-                for el in new_elements
-                if el['tag'] == 'A' and el['href']
-            ]
-
-            # Determine behavior
-            behavior = "no_change"
-            if len(new_elements) > 0:
-                # Check what type of elements appeared
-                has_menu_items = any(
-                    'menu' in el.get('className', '').lower() or
-                    'dropdown' in el.get('className', '').lower() or
-                    el['tag'] in ('LI', 'UL')
-                    for el in new_elements
-                )
-                has_tooltip = any(
-                    'tooltip' in el.get('className', '').lower() or
-                    'popover' in el.get('className', '').lower()
-                    for el in new_elements
-                )
-
-                if has_menu_items or len(revealed_links) > 0:
-                    behavior = "dropdown"
-                elif has_tooltip:
-                    behavior = "tooltip"
+                with timer.phase("screenshot_after"):
+                    scroll_after = page.evaluate(_SCROLL_POSITION_JS)
+                    screenshot_after = self._take_screenshot_sync(f"{safe_name}_after")
+                    element_box = self._element_box_sync(selector)
+
+            # Capture AFTER state and find NEW elements (appeared after hover)
+            with timer.phase("diff_collect"), self._profiled("scan", "diff_collect"):
+                if self.diff_mode == "observer":
+                    # None means the page navigated away and the observer state is gone
+                    new_elements = page.evaluate(_HOVER_DIFF_COLLECT_JS) or []
                 else:
-                    behavior = "content_revealed"
+                    after_elements = page.evaluate(_VISIBLE_ELEMENTS_JS)
+                    after_keys = set(el['key'] for el in after_elements)
+                    new_keys = after_keys - before_keys
+                    new_elements = [el for el in after_elements if el['key'] in new_keys]
+
+                behavior, revealed_links = _classify_new_elements(new_elements)
 
             result = {
                 "selector": selector,
@@ -676,6 +1396,12 @@ class BrowserManager:
                 result["screenshot_before"] = screenshot_before
                 result["screenshot_after"] = screenshot_after
 
+                # Second, pixel-level signal. Only comparable if the hover did not scroll.
+                # The diff itself runs off the browser thread (see hover_and_detect).
+                if scroll_before == scroll_after:
+                    result["_visual_focus"] = element_box
+
+            result["timings"] = timer.as_dict()
             return result
 
         except Exception as e:
@@ -684,7 +1410,8 @@ class BrowserManager:
                 "new_elements_count": 0,
                 "revealed_links": [],
                 "behavior": "unreachable",
-                "error": str(e)
+                "error": str(e),
+                "timings": timer.as_dict(),
             }
 
             if capture_screenshots and screenshot_before:
@@ -693,6 +1420,42 @@ class BrowserManager:
 
             return result
 
+    def _element_box_sync(self, selector: str) -> Optional[dict]:
+        """Viewport box of the hovered element, None if it can't be measured (sync, runs in thread)."""
+        try:
+            return self._session.page.locator(selector).first.bounding_box(timeout=1000)
+        except Exception:
+            return None
+
+    async def _apply_visual_diff(self, result: dict) -> dict:
+        """
+        Add the pixel-level diff to a hover result and refine its behavior.
+
+        NumPy work runs in a worker thread so it never blocks the browser
+        runtime thread other sessions share. Only changes touching the
+        hovered element count, so animations elsewhere on the page don't
+        turn no_change into style_change.
+        """
+        if "_visual_focus" not in result:
+            return result
+        focus = result.pop("_visual_focus")
+        started = time.perf_counter()
+        visual = await asyncio.to_thread(
+            compute_visual_diff, result["screenshot_before"], result["screenshot_after"], None, focus,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        timings = result.setdefault("timings", {})
+        timings["visual_diff"] = round(elapsed, 1)
+        if "total" in timings:
+            timings["total"] = round(timings["total"] + elapsed, 1)
+        if visual is not None:
+            result["visual_diff"] = visual
+            # Hover effects with no DOM delta (color, underline, scale...)
+            # (an element that could not be measured gets no pixel-only verdict)
+            if result.get("behavior") == "no_change" and focus is not None and visual["focus_regions"]:
+                result["behavior"] = "style_change"
+        return result
+
     async def hover_and_detect(self, selector: str, element_name: str = "", capture_screenshots: bool = True, force: bool = False) -> dict:
         """
         Hover over element and detect DOM changes.
@@ -707,22 +1470,205 @@ class BrowserManager:
             dict with keys: selector, dom_changed, new_elements, behavior, revealed_links,
                            and optionally screenshot_before, screenshot_after
         """
-        await self.get_page()
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor,
-            partial(self._hover_and_detect_sync, selector, element_name, capture_screenshots, force)
-        )
+        with self._busy():
+            await self.get_page()
+            result = await self._run(
+                partial(self._hover_and_detect_sync, selector, element_name, capture_screenshots, force)
+            )
+            return await self._apply_visual_diff(result)
+
+    async def hover_many(self, targets: list, workers: int = None, capture_screenshots: bool = True,
+                         deadline: Optional[float] = None) -> list:
+        """
+        Hover many elements, spreading them across parallel pages when workers > 1.
 
+        Args:
+            targets: List of dicts with "selector" and optional "description"/"force"
+            workers: Number of isolated pages to use (default: HOVER_WORKERS)
+            capture_screenshots: Whether to capture before/after screenshots
+            deadline: time.monotonic() after which no new hover is started
+                (see scheduling.budget_deadline); targets are taken in order
+
+        Returns:
+            List of hover_and_detect results in input order (None for targets
+            not started before the deadline)
+        """
+        from .parallel import hover_parallel, default_worker_count
+
+        if workers is None:
+            workers = default_worker_count()
+
+        with self._busy():
+            if workers <= 1 or len(targets) <= 1:
+                results = []
+                for t in targets:
+                    if past_deadline(deadline):
+                        results.append(None)
+                        continue
+                    results.append(await self.hover_and_detect(
+                        t["selector"],
+                        element_name=t.get("description", ""),
+                        capture_screenshots=capture_screenshots,
+                        force=t.get("force", False),
+                    ))
+                return results
+
+            await self.get_page()
+            url = await self._run(lambda: self._session.page.url)
+            return await hover_parallel(url, targets, workers=workers, parent=self,
+                                        capture_screenshots=capture_screenshots, deadline=deadline)
+
+
+# Seconds after acquire() during which a session is never evicted, so the
+# caller can start its first operation (which marks it busy) in time
+ACQUIRE_GRACE_SECONDS = 10
+
+
+class BrowserPool:
+    """
+    Pool of per-session BrowserManagers sharing one Chromium process.
+
+    Sessions are keyed by LangGraph thread_id. Each session owns a
+    BrowserContext inside the shared browser, so concurrent threads no longer
+    tear down each other's browser. The pool is bounded: the least recently
+    used session is evicted when max_size is exceeded, and sessions unused
+    for idle_timeout seconds are closed on the next acquire. Sessions with an
+    operation in flight are never evicted.
+
+    Usage:
+        pool = BrowserPool(max_size=4, idle_timeout=600)
+        manager = await pool.acquire("thread-1")
+        await manager.navigate("https://example.com")
+        await pool.close()
+    """
+
+    def __init__(self, max_size: int = None, idle_timeout: float = None,
+                 headless: bool = True, output_dir: str = "output"):
+        if max_size is None:
+            max_size = int(os.environ.get("BROWSER_POOL_MAX_SIZE", "8"))
+        if idle_timeout is None:
+            idle_timeout = float(os.environ.get("BROWSER_POOL_IDLE_TIMEOUT", "900"))
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self.output_dir = output_dir
+        self._shared = SharedBrowser(headless=headless)
+        self._managers: "OrderedDict[Optional[str], BrowserManager]" = OrderedDict()
+        self._last_used: dict = {}
+        # Tools call in from several threads/event loops, so guard with a thread lock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __contains__(self, session_id: Optional[str]) -> bool:
+        return session_id in self._managers
+
+    def _collect_evictions(self, keep: Optional[str], now: float) -> list:
+        """
+        Pop idle and over-capacity sessions (caller holds the lock).
+
+        Busy sessions and sessions acquired within ACQUIRE_GRACE_SECONDS are
+        never evicted; if every candidate is protected the pool stays over
+        max_size until a later acquire.
+        """
+        def protected(key) -> bool:
+            return key == keep or self._managers[key].busy or now - self._last_used[key] < ACQUIRE_GRACE_SECONDS
+
+        evicted = []
+        if self.idle_timeout > 0:
+            for key in list(self._managers):
+                if not protected(key) and now - self._last_used[key] > self.idle_timeout:
+                    _logger.info(f"Evicting idle browser session: {key}")
+                    evicted.append(self._managers.pop(key))
+                    del self._last_used[key]
+        excess = len(self._managers) - self.max_size
+        for key in list(self._managers):
+            if excess <= 0:
+                break
+            if protected(key):
+                continue
+            manager = self._managers[key]
+            _logger.info(f"Evicting least recently used browser session: {key}")
+            self._managers.pop(key)
+            del self._last_used[key]
+            evicted.append(manager)
+            excess -= 1
+        return evicted
+
+    async def acquire(self, session_id: Optional[str] = None) -> BrowserManager:
+        """
+        Get the BrowserManager for a session, creating it if needed.
+
+        Args:
+            session_id: Session/thread ID (also used for the output folder)
+
+        Returns:
+            BrowserManager bound to its own context in the shared browser
+        """
+        with self._lock:
+            now = time.monotonic()
+            manager = self._managers.get(session_id)
+            if manager is None:
+                manager = BrowserManager(
+                    headless=self.headless,
+                    output_dir=self.output_dir,
+                    session_id=session_id,
+                    shared_browser=self._shared,
+                )
+                self._managers[session_id] = manager
+            else:
+                self._managers.move_to_end(session_id)
+            self._last_used[session_id] = now
+            evicted = self._collect_evictions(session_id, now)
+
+        for old in evicted:
+            await old.close()
+        return manager
+
+    async def release(self, session_id: Optional[str]) -> None:
+        """Close a single session and remove it from the pool."""
+        with self._lock:
+            manager = self._managers.pop(session_id, None)
+            self._last_used.pop(session_id, None)
+        if manager:
+            await manager.close()
 
-# Global instance for simple usage
-_manager: Optional[BrowserManager] = None
-_current_session_id: Optional[str] = None
+    async def close(self) -> None:
+        """Close every session and the shared browser."""
+        with self._lock:
+            managers = list(self._managers.values())
+            self._managers.clear()
+            self._last_used.clear()
+        for manager in managers:
+            await manager.close()
+        await run_on(_executor, self._shared._close_sync)
+
+
+# Global pool for simple usage
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """Get or create the global browser session pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(headless=headless)
+        elif _pool.headless != headless:
+            _logger.warning(
+                f"Browser pool already runs with headless={_pool.headless}; ignoring headless={headless}"
+            )
+        return _pool
 
 
 async def get_browser_manager(headless: bool = True, session_id: str = None) -> BrowserManager:
     """
-    Get or create global browser manager.
+    Get or create the browser manager for a session.
+
+    Sessions are served from a shared pool, so switching between thread IDs
+    no longer closes the browser of the other thread.
 
     Args:
         headless: Run browser in headless mode (default: True for server environments)
@@ -731,23 +1677,13 @@ async def get_browser_manager(headless: bool = True, session_id: str = None) ->
     Returns:
         BrowserManager instance
     """
-    global _manager, _current_session_id
-
-    # If session_id changed, close existing manager and create new one
-    if _manager is not None and session_id != _current_session_id:
-        await _manager.close()
-        _manager = None
-
-    if _manager is None:
-        _manager = BrowserManager(headless=headless, session_id=session_id)
-        _current_session_id = session_id
-
-    return _manager
+    return await get_browser_pool(headless=headless).acquire(session_id)
 
 
 async def close_browser() -> None:
-    """Close global browser manager."""
-    global _manager
-    if _manager:
-        await _manager.close()
-        _manager = None
+    """Close all pooled sessions and the shared browser."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool:
+        await pool.close()
@@ -0,0 +1,188 @@
+"""
+Compact, token-budgeted encoding for tool outputs read by the LLM.
+
+Tool results stay in the message history and are re-read on every agent
+step, so they are encoded as small pipe-separated tables with short column
+names instead of indented JSON:
+
+    links[3]{name|sel|href}:
+    Products|#products|/products
+    Blog|text="Blog"|/blog
+
+Output is cut at a token budget (TOOL_OUTPUT_TOKEN_BUDGET, estimated at ~4
+characters per token). Rows past the budget are left out, and a trailer
+tells the model which cursor to pass to get the next page.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Rough size of a token for budgeting (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+
+
+def token_budget() -> int:
+    """Token budget per tool output, from TOOL_OUTPUT_TOKEN_BUDGET (default: 1500)."""
+    return max(100, int(os.environ.get("TOOL_OUTPUT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def cell(value) -> str:
+    """Encode one table cell: no newlines, "|" escaped, None/False as empty."""
+    if value is None or value is False:
+        return ""
+    if value is True:
+        return "1"
+    text = " ".join(str(value).split())
+    return text.replace("\\", "\\\\").replace("|", "\\|")
+
+
+def split_row(line: str) -> List[str]:
+    """Split an encoded row back into cells (inverse of joining cell() values)."""
+    cells, current, escaped = [], "", False
+    for char in line:
+        if escaped:
+            current += char
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "|":
+            cells.append(current)
+            current = ""
+        else:
+            current += char
+    cells.append(current)
+    return cells
+
+
+class CompactWriter:
+    """
+    Builds a compact tool output under a token budget.
+
+    Table rows are numbered across all tables in the order they are added;
+    rows before the cursor are skipped and rows past the budget are held
+    back for the next call.
+
+    Usage:
+        out = CompactWriter(cursor=0)
+        out.fields(title="Example", url="https://example.com")
+        out.table("links", links, [("name", "name"), ("sel", "selector")])
+        text = out.render()
+    """
+
+    def __init__(self, budget: Optional[int] = None, cursor: int = 0):
+        self.budget = budget if budget is not None else token_budget()
+        self.cursor = max(0, cursor)
+        self._lines: List[str] = []
+        self._tokens = 0
+        self._row_index = 0
+        self._next_cursor: Optional[int] = None
+        self._held_back = 0
+        self._rows_shown = 0
+
+    def _append(self, text: str) -> None:
+        self._lines.append(text)
+        self._tokens += estimate_tokens(text) + 1
+
+    def line(self, text: str) -> None:
+        """Add a line that is always included (headers, summaries)."""
+        self._append(text)
+
+    def fields(self, **values) -> None:
+        """Add key=value lines (one per field), skipping empty values."""
+        for key, value in values.items():
+            if value is not None and value is not False and value != "" and value != []:
+                self._append(f"{key}={cell(value)}")
+
+    def table(self, name: str, rows: Sequence[dict], columns: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add a table.
+
+        Args:
+            name: Table name shown in the header
+            rows: Source dicts
+            columns: (short column name, source key) pairs
+        """
+        columns = list(columns)
+        first = self._row_index
+        self._row_index += len(rows)
+        start = max(0, self.cursor - first)
+        if start >= len(rows):
+            return
+
+        shown = []
+        for offset in range(start, len(rows)):
+            if self._next_cursor is not None:
+                break
+            encoded = "|".join(cell(rows[offset].get(key)) for _, key in columns)
+            # At least one row per call, so a cursor always makes progress
+            if self._rows_shown and self._tokens + estimate_tokens(encoded) + 1 > self.budget:
+                self._next_cursor = first + offset
+                break
+            shown.append(encoded)
+            self._rows_shown += 1
+            self._tokens += estimate_tokens(encoded) + 1
+        if self._next_cursor is not None and not shown:
+            self._held_back += len(rows) - start
+            return
+        self._held_back += len(rows) - start - len(shown)
+
+        header = "|".join(short for short, _ in columns)
+        if start == 0 and len(shown) == len(rows):
+            size = str(len(rows))
+        else:
+            size = f"{start}-{start + len(shown) - 1}/{len(rows)}"
+        self._lines.append(f"{name}[{size}]{{{header}}}:")
+        self._lines.extend(shown)
+
+    def render(self, continuation: Optional[str] = None) -> str:
+        """
+        The encoded output, with a trailer if rows were held back.
+
+        Args:
+            continuation: Trailer hint for tools that cannot be paged
+                (default: "call again with cursor=N")
+        """
+        lines = list(self._lines)
+        while lines and not lines[-1]:
+            lines.pop()
+        if self._next_cursor is not None:
+            hint = continuation or f"call again with cursor={self._next_cursor}"
+            lines.append(f"more: {self._held_back} rows not shown, {hint}")
+        return "\n".join(lines)
+
+
+def parse(text: str) -> Dict[str, object]:
+    """
+    Decode a compact output back into fields and tables.
+
+    Fields must come before tables or be separated from them by a blank line.
+
+    Returns:
+        dict of field values (strings) and tables (lists of dicts keyed by short column name)
+    """
+    result: Dict[str, object] = {}
+    current: Optional[Tuple[str, List[str]]] = None
+    for line in text.splitlines():
+        if line.startswith("more: "):
+            result["more"] = line[len("more: "):]
+            current = None
+        elif line.endswith(":") and "[" in line and "]{" in line:
+            name = line[:line.index("[")]
+            columns = line[line.index("]{") + 2:line.rindex("}")].split("|")
+            result.setdefault(name, [])
+            current = (name, columns)
+        elif not line:
+            current = None
+        elif current is not None:
+            result[current[0]].append(dict(zip(current[1], split_row(line))))
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            result[key] = value
+    return result
@@ -0,0 +1,64 @@
+"""
+Per-site cache of hover results for shared components.
+
+Headers, navigation bars and footers repeat on every page of a site. During
+a crawl each component fingerprint (see BrowserManager.component_fingerprints)
+is hovered once: the first page worker to meet it claims it, later pages
+(including ones hovering concurrently) wait for and reuse that result.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+_logger = logging.getLogger("components")
+
+
+class ComponentCache:
+    """
+    Hover results keyed by component fingerprint, shared by a crawl's page workers.
+
+    Usage:
+        claim = cache.claim(fingerprint)
+        if claim is None:          # we own it: hover, then publish
+            cache.resolve(fingerprint, result)
+        else:                      # someone else hovers it
+            result = await claim   # None if the owner failed
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def claim(self, fingerprint: str) -> Optional[asyncio.Future]:
+        """
+        Claim a fingerprint for hovering.
+
+        Returns:
+            None if the caller now owns the fingerprint and must resolve() it,
+            otherwise a future for the owner's result
+        """
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self._entries[fingerprint] = asyncio.get_running_loop().create_future()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def resolve(self, fingerprint: str, result: Optional[dict]) -> None:
+        """
+        Publish the owner's hover result (None if it failed).
+
+        A failed component is forgotten, so a later page can try it again.
+        """
+        entry = self._entries.get(fingerprint)
+        if entry is None or entry.done():
+            return
+        entry.set_result(result)
+        if result is None:
+            del self._entries[fingerprint]
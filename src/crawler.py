@@ -0,0 +1,268 @@
+"""
+Site crawl mode: hover-test every page of a site, not just the landing page.
+
+A deduplicated, same-origin URL frontier feeds N page workers. Each worker is
+a full BrowserManager with its own runtime thread (see runtime.py) and runs
+the deterministic hover_page pipeline. Structural links and links revealed by
+hovers go back into the frontier until the page, depth or time budget is used
+up. Components shared between pages (same fingerprint, e.g. the header nav)
+are hovered only once per site.
+
+All pages write into one session folder, so the site gets one behavior store,
+one TLDR and one report with a section per page. crawl.json records every
+visited page.
+
+Usage:
+    hover-detect https://example.com --crawl --max-pages 25 --max-depth 2 --workers 4
+"""
+
+import json
+import time
+import asyncio
+import logging
+from itertools import count
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+
+from .browser import BrowserManager
+from .runtime import BrowserRuntime
+from .components import ComponentCache
+from .run_cache import RunCache
+from .main import hover_page
+from .report import INTERACTIVE_BEHAVIORS
+from .tools import write_tldr, write_report
+
+_logger = logging.getLogger("crawler")
+
+# Links to these resources are never pages worth hovering
+SKIP_EXTENSIONS = (
+    ".pdf", ".zip", ".gz", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".mp3", ".mp4", ".webm", ".avi", ".mov", ".css", ".js", ".json", ".xml", ".txt",
+)
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Canonical form of a crawlable URL, or None if it isn't a page.
+
+    Drops the fragment, lowercases scheme and host, and maps an empty path
+    to "/", so "https://Example.com#top" and "https://example.com/" dedupe.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    path = parts.path or "/"
+    if path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+class URLFrontier:
+    """
+    Queue of pages to visit: same origin only, each URL once, within budget.
+
+    Usage:
+        frontier = URLFrontier("https://example.com", max_pages=10, max_depth=2)
+        frontier.add("https://example.com/about", depth=1)
+        url, depth = await frontier.get()
+        frontier.task_done()
+    """
+
+    def __init__(self, start_url: str, max_pages: int = 20, max_depth: int = 2):
+        start = normalize_url(start_url)
+        if start is None:
+            raise ValueError(f"Not a crawlable URL: {start_url}")
+        parts = urlsplit(start)
+        self.origin = (parts.scheme, parts.netloc)
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self._seen = set()
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self.add(start, 0)
+
+    @property
+    def accepted(self) -> int:
+        """Number of URLs queued so far (visited or pending)."""
+        return len(self._seen)
+
+    def add(self, url: str, depth: int) -> bool:
+        """
+        Queue a URL if it is new, same-origin and within the depth/page budget.
+
+        Returns:
+            True if the URL was queued
+        """
+        if depth > self.max_depth or len(self._seen) >= self.max_pages:
+            return False
+        normalized = normalize_url(url)
+        if normalized is None or normalized in self._seen:
+            return False
+        parts = urlsplit(normalized)
+        if (parts.scheme, parts.netloc) != self.origin:
+            return False
+        self._seen.add(normalized)
+        self._queue.put_nowait((normalized, depth))
+        return True
+
+    async def get(self) -> tuple:
+        """Next (url, depth) to visit."""
+        return await self._queue.get()
+
+    def task_done(self) -> None:
+        """Mark the URL returned by get() as processed."""
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued URL has been processed."""
+        await self._queue.join()
+
+
+class SiteCrawler:
+    """
+    Crawls one site with N concurrent page workers into one session folder.
+
+    Usage:
+        crawler = SiteCrawler("https://example.com", workers=4, max_pages=25)
+        summary = await crawler.run()
+    """
+
+    def __init__(self, start_url: str, workers: int = 2, max_pages: int = 20, max_depth: int = 2,
+                 max_seconds: Optional[float] = None, max_elements: Optional[int] = None,
+                 headless: bool = True, output_dir: str = "output", session_id: Optional[str] = None,
+                 polish: bool = False, share_components: bool = True, incremental: bool = False,
+                 profile: Optional[bool] = None, page_seconds: Optional[float] = None):
+        self.start_url = start_url
+        self.worker_count = max(1, workers)
+        self.max_seconds = max_seconds
+        self.max_elements = max_elements
+        self.headless = headless
+        self.base_output_dir = output_dir
+        self.session_id = session_id
+        self.polish = polish
+        self.profile = profile
+        self.page_seconds = page_seconds
+        # Shared headers/navs/footers are hovered once per site, not once per page
+        self.components = ComponentCache() if share_components else None
+        # Pages unchanged since the previous crawl only carry their results forward
+        self.run_cache = RunCache(output_dir) if incremental else None
+        self.frontier = URLFrontier(start_url, max_pages=max_pages, max_depth=max_depth)
+        self.output_dir = Path(output_dir) / session_id if session_id else Path(output_dir)
+        self.pages: List[dict] = []
+        self._page_seq = count(1)
+        self._screenshot_seq = count(1)
+        self._deadline: Optional[float] = None
+
+    def _new_worker(self, index: int) -> tuple:
+        """A BrowserManager on its own playwright thread."""
+        executor = BrowserRuntime(f"playwright-crawl{index}")
+        manager = BrowserManager(
+            headless=self.headless,
+            output_dir=self.base_output_dir,
+            session_id=self.session_id,
+            executor=executor,
+            profile=self.profile,
+        )
+        # Shared numbering so screenshot labels never collide across workers
+        manager._screenshot_seq = self._screenshot_seq
+        return manager, executor
+
+    async def _crawl_page(self, manager: BrowserManager, url: str, depth: int) -> None:
+        """Hover-test one page and feed its links back into the frontier."""
+        number = next(self._page_seq)
+        record = {"number": number, "url": url, "depth": depth}
+        started = time.monotonic()
+        try:
+            page = await hover_page(
+                manager, url,
+                max_elements=self.max_elements,
+                polish=self.polish,
+                scenario_prefix=f"p{number:03d}_",
+                component_cache=self.components,
+                run_cache=self.run_cache,
+                max_seconds=self.page_seconds,
+            )
+            results = page["results"]
+            links = await manager.get_links()
+            for result in results:
+                links.extend(urljoin(url, link["href"]) for link in result.get("revealed_links", []) if link.get("href"))
+            queued = sum(1 for link in links if self.frontier.add(link, depth + 1))
+
+            record.update({
+                "title": page["title"],
+                "elements_tested": len(results),
+                "interactive": sum(1 for r in results if r.get("behavior") in INTERACTIVE_BEHAVIORS),
+                "components_reused": sum(1 for r in results if r.get("reused_from")),
+                "carried_forward": sum(1 for r in results if r.get("carried_forward")),
+                "skipped_for_time": len(page["skipped"]),
+                "links_found": len(links),
+                "links_queued": queued,
+            })
+        except Exception as e:
+            _logger.warning(f"Crawl of {url} failed: {type(e).__name__}: {e}")
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["seconds"] = round(time.monotonic() - started, 2)
+        self.pages.append(record)
+        _logger.info(f"Crawled page {number} (depth {depth}): {url} in {record['seconds']}s")
+
+    async def _worker(self, manager: BrowserManager) -> None:
+        while True:
+            url, depth = await self.frontier.get()
+            try:
+                if self._deadline is not None and time.monotonic() > self._deadline:
+                    self.pages.append({"url": url, "depth": depth, "skipped": "time budget exhausted"})
+                    continue
+                await self._crawl_page(manager, url, depth)
+            finally:
+                self.frontier.task_done()
+
+    async def run(self) -> dict:
+        """
+        Crawl until the frontier is empty or a budget is used up, then write TLDR and report.
+
+        Returns:
+            dict with session_id, output_dir, report path, tldr and per-page records
+        """
+        if self.max_seconds:
+            self._deadline = time.monotonic() + self.max_seconds
+
+        workers = [self._new_worker(i) for i in range(self.worker_count)]
+        tasks = [asyncio.create_task(self._worker(manager)) for manager, _ in workers]
+        try:
+            await self.frontier.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for manager, executor in workers:
+                try:
+                    await manager.close()
+                except Exception as e:
+                    _logger.warning(f"Failed to close crawl worker: {e}")
+                executor.shutdown(wait=False)
+
+        self.pages.sort(key=lambda p: p.get("number", float("inf")))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / "crawl.json").write_text(json.dumps({
+            "start_url": self.start_url,
+            "max_pages": self.frontier.max_pages,
+            "max_depth": self.frontier.max_depth,
+            "components": {
+                "unique": len(self.components),
+                "reused": self.components.hits,
+            } if self.components is not None else None,
+            "pages": self.pages,
+        }, indent=2), encoding="utf-8")
+
+        website_name = urlparse(self.start_url).netloc or self.start_url
+        tldr = write_tldr(self.output_dir, website_name, self.session_id)
+        report_path = write_report(
+            self.output_dir, f"Hover Detection Report for {website_name} (site crawl)", tldr, self.session_id
+        )
+        return {
+            "session_id": self.session_id,
+            "output_dir": str(self.output_dir),
+            "report": report_path,
+            "tldr": tldr,
+            "pages": self.pages,
+        }
@@ -0,0 +1,167 @@
+"""
+Message-history compaction for the agent loop.
+
+The agent re-sends its whole message history to the model on every step, so
+in a long session the prompt grows with every hover. Before each model call
+compact_history() keeps a rolling window of recent messages verbatim and
+replaces older tool results with one-line summaries. Hover results point to
+their record in behaviors.db, which stays the source of truth for the report.
+Large tool-call arguments (e.g. Gherkin content already saved to disk) are
+elided the same way.
+
+Compaction is deterministic and its boundary only moves in chunks of
+HISTORY_COMPACT_CHUNK messages. Between chunk boundaries the prompt prefix
+(system prompt, task, compacted history) stays byte-identical, so the
+server's prefix cache keeps hitting.
+"""
+
+import os
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
+
+from .compact import parse
+from .report import INTERACTIVE_BEHAVIORS
+
+DEFAULT_KEEP_MESSAGES = 24
+DEFAULT_COMPACT_CHUNK = 16
+
+# Tool results and call arguments up to this size are kept as they are
+MAX_VERBATIM_CHARS = 300
+
+# Tools whose results are recorded in behaviors.db; the rest only live in the history
+RECORDED_TOOLS = ("hover_element", "hover_elements_batch", "save_gherkin_scenario")
+
+
+def history_settings() -> tuple:
+    """
+    Compaction settings from the environment.
+
+    Returns:
+        (keep, chunk): recent messages kept verbatim (HISTORY_KEEP_MESSAGES,
+        default 24; 0 disables compaction) and how far the boundary moves at
+        a time (HISTORY_COMPACT_CHUNK, default 16)
+    """
+    keep = int(os.environ.get("HISTORY_KEEP_MESSAGES", DEFAULT_KEEP_MESSAGES))
+    chunk = max(1, int(os.environ.get("HISTORY_COMPACT_CHUNK", DEFAULT_COMPACT_CHUNK)))
+    return keep, chunk
+
+
+def compaction_boundary(total: int, keep: int, chunk: int) -> int:
+    """
+    Number of leading messages to compact.
+
+    Rounded down to a multiple of chunk, so the boundary (and with it the
+    compacted prefix) only changes every chunk messages.
+    """
+    if keep <= 0 or total <= keep:
+        return 0
+    return ((total - keep) // chunk) * chunk
+
+
+def _summarize_hover(fields: dict) -> str:
+    return (
+        f"behavior #{fields.get('id', '?')} {fields.get('beh', '?')}: {fields.get('desc', '')}"
+        f" (sel={fields.get('sel', '')}, new={fields.get('new', '0')})"
+    )
+
+
+def summarize_tool_result(name: Optional[str], content: str) -> str:
+    """
+    One-line stand-in for an old tool result.
+
+    Args:
+        name: Tool name
+        content: Original tool output
+
+    Returns:
+        The content itself if it is short, else a summary prefixed with [compacted]
+    """
+    if len(content) <= MAX_VERBATIM_CHARS or content.startswith("Error"):
+        return content[:MAX_VERBATIM_CHARS]
+
+    decoded = parse(content)
+    if name == "hover_element":
+        summary = _summarize_hover(decoded)
+    elif name == "hover_elements_batch":
+        interactive = [
+            f"#{row.get('id')} {row.get('beh')}: {row.get('desc')}"
+            for row in decoded.get("results", [])
+            if row.get("beh") in INTERACTIVE_BEHAVIORS
+        ]
+        summary = f"tested {decoded.get('tested', '?')} ({decoded.get('counts', '')})"
+        if interactive:
+            summary += "; interactive: " + "; ".join(interactive)
+    elif name == "get_page_structure":
+        summary = f"page structure of {decoded.get('url', '?')}: {decoded.get('counts', '')}"
+    elif name == "find_hoverable_elements":
+        summary = f"{len(decoded.get('hoverables', []))} hoverable elements listed"
+    else:
+        summary = content.splitlines()[0][:200]
+    if name in RECORDED_TOOLS:
+        return f"[compacted] {summary}. Full details are in behaviors.db."
+    return f"[compacted] {summary}. Call the tool again for the full result."
+
+
+def _compact_tool_calls(message: AIMessage) -> AIMessage:
+    tool_calls = []
+    changed = False
+    for call in message.tool_calls:
+        args = {}
+        for key, value in call["args"].items():
+            if isinstance(value, str) and len(value) > MAX_VERBATIM_CHARS:
+                args[key] = f"[{len(value)} chars, saved to disk]"
+                changed = True
+            else:
+                args[key] = value
+        tool_calls.append({**call, "args": args})
+    if not changed:
+        return message
+    # Providers serialize from tool_calls; drop the raw copy so it can't win
+    additional_kwargs = {k: v for k, v in message.additional_kwargs.items() if k != "tool_calls"}
+    return message.model_copy(update={"tool_calls": tool_calls, "additional_kwargs": additional_kwargs})
+
+
+def compact_message(message: BaseMessage) -> BaseMessage:
+    """Compacted copy of an old message (the original is left untouched)."""
+    if isinstance(message, ToolMessage) and isinstance(message.content, str):
+        summary = summarize_tool_result(message.name, message.content)
+        if summary != message.content:
+            return message.model_copy(update={"content": summary})
+    elif isinstance(message, AIMessage) and message.tool_calls:
+        return _compact_tool_calls(message)
+    return message
+
+
+def compact_history(messages: List[BaseMessage], keep: Optional[int] = None,
+                    chunk: Optional[int] = None) -> List[BaseMessage]:
+    """
+    Messages to send to the model: old tool traffic summarized, recent kept.
+
+    Leading system messages and the first user message (the task) are never
+    compacted. Messages are summarized in place rather than dropped, so every
+    tool result still follows the AI message that requested it.
+
+    Args:
+        messages: Full message history (system prompt first)
+        keep: Recent messages kept verbatim (default: from history_settings())
+        chunk: Boundary granularity (default: from history_settings())
+
+    Returns:
+        New list of messages
+    """
+    default_keep, default_chunk = history_settings()
+    keep = default_keep if keep is None else keep
+    chunk = default_chunk if chunk is None else max(1, chunk)
+
+    head = 0
+    while head < len(messages) and isinstance(messages[head], SystemMessage):
+        head += 1
+    head = min(head + 1, len(messages))
+
+    boundary = head + compaction_boundary(len(messages) - head, keep, chunk)
+    return (
+        list(messages[:head])
+        + [compact_message(m) for m in messages[head:boundary]]
+        + list(messages[boundary:])
+    )
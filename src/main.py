@@ -0,0 +1,392 @@
+"""
+Deterministic hover pipeline and the hover-detect command line.
+
+Navigation, structure extraction, hovering every candidate, TLDR and report
+need no reasoning, so this runs them directly against BrowserManager at
+browser speed instead of through the agent loop. The LLM is only used
+(optionally) to polish the generated Gherkin scenarios.
+
+Usage:
+    hover-detect https://example.com --workers 4
+    hover-detect https://example.com --crawl --max-pages 25
+    python -m src.main https://example.com --polish
+"""
+
+import sys
+import uuid
+import asyncio
+import logging
+import argparse
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from .browser import BrowserManager
+from .components import ComponentCache
+from .run_cache import RunCache, carry_forward
+from .report import INTERACTIVE_BEHAVIORS
+from .scheduling import budget_deadline, rank_candidates
+from .tools import write_tldr, write_report
+
+_logger = logging.getLogger("main")
+
+
+def collect_candidates(structure: dict, hoverables: list, max_elements: Optional[int] = None) -> List[dict]:
+    """
+    Merge get_page_structure and find_hoverable_elements output into hover targets.
+
+    Targets are deduplicated by selector and ordered by their hover likelihood
+    score (see scheduling.py), so max_elements keeps the most promising ones.
+
+    Args:
+        structure: Result of BrowserManager.get_page_structure()
+        hoverables: Result of BrowserManager.find_hoverable_elements()
+        max_elements: Optional cap on the number of targets
+
+    Returns:
+        List of {"selector", "description", "score"} dicts, highest score first
+    """
+    targets = rank_candidates(structure, hoverables)
+    if max_elements is not None:
+        targets = targets[:max_elements]
+    return targets
+
+
+def render_scenario(result: dict) -> str:
+    """Build a Gherkin feature for one interactive hover result."""
+    desc = result.get("element_description") or result.get("selector", "element")
+    behavior = result.get("behavior", "content_revealed")
+    links = result.get("revealed_links", [])
+
+    lines = [
+        f"Feature: Hover Interaction - {desc}",
+        "  As a user visiting the website",
+        f"  I want to see additional content when hovering over {desc}",
+        "  So that I can reach related pages and information",
+        "",
+        f"  @hover @{behavior}",
+    ]
+
+    if behavior == "dropdown":
+        lines += [
+            f"  Scenario: {desc} reveals dropdown on hover",
+            "    Given I am on the target page",
+            f'    When I hover over "{desc}"',
+            "    Then a dropdown menu should become visible",
+        ]
+        if links:
+            lines.append("    And I should see the following links:")
+            lines.append("      | Link Text | URL |")
+            for link in links[:10]:
+                text = (link.get("text") or "N/A")[:40].replace("|", "/")
+                href = link.get("href") or "N/A"
+                lines.append(f"      | {text} | {href} |")
+    elif behavior == "tooltip":
+        lines += [
+            f"  Scenario: {desc} shows a tooltip on hover",
+            "    Given I am on the target page",
+            f'    When I hover over "{desc}"',
+            "    Then a tooltip should become visible",
+        ]
+    else:
+        count = result.get("new_elements_count", 0)
+        lines += [
+            f"  Scenario: {desc} reveals content on hover",
+            "    Given I am on the target page",
+            f'    When I hover over "{desc}"',
+            f"    Then {count} new element(s) should become visible",
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+async def polish_gherkin(gherkin: str, result: dict) -> str:
+    """
+    Ask the configured LLM to improve the wording of a generated scenario.
+    Falls back to the original text if no LLM is configured or the call fails.
+    """
+    try:
+        from .agent import get_llm
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        llm = get_llm()
+        response = await llm.ainvoke([
+            SystemMessage(content=(
+                "You polish Gherkin feature files. Improve the wording of the steps so they read "
+                "naturally for the element described, keep every tag, step and table row, and "
+                "reply with the Gherkin only."
+            )),
+            HumanMessage(content=(
+                f"Detected behavior: {result.get('behavior')}\n"
+                f"Element: {result.get('element_description')}\n\n{gherkin}"
+            )),
+        ])
+        text = str(response.content).strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+        return text.strip() + "\n" if "Feature:" in text else gherkin
+    except Exception as e:
+        _logger.warning(f"Gherkin polishing skipped: {type(e).__name__}: {e}")
+        return gherkin
+
+
+async def hover_page(manager: BrowserManager, url: str, workers: int = 1,
+                     max_elements: Optional[int] = None, polish: bool = False,
+                     scenario_prefix: str = "", component_cache: Optional[ComponentCache] = None,
+                     run_cache: Optional[RunCache] = None, max_seconds: Optional[float] = None) -> dict:
+    """
+    Navigate, extract structure, hover every candidate and save behaviors/scenarios.
+
+    Args:
+        manager: BrowserManager whose output folder receives the artifacts
+        url: Page to analyze
+        workers: Parallel pages used for hovering
+        max_elements: Optional cap on the number of hovered elements
+        polish: Polish generated Gherkin with the LLM
+        scenario_prefix: Prepended to scenario file names (keeps pages of a crawl apart)
+        component_cache: Site-wide cache; components already hovered on another
+            page are not hovered (or saved) again, their result is reused
+        run_cache: Cross-run cache; elements unchanged since the previous run are
+            not hovered, their previous result is carried into this session
+        max_seconds: Wall-clock budget for the page; no hover starts after it
+            runs out (targets are hovered in score order)
+
+    Returns:
+        dict with title, structure, targets, hover results (reused ones carry
+        "reused_from", ones from a previous run "carried_forward") and the
+        targets skipped for lack of time
+    """
+    deadline = budget_deadline(max_seconds)
+    title = await manager.navigate(url)
+    structure = await manager.get_page_structure()
+    hoverables = await manager.find_hoverable_elements()
+    targets = collect_candidates(structure, hoverables, max_elements=max_elements)
+
+    # Incremental runs: elements whose state fingerprint is unchanged are carried forward
+    states = {}
+    carried = {}
+    if run_cache is not None and targets:
+        states = await manager.component_fingerprints([t["selector"] for t in targets], styles=True)
+        for index, target in enumerate(targets):
+            state = states.get(target["selector"])
+            cached = await asyncio.to_thread(run_cache.lookup, url, target["selector"], state) if state else None
+            record = await asyncio.to_thread(carry_forward, manager, cached) if cached else None
+            if record is not None:
+                carried[index] = record
+    pending = [i for i in range(len(targets)) if i not in carried]
+
+    # Claim each target's component; targets owned by another page are awaited instead
+    claims = {}
+    if component_cache is not None and pending:
+        fingerprints = await manager.component_fingerprints([targets[i]["selector"] for i in pending])
+        for index in pending:
+            fingerprint = fingerprints.get(targets[index]["selector"])
+            if fingerprint:
+                claims[index] = (fingerprint, component_cache.claim(fingerprint))
+    own = [i for i in pending if i not in claims or claims[i][1] is None]
+    _logger.info(f"Hovering {len(own)} of {len(targets)} candidates on {url} ({len(carried)} unchanged)")
+
+    # File and SQLite writes go through asyncio.to_thread: crawl workers share this loop
+    async def remember(index: int, result: dict) -> None:
+        selector = targets[index]["selector"]
+        if run_cache is not None and states.get(selector):
+            await asyncio.to_thread(run_cache.put, url, selector, states[selector], result, manager.session_id)
+
+    async def hover_and_save(indexes: List[int]) -> None:
+        hovered = await manager.hover_many([targets[i] for i in indexes], workers=workers, deadline=deadline)
+        for index, result in zip(indexes, hovered):
+            if result is None:
+                continue  # time budget ran out before this target
+            target = targets[index]
+            results[index] = result
+            result["element_description"] = target["description"]
+            result["page_url"] = url
+            if result.get("behavior") in INTERACTIVE_BEHAVIORS:
+                gherkin = render_scenario(result)
+                if polish:
+                    gherkin = await polish_gherkin(gherkin, result)
+                result["scenario_file"] = await asyncio.to_thread(
+                    manager.save_scenario_file, scenario_prefix + target["description"], gherkin
+                )
+            if index in claims:
+                result["component_fingerprint"] = claims[index][0]
+            result["behavior_id"] = await asyncio.to_thread(manager.save_behavior, target["description"], result)
+            await remember(index, result)
+
+    results: List[Optional[dict]] = [None] * len(targets)
+    for index, record in carried.items():
+        description = targets[index]["description"]
+        record["element_description"] = description
+        record["page_url"] = url
+        scenario_content = record.pop("scenario_content", None)
+        if scenario_content:
+            record["scenario_file"] = await asyncio.to_thread(
+                manager.save_scenario_file, scenario_prefix + description, scenario_content
+            )
+        record["behavior_id"] = await asyncio.to_thread(manager.save_behavior, description, record)
+        await remember(index, record)
+        results[index] = record
+
+    try:
+        await hover_and_save(own)
+    finally:
+        # Publish owned components (failed ones as None so other pages retry them)
+        for index in own:
+            if index in claims:
+                result = results[index]
+                usable = result is not None and result.get("behavior") not in ("error", "unreachable")
+                component_cache.resolve(claims[index][0], result if usable else None)
+
+    retry = []
+    for index, (fingerprint, claim) in claims.items():
+        if claim is None:
+            continue
+        shared = await claim
+        if shared is None:
+            retry.append(index)
+            continue
+        results[index] = {
+            **shared,
+            "element_description": targets[index]["description"],
+            "page_url": url,
+            "reused_from": {"page_url": shared.get("page_url"), "behavior_id": shared.get("behavior_id")},
+        }
+    if retry:
+        await hover_and_save(retry)
+
+    skipped = [targets[i] for i, result in enumerate(results) if result is None]
+    if skipped:
+        _logger.info(f"Time budget of {max_seconds}s left {len(skipped)} candidates on {url} unhovered")
+    return {
+        "title": title,
+        "structure": structure,
+        "targets": targets,
+        "results": [result for result in results if result is not None],
+        "skipped": skipped,
+    }
+
+
+async def run_pipeline(url: str, session_id: Optional[str] = None, headless: bool = True,
+                       workers: int = 1, max_elements: Optional[int] = None,
+                       polish: bool = False, output_dir: str = "output", incremental: bool = False,
+                       profile: Optional[bool] = None, page_seconds: Optional[float] = None) -> dict:
+    """
+    Run the full hover detection pipeline for one URL without the agent loop.
+
+    Args:
+        url: Page to analyze
+        session_id: Output folder name (default: a new UUID)
+        headless: Run the browser headless
+        workers: Parallel pages used for hovering
+        max_elements: Optional cap on the number of hovered elements
+        polish: Polish generated Gherkin with the LLM
+        output_dir: Base output directory
+        incremental: Re-hover only elements that changed since the previous run
+        profile: Record a Playwright trace and CDP metrics under profile/
+            (default: HOVER_PROFILE)
+        page_seconds: Wall-clock hover budget for the page (highest-scored elements first)
+
+    Returns:
+        dict with session_id, report path, tldr and hover results
+    """
+    session_id = session_id or str(uuid.uuid4())
+    manager = BrowserManager(headless=headless, output_dir=output_dir, session_id=session_id, profile=profile)
+    try:
+        page = await hover_page(
+            manager, url, workers=workers, max_elements=max_elements, polish=polish,
+            run_cache=RunCache(output_dir) if incremental else None,
+            max_seconds=page_seconds,
+        )
+    finally:
+        await manager.close()
+
+    website_name = urlparse(url).netloc or url
+    tldr = write_tldr(manager.output_dir, website_name, session_id)
+    report_path = write_report(
+        manager.output_dir, f"Hover Detection Report for {website_name}", tldr, session_id
+    )
+    return {
+        "session_id": session_id,
+        "title": page["title"],
+        "report": report_path,
+        "tldr": tldr,
+        "results": page["results"],
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for hover-detect."""
+    parser = argparse.ArgumentParser(
+        prog="hover-detect",
+        description="Detect hover interactions on a web page and generate a report (no agent loop).",
+    )
+    parser.add_argument("url", help="URL to analyze")
+    parser.add_argument("--session-id", help="Output folder name (default: new UUID)")
+    parser.add_argument("--output-dir", default="output", help="Base output directory (default: output)")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel pages used for hovering (default: 1)")
+    parser.add_argument("--max-elements", type=int, help="Hover at most this many elements")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--polish", action="store_true", help="Polish Gherkin scenarios with the configured LLM")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-hover elements that changed since the previous run; carry the rest forward")
+    parser.add_argument("--page-seconds", type=float,
+                        help="Hover budget per page in seconds; elements are hovered in score order until it runs out")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record a Playwright trace and CDP performance metrics under <session>/profile/")
+    crawl = parser.add_argument_group("site crawl")
+    crawl.add_argument("--crawl", action="store_true",
+                       help="Follow same-origin links and test every page (--workers then sets concurrent pages)")
+    crawl.add_argument("--max-pages", type=int, default=20, help="Crawl at most this many pages (default: 20)")
+    crawl.add_argument("--max-depth", type=int, default=2, help="Link depth from the start URL (default: 2)")
+    crawl.add_argument("--max-seconds", type=float, help="Stop starting new pages after this many seconds")
+    crawl.add_argument("--no-dedupe", action="store_true",
+                       help="Hover shared components (header, nav, footer) again on every page")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the hover-detect script."""
+    args = build_parser().parse_args(argv)
+    if args.crawl:
+        from .crawler import SiteCrawler
+        crawler = SiteCrawler(
+            args.url,
+            workers=args.workers,
+            max_pages=args.max_pages,
+            max_depth=args.max_depth,
+            max_seconds=args.max_seconds,
+            max_elements=args.max_elements,
+            headless=not args.headed,
+            output_dir=args.output_dir,
+            session_id=args.session_id or str(uuid.uuid4()),
+            polish=args.polish,
+            share_components=not args.no_dedupe,
+            incremental=args.incremental,
+            profile=args.profile or None,
+            page_seconds=args.page_seconds,
+        )
+        result = asyncio.run(crawler.run())
+        print(result["tldr"])
+        print(f"Pages crawled: {len(result['pages'])}")
+        print(f"Report: {result['report']}")
+        return 0
+
+    result = asyncio.run(run_pipeline(
+        args.url,
+        session_id=args.session_id,
+        headless=not args.headed,
+        workers=args.workers,
+        max_elements=args.max_elements,
+        polish=args.polish,
+        output_dir=args.output_dir,
+        incremental=args.incremental,
+        profile=args.profile or None,
+        page_seconds=args.page_seconds,
+    ))
+    print(result["tldr"])
+    print(f"Report: {result['report']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
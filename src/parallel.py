@@ -0,0 +1,188 @@
+"""
+Parallel hover execution across a pool of isolated pages.
+
+A single page can only test one element at a time, on its runtime thread
+(see runtime.py). The engine here runs N workers, each a full
+BrowserManager with its own runtime thread, browser and page loaded with
+the same URL, and spreads the selectors across them.
+Results come back in input order.
+"""
+
+import os
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from .browser import BrowserManager
+from .runtime import BrowserRuntime
+from .scheduling import past_deadline
+
+_logger = logging.getLogger("parallel")
+
+
+def default_worker_count() -> int:
+    """Number of hover workers, from HOVER_WORKERS (default: 4)."""
+    return max(1, int(os.environ.get("HOVER_WORKERS", "4")))
+
+
+class ParallelHoverEngine:
+    """
+    Runs hover_and_detect for many selectors on N isolated pages.
+
+    Each worker starts from the parent's cookies and localStorage (consent
+    banners, logins) and navigates to the same URL once, then pulls the next
+    pending selector until the list is exhausted, so slow elements don't
+    stall the other workers. Worker navigations are recorded as
+    "worker.navigate" timings, apart from the session's own navigations.
+
+    Usage:
+        async with ParallelHoverEngine(url, workers=4, parent=manager) as engine:
+            results = await engine.hover_all([{"selector": "#nav", "description": "Nav"}])
+    """
+
+    def __init__(self, url: str, workers: int = None, headless: bool = True,
+                 output_dir: str = "output", session_id: str = None,
+                 parent: Optional[BrowserManager] = None):
+        self.url = url
+        self.worker_count = workers or default_worker_count()
+        self.headless = parent.headless if parent else headless
+        self.session_id = parent.session_id if parent else session_id
+        # BrowserManager appends session_id itself, so hand it the base folder
+        if parent and parent.session_id:
+            self.output_dir = str(Path(parent.output_dir).parent)
+        elif parent:
+            self.output_dir = str(parent.output_dir)
+        else:
+            self.output_dir = output_dir
+        self._parent = parent
+        self._workers: List[BrowserManager] = []
+        self._executors: List[BrowserRuntime] = []
+
+    async def __aenter__(self) -> "ParallelHoverEngine":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _start_worker(self, index: int, storage_state: Optional[dict] = None) -> Optional[BrowserManager]:
+        """Launch one worker and load the target URL; None if it fails."""
+        executor = BrowserRuntime(f"playwright-w{index}")
+        self._executors.append(executor)
+        worker = BrowserManager(
+            headless=self.headless,
+            output_dir=self.output_dir,
+            session_id=self.session_id,
+            executor=executor,
+            settle=self._parent.settle if self._parent else True,
+            diff_mode=self._parent.diff_mode if self._parent else "observer",
+            profile=self._parent.profile if self._parent else None,
+            recycle_policy=self._parent.recycle_policy if self._parent else None,
+            storage_state=storage_state,
+            timing_prefix="worker.",
+        )
+        if self._parent is not None:
+            worker._screenshot_seq = self._parent._screenshot_seq
+        try:
+            await worker.navigate(self.url)
+            return worker
+        except Exception as e:
+            _logger.warning(f"Hover worker {index} failed to load {self.url}: {e}")
+            await worker.close()
+            return None
+
+    async def start(self) -> None:
+        """Launch all workers concurrently, seeded with the parent's cookies and storage."""
+        storage_state = None
+        if self._parent is not None:
+            try:
+                storage_state = await self._parent.export_storage_state()
+            except Exception as e:
+                _logger.warning(f"Could not export the parent's storage state: {e}")
+        started = await asyncio.gather(
+            *(self._start_worker(i, storage_state) for i in range(self.worker_count))
+        )
+        self._workers = [w for w in started if w is not None]
+        if not self._workers:
+            raise RuntimeError(f"No hover worker could load {self.url}")
+        _logger.info(f"Started {len(self._workers)} hover workers for {self.url}")
+
+    async def hover_all(self, targets: List[dict], capture_screenshots: bool = True,
+                        deadline: Optional[float] = None) -> List[Optional[dict]]:
+        """
+        Hover every target across the workers.
+
+        Args:
+            targets: List of dicts with "selector" and optional "description"/"force"
+            capture_screenshots: Whether to capture before/after screenshots
+            deadline: time.monotonic() after which workers stop taking targets
+
+        Returns:
+            hover_and_detect results, in the same order as targets (None for
+            targets not started before the deadline)
+        """
+        if not self._workers:
+            await self.start()
+
+        results: List[Optional[dict]] = [None] * len(targets)
+        pending = iter(enumerate(targets))
+
+        async def run_worker(worker: BrowserManager) -> None:
+            # Workers share one iterator, so each target is taken exactly once
+            for idx, target in pending:
+                if past_deadline(deadline):
+                    break
+                selector = target["selector"]
+                description = target.get("description", "")
+                try:
+                    results[idx] = await worker.hover_and_detect(
+                        selector,
+                        element_name=description,
+                        capture_screenshots=capture_screenshots,
+                        force=target.get("force", False),
+                    )
+                except Exception as e:
+                    results[idx] = {
+                        "selector": selector,
+                        "behavior": "error",
+                        "error": f"{type(e).__name__}: {e}",
+                    }
+
+        await asyncio.gather(*(run_worker(w) for w in self._workers))
+        return results
+
+    async def close(self) -> None:
+        """Close all worker browsers and their threads."""
+        for worker in self._workers:
+            try:
+                await worker.close()
+            except Exception as e:
+                _logger.warning(f"Failed to close hover worker: {e}")
+        self._workers = []
+        for executor in self._executors:
+            executor.shutdown(wait=False)
+        self._executors = []
+
+
+async def hover_parallel(url: str, targets: List[dict], workers: int = None,
+                         parent: Optional[BrowserManager] = None,
+                         capture_screenshots: bool = True,
+                         deadline: Optional[float] = None) -> List[Optional[dict]]:
+    """
+    Hover many selectors on fresh copies of a page in parallel.
+
+    Args:
+        url: Page URL every worker loads
+        targets: List of dicts with "selector" and optional "description"/"force"
+        workers: Number of isolated pages (default: HOVER_WORKERS)
+        parent: Manager whose output folder and screenshot numbering to share
+        capture_screenshots: Whether to capture before/after screenshots
+        deadline: time.monotonic() after which no new hover is started
+
+    Returns:
+        hover_and_detect results in input order (None for targets not started)
+    """
+    workers = min(workers or default_worker_count(), max(1, len(targets)))
+    async with ParallelHoverEngine(url, workers=workers, parent=parent) as engine:
+        return await engine.hover_all(targets, capture_screenshots=capture_screenshots, deadline=deadline)
@@ -0,0 +1,225 @@
+"""
+Opt-in browser profiling of navigations and hovers.
+
+With profiling on (BrowserManager(profile=True), HOVER_PROFILE=1 or
+hover-detect --profile), every browser context records a Playwright trace
+and CDP Performance.getMetrics is sampled before and after each navigation,
+structure extraction and hover. Inside a hover the DOM-diff scans we inject
+are sampled separately, so the summary can split layout and style work
+between our own getComputedStyle scans and the site's scripts.
+
+Output, next to the session output:
+
+    profile/trace-<id>.zip   Playwright trace per browser context
+                             (npx playwright show-trace <file>)
+    profile/cdp_metrics.jsonl  one line per sampled window
+    profile/summary.json     totals per kind and the ours/site split
+
+Metrics sampling needs Chromium; on other engines only the trace is kept.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger("profiling")
+
+PROFILE_DIRNAME = "profile"
+METRICS_FILENAME = "cdp_metrics.jsonl"
+SUMMARY_FILENAME = "summary.json"
+
+# Cumulative CDP counters reported as before/after deltas
+COUNTERS = ("LayoutCount", "RecalcStyleCount", "LayoutDuration", "RecalcStyleDuration", "ScriptDuration")
+# Gauges reported as their value after the window
+GAUGES = ("JSHeapUsedSize", "Nodes")
+
+# Windows that measure our own injected scans; "hover" windows include them
+OWN_KINDS = ("extract", "scan")
+
+# Parallel workers of one session append to the same metrics file
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    key = str(path.resolve())
+    with _file_locks_guard:
+        return _file_locks.setdefault(key, threading.Lock())
+
+
+def profiling_enabled() -> bool:
+    """Whether browser profiling is on by default (HOVER_PROFILE, default: off)."""
+    return os.environ.get("HOVER_PROFILE", "0").lower() in ("1", "true", "yes")
+
+
+class PageProfiler:
+    """
+    Tracing and CDP metrics for one browser context (sync, browser thread).
+
+    Usage:
+        profiler = PageProfiler(output_dir / "profile")
+        profiler.start(context, page)
+        with profiler.window("hover", "Products menu"):
+            ...
+        profiler.stop()
+    """
+
+    def __init__(self, profile_dir):
+        self.profile_dir = Path(profile_dir)
+        self.trace_path = self.profile_dir / f"trace-{uuid.uuid4().hex[:8]}.zip"
+        self._context = None
+        self._cdp = None
+        self._tracing = False
+
+    def start(self, context, page) -> None:
+        """Start tracing the context and enable CDP metrics on its page."""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self._context = context
+        try:
+            context.tracing.start(screenshots=True, snapshots=True)
+            self._tracing = True
+        except Exception as e:
+            _logger.warning(f"Playwright tracing unavailable: {e}")
+        try:
+            self._cdp = context.new_cdp_session(page)
+            self._cdp.send("Performance.enable")
+        except Exception as e:
+            # CDP sessions only exist on Chromium
+            _logger.warning(f"CDP performance metrics unavailable: {e}")
+            self._cdp = None
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """Current CDP performance metrics by name, or None if unavailable."""
+        if self._cdp is None:
+            return None
+        try:
+            metrics = self._cdp.send("Performance.getMetrics")["metrics"]
+        except Exception as e:
+            _logger.warning(f"Performance.getMetrics failed: {e}")
+            return None
+        return {m["name"]: m["value"] for m in metrics}
+
+    @contextmanager
+    def window(self, kind: str, label: Optional[str] = None):
+        """Sample metrics around a block and append the deltas to cdp_metrics.jsonl."""
+        before = self.sample()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            after = self.sample() if before is not None else None
+            if after is not None:
+                self._append(window_record(kind, label, ms, before, after))
+
+    def _append(self, record: dict) -> None:
+        path = self.profile_dir / METRICS_FILENAME
+        try:
+            with _lock_for(path), path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            _logger.warning(f"Failed to write {path}: {e}")
+
+    def stop(self) -> None:
+        """Save the trace and refresh summary.json (never raises)."""
+        if self._tracing:
+            try:
+                self._context.tracing.stop(path=str(self.trace_path))
+                _logger.info(f"Playwright trace saved: {self.trace_path}")
+            except Exception as e:
+                _logger.warning(f"Failed to save Playwright trace: {e}")
+        if self._cdp is not None:
+            try:
+                self._cdp.detach()
+            except Exception:
+                pass  # the page may already be gone
+        self._tracing = False
+        self._cdp = None
+        write_summary(self.profile_dir)
+
+
+def window_record(kind: str, label: Optional[str], ms: float,
+                  before: Dict[str, float], after: Dict[str, float]) -> dict:
+    """One cdp_metrics.jsonl line: counter deltas and gauges of a sampled window."""
+    record = {"kind": kind, "label": label, "ms": round(ms, 1)}
+    for name in COUNTERS:
+        if name in after:
+            record[name] = round(after[name] - before.get(name, 0), 4)
+    for name in GAUGES:
+        if name in after:
+            record[name] = after[name]
+    return record
+
+
+def load_windows(profile_dir) -> List[dict]:
+    """All sampled windows of a session (unreadable lines are skipped)."""
+    path = Path(profile_dir) / METRICS_FILENAME
+    if not path.exists():
+        return []
+    windows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            windows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return windows
+
+
+def summarize_windows(windows: List[dict]) -> dict:
+    """
+    Totals per window kind and the split between our scans and the site.
+
+    Args:
+        windows: Records from cdp_metrics.jsonl
+
+    Returns:
+        dict with "kinds" (kind -> n, ms and counter totals, peak JS heap) and
+        "attribution" ("ours": extraction and hover DOM-diff scans, "site":
+        navigations plus hover windows minus the scans inside them)
+    """
+    kinds: Dict[str, dict] = {}
+    for window in windows:
+        totals = kinds.setdefault(window["kind"], {"n": 0, "ms": 0.0})
+        totals["n"] += 1
+        totals["ms"] += window.get("ms", 0)
+        for name in COUNTERS:
+            totals[name] = totals.get(name, 0) + window.get(name, 0)
+        if "JSHeapUsedSize" in window:
+            totals["peak_js_heap"] = max(totals.get("peak_js_heap", 0), window["JSHeapUsedSize"])
+
+    def total(kind, name):
+        return kinds.get(kind, {}).get(name, 0)
+
+    attribution = {"ours": {}, "site": {}}
+    for name in ("ms",) + COUNTERS:
+        ours = sum(total(kind, name) for kind in OWN_KINDS)
+        site = total("navigate", name) + max(0, total("hover", name) - total("scan", name))
+        attribution["ours"][name] = round(ours, 4)
+        attribution["site"][name] = round(site, 4)
+
+    for totals in kinds.values():
+        for name in ("ms",) + COUNTERS:
+            if name in totals:
+                totals[name] = round(totals[name], 4)
+    return {"kinds": kinds, "attribution": attribution}
+
+
+def write_summary(profile_dir) -> Optional[dict]:
+    """Summarize cdp_metrics.jsonl into summary.json (None if nothing was sampled)."""
+    windows = load_windows(profile_dir)
+    if not windows:
+        return None
+    summary = summarize_windows(windows)
+    path = Path(profile_dir) / SUMMARY_FILENAME
+    try:
+        with _lock_for(path):
+            path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    except OSError as e:
+        _logger.warning(f"Failed to write {path}: {e}")
+    return summary
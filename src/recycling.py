@@ -0,0 +1,103 @@
+"""
+Page/context recycling for long-lived browser sessions.
+
+Heavy sites leak JS heap and renderer memory over many navigations and
+hundreds of hovers. A BrowserManager counts hovers and navigations since
+its context was created and, every few operations, samples the page's JS
+heap over CDP. Past any threshold of its RecyclePolicy the context is
+closed and replaced before the next operation, and the page is sent back
+to the URL it was on, so callers never notice.
+
+Thresholds come from the environment (0 disables a threshold):
+
+    BROWSER_RECYCLE_HOVERS      hovers per context (default 300)
+    BROWSER_RECYCLE_NAVIGATIONS navigations per context (default 100)
+    BROWSER_RECYCLE_HEAP_MB     used JS heap of the page (default 512)
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+_logger = logging.getLogger("recycling")
+
+DEFAULT_MAX_HOVERS = 300
+DEFAULT_MAX_NAVIGATIONS = 100
+DEFAULT_MAX_HEAP_MB = 512
+# Operations between heap samples (a CDP round trip each)
+DEFAULT_HEAP_CHECK_EVERY = 20
+
+
+@dataclass
+class RecyclePolicy:
+    """When to replace a session's page and context (0 disables a threshold)."""
+    max_hovers: int = DEFAULT_MAX_HOVERS
+    max_navigations: int = DEFAULT_MAX_NAVIGATIONS
+    max_heap_mb: float = DEFAULT_MAX_HEAP_MB
+    heap_check_every: int = DEFAULT_HEAP_CHECK_EVERY
+
+    @classmethod
+    def from_env(cls) -> "RecyclePolicy":
+        """Policy from BROWSER_RECYCLE_* environment variables."""
+        return cls(
+            max_hovers=int(os.environ.get("BROWSER_RECYCLE_HOVERS", DEFAULT_MAX_HOVERS)),
+            max_navigations=int(os.environ.get("BROWSER_RECYCLE_NAVIGATIONS", DEFAULT_MAX_NAVIGATIONS)),
+            max_heap_mb=float(os.environ.get("BROWSER_RECYCLE_HEAP_MB", DEFAULT_MAX_HEAP_MB)),
+        )
+
+    def should_sample_heap(self, operations: int) -> bool:
+        """Whether the heap is due for a sample after this many operations."""
+        return self.max_heap_mb > 0 and operations > 0 and operations % max(1, self.heap_check_every) == 0
+
+    def reason(self, hovers: int, navigations: int, heap_bytes: Optional[float] = None) -> Optional[str]:
+        """
+        Why the context should be recycled now, or None.
+
+        Args:
+            hovers: Hovers since the context was created
+            navigations: Navigations since the context was created
+            heap_bytes: Latest used JS heap sample, if one was taken
+
+        Returns:
+            Short human-readable reason for the logs, or None to keep the context
+        """
+        if self.max_hovers and hovers >= self.max_hovers:
+            return f"{hovers} hovers"
+        if self.max_navigations and navigations >= self.max_navigations:
+            return f"{navigations} navigations"
+        if self.max_heap_mb and heap_bytes is not None and heap_bytes >= self.max_heap_mb * 2**20:
+            return f"JS heap {heap_bytes / 2**20:.0f} MB"
+        return None
+
+
+class HeapProbe:
+    """
+    Samples the page's used JS heap over CDP (sync, browser thread).
+
+    Only Chromium has CDP sessions; elsewhere sample() returns None and only
+    the count thresholds apply.
+    """
+
+    def __init__(self, context, page):
+        self._cdp = None
+        try:
+            self._cdp = context.new_cdp_session(page)
+            self._cdp.send("Performance.enable")
+        except Exception as e:
+            _logger.info(f"JS heap sampling unavailable: {e}")
+            self._cdp = None
+
+    def sample(self) -> Optional[float]:
+        """Used JS heap in bytes, or None if it cannot be read."""
+        if self._cdp is None:
+            return None
+        try:
+            metrics = self._cdp.send("Performance.getMetrics")["metrics"]
+        except Exception as e:
+            _logger.warning(f"JS heap sample failed: {e}")
+            return None
+        for metric in metrics:
+            if metric["name"] == "JSHeapUsedSize":
+                return metric["value"]
+        return None
@@ -0,0 +1,535 @@
+"""
+Incremental markdown report writer.
+
+The report is assembled section by section (header, TLDR, one section per
+scenario, one per unmatched interactive behavior, summary) and streamed to a
+temporary file that replaces hover_report.md when complete, so readers never
+see a half-written report.
+
+Rendered sections are kept in a cache sidecar next to the report together
+with a digest of their inputs (scenario file stat + behavior record ID).
+Later calls reuse every section whose inputs are unchanged. Tools still
+don't refresh inline: schedule_refresh() coalesces the saves of a
+LIVE_REPORT_INTERVAL into one background rewrite, off the hover path. The
+final write cancels the pending refresh it supersedes, and refreshes still
+pending at exit are run before the process ends.
+"""
+
+import os
+import re
+import json
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO
+
+from .behavior_store import BehaviorStore
+
+_logger = logging.getLogger("report")
+
+REPORT_FILENAME = "hover_report.md"
+CACHE_FILENAME = ".hover_report.cache.json"
+DEFAULT_TITLE = "Hover Detection Report"
+
+# Interactive behaviors that get a detailed section in the report
+INTERACTIVE_BEHAVIORS = {"dropdown", "tooltip", "content_revealed"}
+
+# One writer at a time per report file (tools may refresh from several threads)
+_report_locks: Dict[str, threading.Lock] = {}
+_report_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    key = str(path.resolve())
+    with _report_locks_guard:
+        return _report_locks.setdefault(key, threading.Lock())
+
+
+# Debounced live refreshes: one pending timer per report file
+_pending_refreshes: Dict[str, threading.Timer] = {}
+_pending_guard = threading.Lock()
+DEFAULT_REFRESH_INTERVAL = 5.0
+
+
+def live_report_enabled() -> bool:
+    """Whether tools refresh the report after each save (LIVE_REPORT, default: on)."""
+    return os.environ.get("LIVE_REPORT", "1").lower() not in ("0", "false", "no")
+
+
+def refresh_interval() -> float:
+    """Seconds between live report refreshes (LIVE_REPORT_INTERVAL, default: 5)."""
+    return max(0.0, float(os.environ.get("LIVE_REPORT_INTERVAL", DEFAULT_REFRESH_INTERVAL)))
+
+
+def screenshot_ref(screenshot_path: str) -> str:
+    """
+    Resolve a behavior's screenshot reference to a report-relative path.
+    Works for content-addressed blobs and for numbered files from older sessions.
+    """
+    return f"screenshots/{Path(screenshot_path).name}"
+
+
+def _render_links(revealed_links: list) -> str:
+    if not revealed_links:
+        return ""
+    text = "#### Revealed Links\n\n"
+    for link in revealed_links[:5]:
+        text += f"- [{link.get('text', 'N/A')}]({link.get('href', 'N/A')})\n"
+    return text + "\n"
+
+
+def _render_scenario(scenario_file: Path, behavior: dict) -> str:
+    """Gherkin plus screenshot evidence for one scenario file."""
+    behavior_type = behavior.get("behavior", "unknown")
+    # no_change and unreachable scenarios only appear in the TLDR
+    if behavior_type in ("no_change", "unreachable"):
+        return ""
+
+    scenario_name = scenario_file.stem.replace("_", " ")
+    scenario_content = scenario_file.read_text(encoding="utf-8")
+    screenshot_before = behavior.get("screenshot_before")
+    screenshot_after = behavior.get("screenshot_after")
+
+    text = f"""### {scenario_name}
+
+**Behavior Detected:** `{behavior_type}`
+**Scenario File:** `scenarios/{scenario_file.name}`
+
+```gherkin
+{scenario_content}
+```
+
+"""
+    # Add screenshots immediately after the Gherkin
+    if screenshot_before or screenshot_after:
+        text += "#### Screenshot Evidence\n\n"
+        if screenshot_before and screenshot_after:
+            text += f"""| Before Hover | After Hover |
+|:------------:|:-----------:|
+| ![Before]({screenshot_ref(screenshot_before)}) | ![After]({screenshot_ref(screenshot_after)}) |
+
+"""
+        elif screenshot_before:
+            text += f"**Screenshot:** ![Before]({screenshot_ref(screenshot_before)})\n\n"
+
+    # Add the cropped changed region from the pixel diff
+    visual_diff = behavior.get("visual_diff") or {}
+    if visual_diff.get("diff_image"):
+        bbox = visual_diff["bbox"]
+        text += f"""#### Changed Region
+
+![Changed region]({screenshot_ref(visual_diff["diff_image"])})
+
+{visual_diff["changed_ratio"] * 100:.1f}% of the viewport changed, around ({bbox["x"]}, {bbox["y"]}) {bbox["width"]}x{bbox["height"]} px.
+
+"""
+
+    return text + _render_links(behavior.get("revealed_links", [])) + "---\n\n"
+
+
+def _render_unmatched(behavior: dict) -> str:
+    """Section for an interactive behavior without a scenario file."""
+    desc = behavior.get("element_description", behavior.get("selector", "Unknown element"))
+    screenshot_before = behavior.get("screenshot_before")
+    screenshot_after = behavior.get("screenshot_after")
+
+    text = f"""### {desc}
+
+**Behavior:** `{behavior.get("behavior", "unknown")}`
+
+"""
+    if screenshot_before and screenshot_after:
+        text += f"""| Before Hover | After Hover |
+|:------------:|:-----------:|
+| ![Before]({screenshot_ref(screenshot_before)}) | ![After]({screenshot_ref(screenshot_after)}) |
+
+"""
+    return text + _render_links(behavior.get("revealed_links", [])) + "---\n\n"
+
+
+def _keywords(text: str) -> List[str]:
+    """Lowercase words of two or more characters (e.g. "Company_Menu" -> ["company", "menu"])."""
+    return [w for w in re.split(r"[^0-9a-z]+", text.lower()) if len(w) > 1]
+
+
+class KeywordIndex:
+    """
+    Inverted index from description keywords to behavior records.
+
+    Fallback for scenario files without an explicit behavior link (sessions
+    recorded before save_gherkin_scenario linked them): each lookup only
+    touches the postings of the scenario name's keywords.
+    """
+
+    def __init__(self, behaviors: List[dict]):
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._behaviors = behaviors
+        for position, behavior in enumerate(behaviors):
+            for word in set(_keywords(behavior.get("element_description", ""))):
+                self._postings[word].append(position)
+
+    def match(self, scenario_stem: str) -> dict:
+        """
+        Best matching behavior for a scenario file stem, or {}.
+
+        The behavior sharing the most keywords wins (at least half of the
+        scenario's keywords must match); ties go to the earliest record.
+        """
+        keywords = set(_keywords(scenario_stem))
+        scores: Dict[int, int] = defaultdict(int)
+        for word in keywords:
+            for position in self._postings.get(word, ()):
+                scores[position] += 1
+        if not scores:
+            return {}
+        position = min(scores, key=lambda p: (-scores[p], p))
+        if scores[position] >= len(keywords) / 2:
+            return self._behaviors[position]
+        return {}
+
+
+def _has_screenshots(behavior: dict) -> bool:
+    return bool(behavior.get("screenshot_before") or behavior.get("screenshot_after"))
+
+
+class ReportWriter:
+    """
+    Writes hover_report.md for one session folder, reusing unchanged sections.
+
+    Usage:
+        path = ReportWriter("output/my-session").write("Report for example.com", tldr, "my-session")
+        ReportWriter("output/my-session").write()  # refresh with the previous title
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.report_path = self.output_dir / REPORT_FILENAME
+        self.cache_path = self.output_dir / CACHE_FILENAME
+        self.store = BehaviorStore(self.output_dir)
+        self._cached_sections: Dict[str, dict] = {}
+        self._sections: Dict[str, dict] = {}
+        self.reused = 0
+        self.rendered = 0
+
+    def _load_cache(self) -> dict:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, IOError) as e:
+            _logger.warning(f"Ignoring unreadable report cache {self.cache_path}: {e}")
+            return {}
+
+    def _section(self, key: str, digest: str, render: Callable[[], str], **extra) -> dict:
+        """Return the cached section for key if its digest matches, else render it."""
+        cached = self._cached_sections.get(key)
+        if cached and cached.get("digest") == digest:
+            self.reused += 1
+            section = cached
+        else:
+            self.rendered += 1
+            section = {"digest": digest, "text": render(), **extra}
+        self._sections[key] = section
+        return section
+
+    def write(self, report_title: Optional[str] = None, tldr_content: str = "",
+              session_id: Optional[str] = None) -> str:
+        """
+        Build the report and atomically replace hover_report.md.
+
+        Args:
+            report_title: Title for the report (default: the previous title, or DEFAULT_TITLE)
+            tldr_content: TLDR summary (falls back to tldr.md on disk)
+            session_id: Session ID shown in the report (default: the previous one)
+
+        Returns:
+            Path to the generated markdown report file
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with _lock_for(self.report_path):
+            cache = self._load_cache()
+            self._cached_sections = cache.get("sections", {})
+            self._sections = {}
+            report_title = report_title or cache.get("title") or DEFAULT_TITLE
+            session_id = session_id or cache.get("session_id")
+
+            tmp_path = self.report_path.with_name(f".{REPORT_FILENAME}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as out:
+                    self._stream(out, report_title, tldr_content, session_id)
+                os.replace(tmp_path, self.report_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+            # Only sections used in this report are kept, so stale ones drop out
+            cache_tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            cache_tmp.write_text(json.dumps({
+                "title": report_title,
+                "session_id": session_id,
+                "sections": self._sections,
+            }), encoding="utf-8")
+            os.replace(cache_tmp, self.cache_path)
+
+        _logger.info(f"Report written to {self.report_path} ({self.rendered} sections rendered, {self.reused} reused)")
+        return str(self.report_path)
+
+    @staticmethod
+    def _pages_table(behaviors: List[dict], pages: List[str]) -> str:
+        """Per-page element counts for multi-page (crawl) sessions."""
+        tested = defaultdict(int)
+        interactive = defaultdict(int)
+        for behavior in behaviors:
+            tested[behavior.get("page_url")] += 1
+            if behavior.get("behavior") in INTERACTIVE_BEHAVIORS:
+                interactive[behavior.get("page_url")] += 1
+        table = "\n### Pages\n\n| Page | Elements tested | Interactive |\n|------|-----------------|-------------|\n"
+        for url in pages:
+            table += f"| {url} | {tested[url]} | {interactive[url]} |\n"
+        return table
+
+    def _stream(self, out: TextIO, report_title: str, tldr_content: str, session_id: Optional[str]) -> None:
+        """Write every section of the report to out, in order."""
+        out.write(f"""# {report_title}
+
+Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+Session ID: `{session_id or 'N/A'}`
+
+---
+
+""")
+
+        # Add TLDR at the top if available (falls back to tldr.md on disk)
+        if not tldr_content:
+            tldr_path = self.output_dir / "tldr.md"
+            if tldr_path.exists():
+                tldr_content = tldr_path.read_text(encoding="utf-8")
+                _logger.info(f"Loaded TLDR from: {tldr_path}")
+        if tldr_content:
+            out.write(tldr_content)
+        else:
+            out.write("""## TLDR - Executive Summary
+
+*No TLDR summary available. Run generate_tldr before generate_report for an executive summary.*
+
+---
+
+""")
+
+        out.write("""## Table of Contents
+
+1. [TLDR - Executive Summary](#tldr---executive-summary)
+2. [Test Scenarios with Evidence](#test-scenarios-with-evidence)
+3. [Summary](#summary)
+
+---
+
+## Test Scenarios with Evidence
+
+Each scenario includes the Gherkin specification followed by before/after screenshot comparison.
+
+""")
+
+        # Load behaviors from the session store (more reliable than LLM-passed parameter)
+        behaviors = self.store.all()
+
+        # Scenarios are linked to their behavior explicitly; unlinked behaviors
+        # (older sessions) are matched by description keywords instead
+        by_scenario = {}
+        for behavior in behaviors:
+            scenario_file = behavior.get("scenario_file")
+            if scenario_file:
+                by_scenario[Path(scenario_file).name] = behavior
+        keyword_index = None
+
+        scenarios_dir = self.output_dir / "scenarios"
+        scenario_files = sorted(scenarios_dir.glob("*.feature")) if scenarios_dir.exists() else []
+        matched = []
+        for scenario_file in scenario_files:
+            behavior = by_scenario.get(scenario_file.name)
+            if behavior is None:
+                if keyword_index is None:
+                    keyword_index = KeywordIndex([b for b in behaviors if not b.get("scenario_file")])
+                behavior = keyword_index.match(scenario_file.stem)
+            matched.append((scenario_file, behavior))
+
+        # Site crawls: group sections by page, in crawl order
+        pages = list(dict.fromkeys(b["page_url"] for b in behaviors if b.get("page_url")))
+        multi_page = len(pages) > 1
+        page_rank = {url: rank for rank, url in enumerate(pages)}
+
+        def page_of(behavior: dict) -> int:
+            return page_rank.get(behavior.get("page_url"), len(pages))
+
+        def page_header(behavior: dict, current: list) -> None:
+            page_url = behavior.get("page_url") or "Other"
+            if multi_page and current[0] != page_url:
+                current[0] = page_url
+                out.write(f"### Page: {page_url}\n\n")
+
+        if multi_page:
+            matched.sort(key=lambda item: page_of(item[1]))
+
+        has_screenshots = False
+        current_page = [None]
+        for scenario_file, behavior in matched:
+            stat = scenario_file.stat()
+            digest = f"{stat.st_mtime_ns}:{stat.st_size}:{behavior.get('id')}"
+            section = self._section(
+                f"scenario:{scenario_file.name}", digest,
+                lambda: _render_scenario(scenario_file, behavior),
+                screenshots=_has_screenshots(behavior),
+            )
+            if section["text"]:
+                page_header(behavior, current_page)
+            has_screenshots = has_screenshots or (bool(section["text"]) and section.get("screenshots", False))
+            out.write(section["text"])
+
+        if not scenario_files:
+            out.write("""*No individual Gherkin scenario files were saved for this session.*
+
+---
+
+""")
+
+        # Add any INTERACTIVE behaviors that didn't have matching scenario files
+        # Filter out no_change and error - they only appear in TLDR
+        unmatched = [
+            b for b in behaviors
+            if not b.get("scenario_file") and b.get("behavior") in INTERACTIVE_BEHAVIORS
+        ]
+        if multi_page:
+            unmatched.sort(key=page_of)
+        if unmatched:
+            out.write("""## Additional Interactive Elements
+
+These interactive hover elements were detected but don't have individual scenario files.
+
+""")
+            current_page = [None]
+            for behavior in unmatched:
+                page_header(behavior, current_page)
+                has_screenshots = has_screenshots or _has_screenshots(behavior)
+                # Behavior records are append-only, so the ID identifies the content
+                section = self._section(
+                    f"behavior:{behavior['id']}", str(behavior["id"]),
+                    lambda: _render_unmatched(behavior),
+                )
+                out.write(section["text"])
+
+        if not has_screenshots and not scenario_files:
+            out.write("*No screenshots were captured during this test run.*\n\n")
+
+        counts = self.store.counts()
+        out.write(f"""## Summary
+
+| Metric | Count |
+|--------|-------|
+| Total elements tested | {len(behaviors)} |
+| Dropdowns detected | {counts.get('dropdown', 0)} |
+| Tooltips detected | {counts.get('tooltip', 0)} |
+| Content revealed | {counts.get('content_revealed', 0)} |
+| Style change only | {counts.get('style_change', 0)} |
+| No change | {counts.get('no_change', 0)} |
+| Unreachable | {counts.get('unreachable', 0)} |
+| Scenario files generated | {len(scenario_files)} |
+{self._pages_table(behaviors, pages) if multi_page else ""}
+### Output Structure
+
+```
+output/{session_id or ''}/
+├── hover_report.md          (this report)
+├── screenshots/             (before/after images, one file per unique image)
+│   ├── <sha256>.png
+│   └── manifest.jsonl       (screenshot name -> image)
+├── scenarios/               (individual Gherkin files)
+│   └── *.feature
+└── behaviors.db             (hover detection data, SQLite)
+```
+""")
+
+
+def refresh_report(output_dir, session_id: Optional[str] = None) -> Optional[str]:
+    """
+    Bring hover_report.md up to date after new behaviors or scenarios were saved.
+
+    Keeps the title of the last generate_report call. Failures are logged,
+    never raised, so a report problem can't fail a hover.
+
+    Returns:
+        Path to the report, or None if live reports are disabled or the refresh failed
+    """
+    if not live_report_enabled():
+        return None
+    try:
+        return ReportWriter(output_dir).write(session_id=session_id)
+    except Exception as e:
+        _logger.warning(f"Live report refresh failed: {type(e).__name__}: {e}")
+        return None
+
+
+def schedule_refresh(output_dir, session_id: Optional[str] = None) -> bool:
+    """
+    Request a live report refresh without waiting for it.
+
+    Saves within LIVE_REPORT_INTERVAL seconds are coalesced into one
+    refresh_report() call on a timer thread, so a hover never pays for a
+    report rewrite and a session rewrites the report at most once per interval.
+
+    Returns:
+        True if a new refresh was scheduled, False if one was already pending
+        (or live reports are disabled)
+    """
+    if not live_report_enabled():
+        return False
+    key = str((Path(output_dir) / REPORT_FILENAME).resolve())
+
+    def run():
+        with _pending_guard:
+            _pending_refreshes.pop(key, None)
+        refresh_report(output_dir, session_id)
+
+    with _pending_guard:
+        if key in _pending_refreshes:
+            return False
+        timer = threading.Timer(refresh_interval(), run)
+        timer.daemon = True
+        _pending_refreshes[key] = timer
+    timer.start()
+    return True
+
+
+def cancel_refresh(output_dir) -> bool:
+    """
+    Drop the pending live refresh of a report, if any.
+
+    Called before a full report write, which makes the refresh redundant and
+    would otherwise be overwritten by it a few seconds later.
+
+    Returns:
+        True if a pending refresh was cancelled
+    """
+    key = str((Path(output_dir) / REPORT_FILENAME).resolve())
+    with _pending_guard:
+        timer = _pending_refreshes.pop(key, None)
+    if timer is None:
+        return False
+    timer.cancel()
+    return True
+
+
+def flush_refreshes() -> None:
+    """Run every pending live refresh now (registered to run at exit)."""
+    with _pending_guard:
+        timers = list(_pending_refreshes.values())
+    for timer in timers:
+        timer.cancel()
+        # Timer.function pops itself from the pending map before refreshing
+        timer.function()
+
+
+# Timer threads are daemons, so pending refreshes would die with the process
+atexit.register(flush_refreshes)
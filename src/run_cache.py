@@ -0,0 +1,159 @@
+"""
+Cross-run hover result cache for incremental (regression) runs.
+
+Every run normally starts from zero in a new output/<session_id>. With
+--incremental, each hover result is remembered in output/.hover_cache.db
+under its page URL + selector, together with the element's state
+fingerprint: structure, computed styles and applicable :hover rules (see
+BrowserManager.component_fingerprints(styles=True)). The next run only
+re-hovers elements whose fingerprint changed. For the rest it carries the
+previous behavior record, scenario and screenshots forward into the new
+session.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+_logger = logging.getLogger("run_cache")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        url TEXT NOT NULL,
+        selector TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        session_id TEXT,
+        record TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (url, selector)
+    );
+"""
+
+# Results not worth carrying forward: the element may well work next time
+UNCACHEABLE_BEHAVIORS = {"error", "unreachable"}
+
+
+class RunCache:
+    """
+    Latest hover result per (URL, selector), valid while the fingerprint matches.
+
+    Usage:
+        cache = RunCache("output")
+        previous = cache.lookup(url, "#products", fingerprint)
+        cache.put(url, "#products", fingerprint, result, session_id)
+    """
+
+    FILENAME = ".hover_cache.db"
+
+    def __init__(self, base_output_dir):
+        self.path = Path(base_output_dir) / self.FILENAME
+        self._ready = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection for one transaction (committed or rolled back, then closed)."""
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    self._ready = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, url: str, selector: str, fingerprint: str) -> Optional[dict]:
+        """
+        Previous result for an element, if its fingerprint is unchanged.
+
+        Returns:
+            dict with "record" (the stored hover result) and "session_id", or None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT session_id, record FROM results WHERE url = ? AND selector = ? AND fingerprint = ?",
+                (url, selector, fingerprint),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"session_id": row[0], "record": json.loads(row[1])}
+
+    def put(self, url: str, selector: str, fingerprint: str, record: dict, session_id: Optional[str]) -> bool:
+        """
+        Remember the latest result for an element.
+
+        Returns:
+            False if the result is not cacheable (errors, unreachable elements)
+        """
+        if record.get("behavior") in UNCACHEABLE_BEHAVIORS:
+            return False
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (url, selector, fingerprint, session_id, record, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, selector, fingerprint, session_id, json.dumps(record, ensure_ascii=False), time.time()),
+            )
+        return True
+
+
+def carry_forward(manager, cached: dict) -> Optional[dict]:
+    """
+    Copy a cached result's screenshots into the manager's session.
+
+    Args:
+        manager: BrowserManager of the current run
+        cached: Result of RunCache.lookup
+
+    Returns:
+        The result with paths pointing into the current session and a
+        "carried_forward" marker, or None if a referenced file is gone
+        (the element then has to be hovered again)
+    """
+    record = dict(cached["record"])
+    label = record.get("element_description") or record.get("selector", "element")
+
+    for key, suffix in (("screenshot_before", "before"), ("screenshot_after", "after")):
+        if record.get(key):
+            adopted = manager.adopt_screenshot(record[key], f"{label}_{suffix}")
+            if adopted is None:
+                return None
+            record[key] = adopted
+
+    visual_diff = record.get("visual_diff")
+    if visual_diff and visual_diff.get("diff_image"):
+        adopted = manager.adopt_screenshot(visual_diff["diff_image"], f"{label}_diff")
+        if adopted is None:
+            return None
+        record["visual_diff"] = {**visual_diff, "diff_image": adopted}
+
+    scenario_file = record.pop("scenario_file", None)
+    if scenario_file:
+        try:
+            record["scenario_content"] = Path(scenario_file).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    record["carried_forward"] = {
+        "session_id": cached.get("session_id"),
+        "behavior_id": record.pop("behavior_id", None),
+    }
+    return record
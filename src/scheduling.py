@@ -0,0 +1,152 @@
+"""
+Hover candidate scoring and budgeted scheduling.
+
+Most elements on a page never react to hover (plain footer links are
+almost always no_change), so hovering them in document order wastes the
+time budget. Every extracted element is scored by signals that predict a
+hover behavior: aria-haspopup, aria-expanded, data-toggle, dropdown/menu
+classes, a nested or sibling list, an expand arrow, menu roles and the
+landmark it sits in. Targets are hovered in score order, so a run cut off
+by max_elements or a wall-clock budget has already covered the most
+interesting elements.
+
+Usage:
+    targets = rank_candidates(structure, hoverables)[:40]
+    results = await manager.hover_many(targets, deadline=budget_deadline(60))
+"""
+
+import time
+from typing import Dict, List, Optional
+
+# Signal -> score contribution
+SIGNAL_WEIGHTS: Dict[str, float] = {
+    "popup": 4,          # aria-haspopup
+    "expanded": 3,       # aria-expanded present (collapsible)
+    "toggle": 3,         # data-toggle / data-bs-toggle
+    "child_list": 3,     # nested or sibling ul/ol/menu
+    "dropdown_class": 2, # dropdown/menu/submenu/mega classes
+    "expand_button": 2,  # expand/arrow/caret child
+    "menu_role": 1,      # menu/menubar/menuitem roles
+}
+
+# Landmark the element sits in -> score contribution
+LANDMARK_WEIGHTS: Dict[str, float] = {
+    "navigation": 2,
+    "banner": 2,
+    "complementary": 0,
+    "main": 0,
+    "contentinfo": -3,   # footers: link lists that never open anything
+}
+
+_MENU_ROLES = {"menu", "menubar", "menuitem", "menuitemcheckbox", "menuitemradio"}
+
+
+def _flag(value) -> bool:
+    """Truthy attribute value ("false" and empty strings count as absent)."""
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "false")
+    return bool(value)
+
+
+def candidate_signals(item: dict) -> List[str]:
+    """
+    Hover signals present on an extracted element.
+
+    Accepts items from any get_page_structure group or find_hoverable_elements
+    (they spell some attributes differently).
+    """
+    signals = []
+    if _flag(item.get("ariaPopup") or item.get("hasPopup")):
+        signals.append("popup")
+    expanded = item.get("ariaExpanded", item.get("expanded"))
+    if expanded is not None:
+        signals.append("expanded")
+    if _flag(item.get("dataToggle")):
+        signals.append("toggle")
+    if item.get("childList"):
+        signals.append("child_list")
+    if item.get("dropdownClass"):
+        signals.append("dropdown_class")
+    if item.get("hasExpandButton"):
+        signals.append("expand_button")
+    if (item.get("role") or "").lower() in _MENU_ROLES:
+        signals.append("menu_role")
+    return signals
+
+
+def score_candidate(item: dict) -> float:
+    """Likelihood score of a hover behavior (higher is hovered first)."""
+    score = sum(SIGNAL_WEIGHTS[signal] for signal in candidate_signals(item))
+    return score + LANDMARK_WEIGHTS.get(item.get("landmark") or "", 0)
+
+
+def sort_by_score(items: List[dict]) -> List[dict]:
+    """Copies of items with a "score" key, highest first (ties keep document order)."""
+    scored = [{**item, "score": score_candidate(item)} for item in items]
+    return sorted(scored, key=lambda item: -item["score"])
+
+
+def rank_candidates(structure: dict, hoverables: list) -> List[dict]:
+    """
+    Merge get_page_structure and find_hoverable_elements output into scored targets.
+
+    The same selector found in several groups is one target whose signals are
+    the union of all its entries. Its description comes from the first group
+    (menus, hover candidates, buttons, links, hoverables).
+
+    Args:
+        structure: Result of BrowserManager.get_page_structure()
+        hoverables: Result of BrowserManager.find_hoverable_elements()
+
+    Returns:
+        List of {"selector", "description", "score"} dicts, highest score first
+    """
+    groups = [
+        structure.get("menus", []),
+        structure.get("hover_candidates", []),
+        structure.get("buttons", []),
+        structure.get("links", []),
+        hoverables,
+    ]
+
+    merged: Dict[str, dict] = {}
+    descriptions: Dict[str, str] = {}
+    for group in groups:
+        for item in group:
+            selector = item.get("selector")
+            if not selector:
+                continue
+            if selector not in merged:
+                name = (item.get("name") or item.get("text") or "").strip()
+                kind = (item.get("role") or item.get("tag") or "element").lower()
+                descriptions[selector] = f"{name} {kind}" if name else selector
+                merged[selector] = dict(item)
+            else:
+                entry = merged[selector]
+                for key, value in item.items():
+                    if value not in (None, "", False) and entry.get(key) in (None, "", False):
+                        entry[key] = value
+
+    targets = [
+        {"selector": selector, "description": descriptions[selector], "score": score_candidate(item)}
+        for selector, item in merged.items()
+    ]
+    return sorted(targets, key=lambda target: -target["score"])
+
+
+def budget_deadline(max_seconds: Optional[float], started: Optional[float] = None) -> Optional[float]:
+    """
+    time.monotonic() deadline for a wall-clock budget (None: no budget).
+
+    Args:
+        max_seconds: Budget in seconds
+        started: monotonic start time (default: now)
+    """
+    if max_seconds is None:
+        return None
+    return (time.monotonic() if started is None else started) + max_seconds
+
+
+def past_deadline(deadline: Optional[float]) -> bool:
+    """Whether a budget_deadline() has passed."""
+    return deadline is not None and time.monotonic() >= deadline
@@ -0,0 +1,168 @@
+"""
+Per-phase timing of hovers and page operations.
+
+hover_and_detect records how long each phase of a hover took (reset,
+scrolling, the hover fallback chain, settling, screenshots, DOM diffing,
+visual diff) in the behavior record under "timings". Navigation and cold
+structure extraction are recorded in the session's behavior store.
+
+aggregate_session() turns both into per-phase statistics for a session;
+write_metrics() saves them as metrics.json and the TLDR shows the summary,
+so the real bottleneck on a site is visible instead of guessed.
+"""
+
+import json
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+_logger = logging.getLogger("timing")
+
+METRICS_FILENAME = "metrics.json"
+
+
+class PhaseTimer:
+    """
+    Wall-clock milliseconds per named phase; repeated phases accumulate.
+
+    Usage:
+        timer = PhaseTimer()
+        with timer.phase("reset"):
+            ...
+        result["timings"] = timer.as_dict()
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name: str, ms: float) -> None:
+        """Add a measured span to a phase."""
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        """Spans rounded to 0.1 ms, plus "total" since the timer was created."""
+        timings = {name: round(ms, 1) for name, ms in self.spans.items()}
+        timings["total"] = round((time.perf_counter() - self._started) * 1000, 1)
+        return timings
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def summarize(samples: Iterable[float]) -> dict:
+    """Count, total, mean and p50/p90/p99/max of millisecond samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    total = sum(ordered)
+    return {
+        "n": len(ordered),
+        "total_ms": round(total, 1),
+        "mean_ms": round(total / len(ordered), 1),
+        "p50": round(percentile(ordered, 50), 1),
+        "p90": round(percentile(ordered, 90), 1),
+        "p99": round(percentile(ordered, 99), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def aggregate_session(store) -> dict:
+    """
+    Per-phase statistics of a session.
+
+    Args:
+        store: The session's BehaviorStore
+
+    Returns:
+        dict with "hovers" (timed hovers), "hover_phases" and "page" (phase ->
+        summarize() stats) and "bottleneck" (hover phase with the most total time)
+    """
+    phases: Dict[str, List[float]] = {}
+    hovers = 0
+    for record in store.all():
+        timings = record.get("timings")
+        # Carried-forward records were timed in an earlier run
+        if not timings or record.get("carried_forward"):
+            continue
+        hovers += 1
+        for name, ms in timings.items():
+            phases.setdefault(name, []).append(ms)
+
+    page: Dict[str, List[float]] = {}
+    for timing in store.timings():
+        page.setdefault(timing["kind"], []).append(timing["ms"])
+
+    hover_phases = {name: summarize(samples) for name, samples in phases.items()}
+    ranked = sorted(
+        ((stats["total_ms"], name) for name, stats in hover_phases.items() if name != "total"),
+        reverse=True,
+    )
+    return {
+        "hovers": hovers,
+        "hover_phases": hover_phases,
+        "page": {kind: summarize(samples) for kind, samples in page.items()},
+        "bottleneck": ranked[0][1] if ranked else None,
+    }
+
+
+def write_metrics(output_dir, store) -> dict:
+    """
+    Aggregate a session's timings and save them as metrics.json.
+
+    Returns:
+        The aggregate (see aggregate_session)
+    """
+    metrics = aggregate_session(store)
+    path = Path(output_dir) / METRICS_FILENAME
+    try:
+        path.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    except OSError as e:
+        _logger.warning(f"Failed to write {path}: {e}")
+    return metrics
+
+
+def render_performance(metrics: dict) -> str:
+    """
+    Markdown performance section for the TLDR ("" if nothing was timed).
+    """
+    hover_phases = metrics.get("hover_phases", {})
+    if not hover_phases and not metrics.get("page"):
+        return ""
+
+    lines = ["### Performance", ""]
+    total = hover_phases.get("total", {}).get("total_ms")
+    if metrics.get("bottleneck") and total:
+        share = hover_phases[metrics["bottleneck"]]["total_ms"] / total * 100
+        lines.append(
+            f"Hover time is dominated by **{metrics['bottleneck']}** ({share:.0f}% of "
+            f"{total / 1000:.1f}s over {metrics['hovers']} hovers).\n"
+        )
+
+    lines += ["| Phase | Count | Total (s) | Mean (ms) | p90 (ms) | Max (ms) |",
+              "|-------|-------|-----------|-----------|----------|----------|"]
+    rows = sorted(
+        ((f"page: {kind}", stats) for kind, stats in metrics.get("page", {}).items()),
+        key=lambda row: -row[1]["total_ms"],
+    ) + sorted(
+        ((f"hover: {name}", stats) for name, stats in hover_phases.items()),
+        key=lambda row: -row[1]["total_ms"],
+    )
+    for name, stats in rows:
+        lines.append(
+            f"| {name} | {stats['n']} | {stats['total_ms'] / 1000:.2f} | {stats['mean_ms']} "
+            f"| {stats['p90']} | {stats['max']} |"
+        )
+    return "\n".join(lines) + "\n\n"
@@ -2,71 +2,41 @@
 Custom LangChain tools for hover detection.
 These tools use the persistent BrowserManager session.
 
-Uses synchronous tools to avoid event loop conflicts with LangGraph server on Windows.
+Tools await BrowserManager directly: browser calls hop once onto the
+dedicated Playwright runtime thread (see runtime.py), file writes go through
+asyncio.to_thread.
 """
 
 import json
 import logging
 import asyncio
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from langchain_core.tools import tool
 
+from .behavior_store import BehaviorStore
+from .compact import CompactWriter
+from .report import INTERACTIVE_BEHAVIORS, ReportWriter, cancel_refresh, schedule_refresh
+from .scheduling import budget_deadline, sort_by_score
+from .timing import render_performance, write_metrics
+
 _logger = logging.getLogger("tools")
 
-# Global session ID for organizing output by thread
-_current_session_id: Optional[str] = None
+# Session ID for organizing output by thread. A ContextVar (rather than a module
+# global) so concurrent LangGraph threads each see their own browser session.
+_current_session_id: ContextVar[Optional[str]] = ContextVar("hover_session_id", default=None)
 
 
 def set_session_id(session_id: str) -> None:
     """Set the current session ID for organizing output folders."""
-    global _current_session_id
-    _current_session_id = session_id
+    _current_session_id.set(session_id)
     _logger.info(f"Session ID set to: {session_id}")
 
 
 def get_session_id() -> Optional[str]:
     """Get the current session ID."""
-    return _current_session_id
-
-# Thread pool for running async browser operations
-_browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser_tool")
-
-
-def _run_async_in_thread_sync(coro):
-    """Run an async coroutine in a separate thread with ProactorEventLoop on Windows (sync version)."""
-    import sys
-
-    def run():
-        if sys.platform == "win32":
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
-
-    future = _browser_executor.submit(run)
-    return future.result()
-
-
-async def _run_async_in_thread(coro):
-    """Run an async coroutine in a separate thread with ProactorEventLoop on Windows (async version)."""
-    import sys
-
-    def run():
-        if sys.platform == "win32":
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
-
-    return await asyncio.to_thread(run)
+    return _current_session_id.get()
 
 
 @tool
@@ -90,7 +60,7 @@ async def navigate_to_url(url: str) -> str:
         return title
 
     try:
-        title = await _run_async_in_thread(_navigate())
+        title = await _navigate()
         _logger.info(f"Navigation successful, title={title}")
         return f"Navigated to {url}. Page title: {title}"
     except Exception as e:
@@ -98,20 +68,73 @@ async def navigate_to_url(url: str) -> str:
         raise
 
 
+def _compact_structure(structure: dict, cursor: int = 0) -> str:
+    """Encode get_page_structure output as compact tables."""
+    out = CompactWriter(cursor=cursor)
+    out.fields(
+        title=structure.get("page_title"),
+        url=structure.get("url"),
+        counts=" ".join(f"{k}:{v}" for k, v in structure.get("summary", {}).items()),
+    )
+    out.line("")
+    out.table("hover_candidates", structure.get("hover_candidates", []), [
+        ("name", "name"), ("tag", "tag"), ("sel", "selector"), ("score", "score"),
+        ("popup", "ariaPopup"), ("exp", "ariaExpanded"), ("toggle", "dataToggle"),
+    ])
+    out.table("menus", structure.get("menus", []), [
+        ("name", "name"), ("role", "role"), ("sel", "selector"), ("score", "score"),
+        ("popup", "hasPopup"), ("exp", "expanded"),
+    ])
+    out.table("buttons", structure.get("buttons", []), [
+        ("name", "name"), ("sel", "selector"), ("score", "score"), ("popup", "hasPopup"), ("exp", "expanded"),
+    ])
+    out.table("links", structure.get("links", []), [
+        ("name", "name"), ("sel", "selector"), ("score", "score"), ("href", "href"),
+    ])
+    out.table("landmarks", structure.get("landmarks", []), [("role", "role"), ("name", "name"), ("sel", "selector")])
+    return out.render()
+
+
+def _compact_hover_result(result: dict) -> str:
+    """Encode a single hover result: key=value fields, then revealed links."""
+    out = CompactWriter()
+    screenshots = [
+        f"screenshots/{Path(result[key]).name}"
+        for key in ("screenshot_before", "screenshot_after")
+        if result.get(key)
+    ]
+    visual = result.get("visual_diff") or {}
+    out.fields(
+        id=result.get("behavior_id"),
+        beh=result.get("behavior"),
+        desc=result.get("element_description"),
+        sel=result.get("selector"),
+        new=result.get("new_elements_count"),
+        types=",".join(result.get("new_element_types", [])),
+        shots=",".join(screenshots),
+        visual=f"{visual['changed_ratio'] * 100:.1f}% changed" if visual.get("changed_ratio") else None,
+        error=(result.get("error") or "")[:200],
+    )
+    out.line("")
+    out.table("links", result.get("revealed_links", []), [("text", "text"), ("href", "href")])
+    return out.render(continuation="all revealed links are in the report")
+
+
 @tool
-async def get_page_structure() -> str:
+async def get_page_structure(cursor: int = 0) -> str:
     """
     Get comprehensive page structure using accessibility tree.
     Call this AFTER navigation to understand the page layout before testing hovers.
 
+    Args:
+        cursor: Row to continue from when a previous call ended with "more: ... cursor=N"
+
     Returns:
-        JSON with page structure including:
-        - summary: counts of menus, buttons, links, hover candidates
-        - menus: menu-related elements (menubar, menuitem, etc.)
-        - buttons: all buttons on the page
-        - links: navigation links
-        - hover_candidates: elements likely to have hover behavior (aria-haspopup, cursor:pointer, etc.)
-        - landmarks: page regions (navigation, banner, main, etc.)
+        Compact text: title/url/counts lines, then pipe-separated tables
+        (header "name[rows]{columns}:") for hover_candidates (elements likely to have
+        hover behavior), menus, buttons, links and landmarks. Rows are sorted by "score"
+        (likelihood of a hover behavior; footer links score below zero). Use the "sel"
+        column as the selector for hover_element / hover_elements_batch.
     """
     async def _get_structure():
         from .browser import get_browser_manager
@@ -119,18 +142,22 @@ async def get_page_structure() -> str:
         manager = await get_browser_manager(session_id=session_id)
         return await manager.get_page_structure()
 
-    structure = await _run_async_in_thread(_get_structure())
-    return json.dumps(structure, indent=2)
+    structure = await _get_structure()
+    return _compact_structure(structure, cursor)
 
 
 @tool
-async def find_hoverable_elements() -> str:
+async def find_hoverable_elements(cursor: int = 0) -> str:
     """
     Find all potentially hoverable elements on the current page using CSS selectors.
     Note: For better coverage, use get_page_structure() first to understand the page.
 
+    Args:
+        cursor: Row to continue from when a previous call ended with "more: ... cursor=N"
+
     Returns:
-        JSON string of hoverable elements with selectors
+        Compact table hoverables{text|tag|sel|score|cursor|expand} of hoverable elements,
+        most likely hover targets first
     """
     async def _find():
         from .browser import get_browser_manager
@@ -138,12 +165,17 @@ async def find_hoverable_elements() -> str:
         manager = await get_browser_manager(session_id=session_id)
         return await manager.find_hoverable_elements()
 
-    elements = await _run_async_in_thread(_find())
-    return json.dumps(elements, indent=2)
+    elements = sort_by_score(await _find())
+    out = CompactWriter(cursor=cursor)
+    out.table("hoverables", elements, [
+        ("text", "text"), ("tag", "tag"), ("sel", "selector"), ("score", "score"),
+        ("cursor", "cursor"), ("expand", "hasExpandButton"),
+    ])
+    return out.render()
 
 
 @tool
-async def save_gherkin_scenario(element_name: str, gherkin_content: str) -> str:
+async def save_gherkin_scenario(element_name: str, gherkin_content: str, behavior_id: Optional[int] = None) -> str:
     """
     Save an individual Gherkin scenario file for a hover interaction.
     Call this AFTER hover_element to save a custom Gherkin scenario based on the detected behavior.
@@ -151,6 +183,8 @@ async def save_gherkin_scenario(element_name: str, gherkin_content: str) -> str:
     Args:
         element_name: Name of the element (used for filename, e.g., "Products Menu")
         gherkin_content: The complete Gherkin feature content to save
+        behavior_id: behavior_id from the hover_element / hover_elements_batch result this
+                     scenario documents (recommended; links the scenario to its screenshots)
 
     Returns:
         Path to the saved .feature file
@@ -159,10 +193,27 @@ async def save_gherkin_scenario(element_name: str, gherkin_content: str) -> str:
         from .browser import get_browser_manager
         session_id = get_session_id()
         manager = await get_browser_manager(session_id=session_id)
-        return manager.save_scenario_file(element_name, gherkin_content)
 
-    filepath = await _run_async_in_thread(_save())
-    return f"Saved Gherkin scenario to: {filepath}"
+        def save():
+            link_id = behavior_id
+            if link_id is None:
+                # Same description as the hover call, else the most recent interactive hover
+                record = (
+                    manager.behaviors.latest_unlinked(element_description=element_name)
+                    or manager.behaviors.latest_unlinked(behaviors=INTERACTIVE_BEHAVIORS)
+                )
+                link_id = record["id"] if record else None
+            return manager.save_scenario_file(element_name, gherkin_content, behavior_id=link_id), link_id
+
+        # File and SQLite writes stay off the event loop
+        return await asyncio.to_thread(save)
+
+    filepath, link_id = await _save()
+    session_id = get_session_id()
+    schedule_refresh(_session_output_dir(session_id), session_id)
+    if link_id is None:
+        return f"Saved Gherkin scenario to: {filepath}"
+    return f"Saved Gherkin scenario to: {filepath} (linked to behavior #{link_id})"
 
 
 @tool
@@ -182,7 +233,8 @@ async def hover_element(selector: str, description: str, capture_screenshots: bo
                Use this when normal hover fails with "intercepts pointer events" error.
 
     Returns:
-        JSON string with detected behavior and screenshot paths
+        Compact key=value lines (id = behavior_id, beh = behavior, new = new element
+        count, shots = screenshots), then a links table of revealed links
     """
     async def _hover():
         from .browser import get_browser_manager
@@ -194,17 +246,102 @@ async def hover_element(selector: str, description: str, capture_screenshots: bo
         from .browser import get_browser_manager
         session_id = get_session_id()
         manager = await get_browser_manager(session_id=session_id)
-        return manager.save_behavior_file(description, behavior_data)
+        return await asyncio.to_thread(manager.save_behavior, description, behavior_data)
 
-    result = await _run_async_in_thread(_hover())
+    result = await _hover()
     result["element_description"] = description
 
-    # Automatically save behavior to disk for report generation
-    behavior_file = await _run_async_in_thread(_save_behavior(result))
-    result["behavior_file"] = behavior_file
-    _logger.info(f"Saved behavior to: {behavior_file}")
+    # Automatically record the behavior for report generation
+    behavior_id = await _save_behavior(result)
+    result["behavior_id"] = behavior_id
+    _logger.info(f"Saved behavior #{behavior_id}")
+    session_id = get_session_id()
+    schedule_refresh(_session_output_dir(session_id), session_id)
+
+    return _compact_hover_result(result)
+
 
-    return json.dumps(result, indent=2)
+@tool
+async def hover_elements_batch(elements: List[dict], capture_screenshots: bool = True, workers: int = 1,
+                               max_seconds: Optional[float] = None) -> str:
+    """
+    Hover over many elements in ONE call and detect what changes for each.
+    Prefer this over calling hover_element repeatedly. Every result is saved to disk
+    for report generation, exactly like hover_element.
+
+    After this tool returns, call save_gherkin_scenario for each result whose behavior
+    is dropdown, tooltip or content_revealed.
+
+    Args:
+        elements: List of {"selector": "...", "description": "..."} objects (optional "force": true)
+        capture_screenshots: Whether to capture before/after screenshots (default: True)
+        workers: Number of parallel browser pages to spread the elements over (default: 1,
+                 i.e. back to back on the current page)
+        max_seconds: Optional time budget; elements are started in list order (put the
+                     highest-scored first) and those not reached are listed as skipped
+
+    Returns:
+        Compact text: a counts line, a results table (id = behavior_id, one row per
+        hovered element in input order), a links table of links revealed by interactive
+        hovers and a skipped table of elements left for a later call
+    """
+    targets = [
+        {
+            "selector": e["selector"],
+            "description": e.get("description") or e["selector"],
+            "force": bool(e.get("force", False)),
+        }
+        for e in elements
+        if e.get("selector")
+    ]
+
+    async def _hover_batch():
+        from .browser import get_browser_manager
+        session_id = get_session_id()
+        manager = await get_browser_manager(session_id=session_id)
+        hovered = await manager.hover_many(targets, workers=workers, capture_screenshots=capture_screenshots,
+                                           deadline=budget_deadline(max_seconds))
+
+        def save_all():
+            # Persist every behavior, in input order so record IDs follow the targets
+            for target, result in zip(targets, hovered):
+                if result is None:
+                    continue
+                result["element_description"] = target["description"]
+                result["behavior_id"] = manager.save_behavior(target["description"], result)
+
+        await asyncio.to_thread(save_all)
+        return (
+            [result for result in hovered if result is not None],
+            [target for target, result in zip(targets, hovered) if result is None],
+        )
+
+    results, skipped = await _hover_batch()
+    _logger.info(f"hover_elements_batch tested {len(results)} elements")
+    session_id = get_session_id()
+    schedule_refresh(_session_output_dir(session_id), session_id)
+
+    counts = {}
+    links = []
+    for result in results:
+        behavior = result.get("behavior", "unknown")
+        counts[behavior] = counts.get(behavior, 0) + 1
+        if behavior in INTERACTIVE_BEHAVIORS:
+            links.extend({"id": result.get("behavior_id"), **link} for link in result.get("revealed_links", []))
+
+    out = CompactWriter()
+    out.fields(
+        tested=len(results),
+        counts=" ".join(f"{behavior}:{n}" for behavior, n in counts.items()),
+    )
+    out.line("")
+    out.table("results", [{**r, "error": (r.get("error") or "")[:200]} for r in results], [
+        ("id", "behavior_id"), ("desc", "element_description"), ("sel", "selector"),
+        ("beh", "behavior"), ("new", "new_elements_count"), ("error", "error"),
+    ])
+    out.table("links", links, [("id", "id"), ("text", "text"), ("href", "href")])
+    out.table("skipped", skipped, [("desc", "description"), ("sel", "selector")])
+    return out.render(continuation="all results are saved for the report")
 
 
 @tool
@@ -284,78 +421,65 @@ async def generate_gherkin(behaviors_json: str) -> str:
     return gherkin
 
 
-@tool
-async def generate_tldr(website_name: str = "website") -> str:
+def _session_output_dir(session_id: Optional[str]) -> Path:
+    """Output directory for a session (output/<session_id>, or output/)."""
+    base_output = Path("output")
+    if session_id:
+        return base_output / session_id
+    return base_output
+
+
+def write_tldr(output_dir: Path, website_name: str = "website", session_id: Optional[str] = None) -> str:
     """
-    Generate a TLDR (executive summary) of the hover detection results.
-    Call this BEFORE generate_report to create a high-level summary.
+    Build the TLDR summary from the behaviors in output_dir and save it as tldr.md.
 
-    Reads all behavior data from disk and produces a concise summary including:
-    - Total elements tested
-    - Key findings (dropdowns, tooltips, errors)
-    - Actionable insights
-    - Test coverage assessment
+    Also writes the session's timing aggregate to metrics.json.
 
     Args:
+        output_dir: Session output directory
         website_name: Name of the website being tested (for the summary title)
+        session_id: Session ID shown in the summary
 
     Returns:
-        TLDR summary text that should be passed to generate_report
+        TLDR summary text
     """
     from datetime import datetime
 
-    # Determine output directory based on session_id
-    session_id = get_session_id()
-    base_output = Path("output")
-    if session_id:
-        output_dir = base_output / session_id
-    else:
-        output_dir = base_output
-
-    behaviors_dir = output_dir / "behaviors"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     scenarios_dir = output_dir / "scenarios"
-
-    # Load behaviors from disk
-    behaviors = []
-    if behaviors_dir.exists():
-        behavior_files = sorted(behaviors_dir.glob("*.json"))
-        for bf in behavior_files:
-            try:
-                behavior_data = json.loads(bf.read_text(encoding="utf-8"))
-                behaviors.append(behavior_data)
-            except (json.JSONDecodeError, IOError) as e:
-                _logger.warning(f"Failed to load behavior file {bf}: {e}")
+    store = BehaviorStore(output_dir)
 
     # Count scenario files
     scenario_count = len(list(scenarios_dir.glob("*.feature"))) if scenarios_dir.exists() else 0
 
     # Calculate statistics
-    total_elements = len(behaviors)
-    dropdown_count = sum(1 for b in behaviors if b.get('behavior') == 'dropdown')
-    tooltip_count = sum(1 for b in behaviors if b.get('behavior') == 'tooltip')
-    content_count = sum(1 for b in behaviors if b.get('behavior') == 'content_revealed')
-    no_change_count = sum(1 for b in behaviors if b.get('behavior') == 'no_change')
-    unreachable_count = sum(1 for b in behaviors if b.get('behavior') == 'unreachable')
+    counts = store.counts()
+    total_elements = sum(counts.values())
+    dropdown_count = counts.get('dropdown', 0)
+    tooltip_count = counts.get('tooltip', 0)
+    content_count = counts.get('content_revealed', 0)
+    no_change_count = counts.get('no_change', 0)
+    style_count = counts.get('style_change', 0)
+    unreachable_count = counts.get('unreachable', 0)
 
     # Calculate success metrics (unreachable elements are expected in dynamic sites, not failures)
-    successful_interactions = dropdown_count + tooltip_count + content_count + no_change_count
+    successful_interactions = dropdown_count + tooltip_count + content_count + no_change_count + style_count
     success_rate = (successful_interactions / total_elements * 100) if total_elements > 0 else 0
     interactive_elements = dropdown_count + tooltip_count + content_count
 
     # Collect dropdown details
     dropdown_details = []
-    for b in behaviors:
-        if b.get('behavior') == 'dropdown':
-            desc = b.get('element_description', b.get('selector', 'Unknown'))
-            links = b.get('revealed_links', [])
-            dropdown_details.append(f"  - **{desc}**: reveals {len(links)} links")
+    for b in store.find_by_behavior('dropdown'):
+        desc = b.get('element_description', b.get('selector', 'Unknown'))
+        links = b.get('revealed_links', [])
+        dropdown_details.append(f"  - **{desc}**: reveals {len(links)} links")
 
     # Collect unreachable element details (first 3)
     unreachable_details = []
-    for b in behaviors:
-        if b.get('behavior') == 'unreachable':
-            desc = b.get('element_description', b.get('selector', 'Unknown'))
-            unreachable_details.append(f"  - {desc}")
+    for b in store.find_by_behavior('unreachable'):
+        desc = b.get('element_description', b.get('selector', 'Unknown'))
+        unreachable_details.append(f"  - {desc}")
 
     # Build TLDR
     tldr = f"""## TLDR - Executive Summary
@@ -394,6 +518,10 @@ async def generate_tldr(website_name: str = "website") -> str:
     if content_count > 0:
         tldr += f"**✅ Content Revealed on Hover ({content_count}):** Elements that show additional content on hover\n\n"
 
+    # Visual-only hover effects (pixel diff, no DOM change)
+    if style_count > 0:
+        tldr += f"**ℹ️ Visual Hover Effects ({style_count}):** Elements that change appearance on hover without revealing content\n\n"
+
     # Static elements
     if no_change_count > 0:
         tldr += f"**ℹ️ Static Elements ({no_change_count}):** Elements with no hover behavior (click-only)\n\n"
@@ -416,7 +544,7 @@ async def generate_tldr(website_name: str = "website") -> str:
         tldr += f"- The site has **{interactive_elements} interactive hover elements** that enhance user navigation\n"
 
     if dropdown_count > 0:
-        total_links = sum(len(b.get('revealed_links', [])) for b in behaviors if b.get('behavior') == 'dropdown')
+        total_links = store.link_total('dropdown')
         tldr += f"- Dropdown menus reveal a total of **{total_links} navigation links**\n"
 
     if unreachable_count > 0:
@@ -429,6 +557,11 @@ async def generate_tldr(website_name: str = "website") -> str:
     else:
         tldr += "- **Limited test coverage** - many elements could not be tested; consider manual verification\n"
 
+    # Where the time went (also saved as metrics.json)
+    performance = render_performance(write_metrics(output_dir, store))
+    if performance:
+        tldr += "\n" + performance.rstrip("\n") + "\n"
+
     tldr += "\n---\n\n"
 
     # Save TLDR to disk for generate_report to use
@@ -440,302 +573,114 @@ async def generate_tldr(website_name: str = "website") -> str:
 
 
 @tool
-async def generate_report(report_title: str = "Hover Detection Report", tldr_content: str = "") -> str:
+async def generate_tldr(website_name: str = "website") -> str:
     """
-    Generate a markdown report combining individual Gherkin scenarios with before/after screenshot comparisons.
-    Automatically reads behavior data and TLDR from disk if available.
+    Generate a TLDR (executive summary) of the hover detection results.
+    Call this BEFORE generate_report to create a high-level summary.
 
-    IMPORTANT: Call generate_tldr BEFORE this tool to create the executive summary.
+    Reads all behavior data from disk and produces a concise summary including:
+    - Total elements tested
+    - Key findings (dropdowns, tooltips, errors)
+    - Actionable insights
+    - Test coverage assessment
+    - Time spent per phase (navigation, extraction, hover phases), also saved as metrics.json
 
     Args:
-        report_title: Title for the report (default: "Hover Detection Report")
-        tldr_content: TLDR summary from generate_tldr (optional, falls back to disk file)
+        website_name: Name of the website being tested (for the summary title)
 
     Returns:
-        Path to the generated markdown report file
+        TLDR summary text that should be passed to generate_report
     """
-    from datetime import datetime
-
-    # Determine output directory based on session_id
     session_id = get_session_id()
-    base_output = Path("output")
-    if session_id:
-        output_dir = base_output / session_id
-    else:
-        output_dir = base_output
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-    scenarios_dir = output_dir / "scenarios"
-    behaviors_dir = output_dir / "behaviors"
-
-    # Try to load TLDR from disk if not provided
-    if not tldr_content:
-        tldr_path = output_dir / "tldr.md"
-        if tldr_path.exists():
-            tldr_content = tldr_path.read_text(encoding="utf-8")
-            _logger.info(f"Loaded TLDR from: {tldr_path}")
-
-    # Try to load behaviors from disk first (more reliable than LLM-passed parameter)
-    behaviors = []
-    if behaviors_dir.exists():
-        behavior_files = sorted(behaviors_dir.glob("*.json"))
-        for bf in behavior_files:
-            try:
-                behavior_data = json.loads(bf.read_text(encoding="utf-8"))
-                behaviors.append(behavior_data)
-                _logger.info(f"Loaded behavior from: {bf}")
-            except (json.JSONDecodeError, IOError) as e:
-                _logger.warning(f"Failed to load behavior file {bf}: {e}")
-
-    # Build a map of behaviors by element description for fuzzy matching
-    # Also index by scenario_file if available
-    behavior_by_scenario = {}
-    behavior_by_description = {}
-
-    for behavior in behaviors:
-        # Index by scenario_file if available
-        scenario_file = behavior.get("scenario_file")
-        if scenario_file:
-            scenario_name = Path(scenario_file).name
-            behavior_by_scenario[scenario_name] = behavior
-
-        # Index by element_description for fuzzy matching
-        desc = behavior.get("element_description", "").lower()
-        if desc:
-            behavior_by_description[desc] = behavior
-
-    def find_matching_behavior(scenario_stem: str) -> dict:
-        """Find behavior that matches the scenario file stem using fuzzy matching."""
-        # First try exact scenario_file match
-        scenario_filename = scenario_stem + ".feature"
-        if scenario_filename in behavior_by_scenario:
-            return behavior_by_scenario[scenario_filename]
-
-        # Fuzzy match: extract key words from scenario name and match against descriptions
-        # e.g., "Company_Menu" -> ["company", "menu"]
-        keywords = [w.lower() for w in scenario_stem.split("_") if len(w) > 1]
-
-        best_match = None
-        best_score = 0
-
-        for desc, behavior in behavior_by_description.items():
-            # Count how many keywords appear in the description
-            score = sum(1 for kw in keywords if kw in desc)
-            if score > best_score:
-                best_score = score
-                best_match = behavior
-
-        # Require at least half the keywords to match
-        if best_match and best_score >= len(keywords) / 2:
-            return best_match
-
-        return {}
-
-    # Build markdown content
-    report = f"""# {report_title}
-
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-Session ID: `{session_id or 'N/A'}`
-
----
-
-"""
-
-    # Add TLDR at the top if available
-    if tldr_content:
-        report += tldr_content
-    else:
-        report += """## TLDR - Executive Summary
-
-*No TLDR summary available. Run generate_tldr before generate_report for an executive summary.*
-
----
-
-"""
+    return await asyncio.to_thread(write_tldr, _session_output_dir(session_id), website_name, session_id)
 
-    report += """## Table of Contents
 
-1. [TLDR - Executive Summary](#tldr---executive-summary)
-2. [Test Scenarios with Evidence](#test-scenarios-with-evidence)
-3. [Summary](#summary)
-
----
-
-## Test Scenarios with Evidence
-
-Each scenario includes the Gherkin specification followed by before/after screenshot comparison.
-
-"""
-
-    # Read all individual scenario files from the scenarios directory
-    scenario_files = []
-    if scenarios_dir.exists():
-        scenario_files = sorted(scenarios_dir.glob("*.feature"))
-
-    has_screenshots = False
-
-    # Interactive behaviors that should be included in detailed report
-    interactive_behaviors = {"dropdown", "tooltip", "content_revealed"}
-
-    if scenario_files:
-        for scenario_file in scenario_files:
-            scenario_name = scenario_file.stem.replace("_", " ")
-            scenario_content = scenario_file.read_text(encoding="utf-8")
-
-            # Find matching behavior for this scenario using fuzzy matching
-            behavior = find_matching_behavior(scenario_file.stem)
-            behavior_type = behavior.get("behavior", "unknown")
-
-            # Skip no_change and unreachable scenarios - they only appear in TLDR
-            if behavior_type in ("no_change", "unreachable"):
-                continue
-
-            screenshot_before = behavior.get("screenshot_before")
-            screenshot_after = behavior.get("screenshot_after")
-            revealed_links = behavior.get("revealed_links", [])
-
-            report += f"""### {scenario_name}
-
-**Behavior Detected:** `{behavior_type}`
-**Scenario File:** `scenarios/{scenario_file.name}`
-
-```gherkin
-{scenario_content}
-```
-
-"""
-            # Add screenshots immediately after the Gherkin
-            if screenshot_before or screenshot_after:
-                has_screenshots = True
-                report += "#### Screenshot Evidence\n\n"
-
-                if screenshot_before and screenshot_after:
-                    before_path = Path(screenshot_before)
-                    after_path = Path(screenshot_after)
-                    before_rel = f"screenshots/{before_path.name}"
-                    after_rel = f"screenshots/{after_path.name}"
-
-                    report += f"""| Before Hover | After Hover |
-|:------------:|:-----------:|
-| ![Before]({before_rel}) | ![After]({after_rel}) |
-
-"""
-                elif screenshot_before:
-                    before_path = Path(screenshot_before)
-                    before_rel = f"screenshots/{before_path.name}"
-                    report += f"**Screenshot:** ![Before]({before_rel})\n\n"
-
-            # Add revealed links if any
-            if revealed_links:
-                report += "#### Revealed Links\n\n"
-                for link in revealed_links[:5]:
-                    text = link.get("text", "N/A")
-                    href = link.get("href", "N/A")
-                    report += f"- [{text}]({href})\n"
-                report += "\n"
-
-            report += "---\n\n"
-    else:
-        # Fallback to combined gherkin content if no individual files
-        report += f"""### Combined Scenarios
-
-```gherkin
-{gherkin_content}
-```
-
----
-
-"""
-
-    # Add any INTERACTIVE behaviors that didn't have matching scenario files
-    # Filter out no_change and error - they only appear in TLDR
-    unmatched_behaviors = [
-        b for b in behaviors
-        if not b.get("scenario_file") and b.get("behavior") in interactive_behaviors
-    ]
-    if unmatched_behaviors:
-        report += """## Additional Interactive Elements
-
-These interactive hover elements were detected but don't have individual scenario files.
-
-"""
-        for behavior in unmatched_behaviors:
-            desc = behavior.get("element_description", behavior.get("selector", "Unknown element"))
-            behavior_type = behavior.get("behavior", "unknown")
-            screenshot_before = behavior.get("screenshot_before")
-            screenshot_after = behavior.get("screenshot_after")
-            revealed_links = behavior.get("revealed_links", [])
-
-            report += f"""### {desc}
-
-**Behavior:** `{behavior_type}`
-
-"""
-            if screenshot_before or screenshot_after:
-                has_screenshots = True
-                if screenshot_before and screenshot_after:
-                    before_path = Path(screenshot_before)
-                    after_path = Path(screenshot_after)
-                    before_rel = f"screenshots/{before_path.name}"
-                    after_rel = f"screenshots/{after_path.name}"
-
-                    report += f"""| Before Hover | After Hover |
-|:------------:|:-----------:|
-| ![Before]({before_rel}) | ![After]({after_rel}) |
+def write_report(output_dir: Path, report_title: str = "Hover Detection Report",
+                 tldr_content: str = "", session_id: Optional[str] = None) -> str:
+    """
+    Build the markdown report for output_dir and save it as hover_report.md.
 
-"""
-            # Add revealed links if any
-            if revealed_links:
-                report += "#### Revealed Links\n\n"
-                for link in revealed_links[:5]:
-                    text = link.get("text", "N/A")
-                    href = link.get("href", "N/A")
-                    report += f"- [{text}]({href})\n"
-                report += "\n"
+    Args:
+        output_dir: Session output directory
+        report_title: Title for the report
+        tldr_content: TLDR summary (falls back to tldr.md on disk)
+        session_id: Session ID shown in the report
 
-            report += "---\n\n"
+    Returns:
+        Path to the generated markdown report file
+    """
+    # A debounced live refresh firing after this write would replace the final report
+    cancel_refresh(output_dir)
+    return ReportWriter(output_dir).write(report_title, tldr_content, session_id)
 
-    if not has_screenshots and not scenario_files:
-        report += "*No screenshots were captured during this test run.*\n\n"
 
-    # Add summary section
-    dropdown_count = sum(1 for b in behaviors if b.get('behavior') == 'dropdown')
-    tooltip_count = sum(1 for b in behaviors if b.get('behavior') == 'tooltip')
-    content_count = sum(1 for b in behaviors if b.get('behavior') == 'content_revealed')
-    no_change_count = sum(1 for b in behaviors if b.get('behavior') == 'no_change')
-    unreachable_count = sum(1 for b in behaviors if b.get('behavior') == 'unreachable')
+@tool
+async def generate_report(report_title: str = "Hover Detection Report", tldr_content: str = "") -> str:
+    """
+    Generate a markdown report combining individual Gherkin scenarios with before/after screenshot comparisons.
+    Automatically reads behavior data and TLDR from disk if available.
 
-    report += f"""## Summary
+    IMPORTANT: Call generate_tldr BEFORE this tool to create the executive summary.
 
-| Metric | Count |
-|--------|-------|
-| Total elements tested | {len(behaviors)} |
-| Dropdowns detected | {dropdown_count} |
-| Tooltips detected | {tooltip_count} |
-| Content revealed | {content_count} |
-| No change | {no_change_count} |
-| Unreachable | {unreachable_count} |
-| Scenario files generated | {len(scenario_files)} |
-
-### Output Structure
-
-```
-output/{session_id or ''}/
-├── hover_report.md          (this report)
-├── screenshots/             (before/after images)
-│   └── *.png
-├── scenarios/               (individual Gherkin files)
-│   └── *.feature
-└── behaviors/               (hover detection data)
-    └── *.json
-```
-"""
+    Args:
+        report_title: Title for the report (default: "Hover Detection Report")
+        tldr_content: TLDR summary from generate_tldr (optional, falls back to disk file)
 
-    # Write report
-    report_path = output_dir / "hover_report.md"
-    report_path.write_text(report, encoding="utf-8")
+    Returns:
+        Path to the generated markdown report file
+    """
+    session_id = get_session_id()
+    return await asyncio.to_thread(
+        write_report, _session_output_dir(session_id), report_title, tldr_content, session_id
+    )
+
+
+# Resources each tool touches, so tool_node can run a turn's tool calls concurrently.
+#   browser - the session's page (navigation, mouse position, DOM state)
+#   records - behaviors.db and the scenarios folder (hover_report.md is locked separately)
+#   tldr    - tldr.md
+# Access modes: "read" overlaps other reads, "append" overlaps other appends
+# (new rows/files only), "write" overlaps nothing. Tools not listed conflict
+# with everything.
+TOOL_RESOURCES: Dict[str, Dict[str, str]] = {
+    "navigate_to_url": {"browser": "write"},
+    "get_page_structure": {"browser": "read"},
+    "find_hoverable_elements": {"browser": "read"},
+    "hover_element": {"browser": "write", "records": "append"},
+    "hover_elements_batch": {"browser": "write", "records": "append"},
+    "save_gherkin_scenario": {"records": "append"},
+    "generate_gherkin": {},
+    "generate_tldr": {"records": "read", "tldr": "write"},
+    "generate_report": {"records": "read", "tldr": "read"},
+}
+
+
+def tool_resources(name: str, args: Optional[dict] = None) -> Optional[Dict[str, str]]:
+    """
+    Resources a tool call touches (see TOOL_RESOURCES).
 
-    return str(report_path)
+    Returns:
+        dict of resource -> access mode, or None if the tool is unknown
+    """
+    resources = TOOL_RESOURCES.get(name)
+    if resources is None:
+        return None
+    if name == "save_gherkin_scenario" and (args or {}).get("behavior_id") is None:
+        # Without an ID the scenario links to the latest unlinked record, which
+        # depends on the saves issued before it
+        return {"records": "write"}
+    return resources
+
+
+def calls_conflict(first: Optional[Dict[str, str]], second: Optional[Dict[str, str]]) -> bool:
+    """Whether two tool calls (given their tool_resources) must run in issue order."""
+    if first is None or second is None:
+        return True
+    for resource, mode in first.items():
+        other = second.get(resource)
+        if other is not None and not (mode == other and mode in ("read", "append")):
+            return True
+    return False
 
 
 def get_all_tools() -> List:
@@ -745,6 +690,7 @@ def get_all_tools() -> List:
         get_page_structure,
         find_hoverable_elements,
         hover_element,
+        hover_elements_batch,
         save_gherkin_scenario,
         generate_gherkin,
         generate_tldr,
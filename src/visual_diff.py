@@ -0,0 +1,223 @@
+"""
+Pixel-level visual diff of before/after hover screenshots.
+
+Decodes both images, computes the changed-pixel mask with NumPy and finds the
+bounding boxes of the changed regions. The result gives hover classification
+a second signal next to the DOM diff, and a cropped diff image lets the report
+show only the region that changed.
+
+Optional: needs NumPy and Pillow (pip install ".[visual]"). Without them
+compute_visual_diff returns None and classification uses the DOM diff only.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+_logger = logging.getLogger("visual_diff")
+
+# Per-channel difference (0-255) above which a pixel counts as changed
+DIFF_THRESHOLD = 24
+# Changed pixels are grouped into regions on a grid of this many pixels
+CELL_SIZE = 8
+# Fewer changed pixels than this is treated as noise (antialiasing, caret blink)
+MIN_CHANGED_PIXELS = 50
+# Regions reported per diff (largest first)
+MAX_REGIONS = 10
+# Margin (pixels) around the hovered element within which changes count as its hover effect
+FOCUS_MARGIN = 16
+
+
+def is_available() -> bool:
+    """Check if NumPy and Pillow are installed."""
+    return np is not None and Image is not None
+
+
+def _load_rgb(path: str) -> "np.ndarray":
+    """Decode an image file to an int16 RGB array."""
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"), dtype=np.int16)
+
+
+def changed_mask(before: "np.ndarray", after: "np.ndarray", threshold: int = DIFF_THRESHOLD) -> "np.ndarray":
+    """
+    Boolean mask of pixels whose largest channel difference exceeds threshold.
+    Images of different sizes are compared over their common top-left area.
+    """
+    height = min(before.shape[0], after.shape[0])
+    width = min(before.shape[1], after.shape[1])
+    delta = np.abs(before[:height, :width] - after[:height, :width])
+    return delta.max(axis=2) > threshold
+
+
+def label_cells(grid: "np.ndarray") -> "np.ndarray":
+    """
+    8-connected component labels of a boolean grid (0 = background).
+
+    Vectorized label propagation: every set cell starts with a unique label
+    and repeatedly takes the largest label among its set neighbours until
+    nothing changes, so the Python-level loop runs once per grid step of the
+    widest component rather than once per cell.
+    """
+    rows, cols = grid.shape
+    labels = np.where(grid, np.arange(1, rows * cols + 1).reshape(rows, cols), 0)
+    while True:
+        padded = np.pad(labels, 1)
+        spread = labels.copy()
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                np.maximum(spread, padded[dr:dr + rows, dc:dc + cols], out=spread)
+        spread = np.where(grid, spread, 0)
+        if np.array_equal(spread, labels):
+            return labels
+        labels = spread
+
+
+def find_regions(mask: "np.ndarray", cell: int = CELL_SIZE) -> List[dict]:
+    """
+    Bounding boxes of connected changed regions, largest first.
+
+    The mask is reduced to a coarse grid of cell x cell blocks, blocks are
+    grouped by 8-connectivity (label_cells), and each group's box is then
+    tightened to the exact changed pixels.
+    """
+    height, width = mask.shape
+    rows = -(-height // cell)
+    cols = -(-width // cell)
+    padded = np.zeros((rows * cell, cols * cell), dtype=bool)
+    padded[:height, :width] = mask
+    grid = padded.reshape(rows, cell, cols, cell).any(axis=(1, 3))
+
+    labels = label_cells(grid)
+    cell_rows, cell_cols = np.nonzero(labels)
+    if not len(cell_rows):
+        return []
+    ids, index = np.unique(labels[cell_rows, cell_cols], return_inverse=True)
+    r0 = np.full(len(ids), rows)
+    c0 = np.full(len(ids), cols)
+    r1 = np.zeros(len(ids), dtype=int)
+    c1 = np.zeros(len(ids), dtype=int)
+    np.minimum.at(r0, index, cell_rows)
+    np.minimum.at(c0, index, cell_cols)
+    np.maximum.at(r1, index, cell_rows)
+    np.maximum.at(c1, index, cell_cols)
+
+    regions = []
+    for k in range(len(ids)):
+        # Tighten the block box to the changed pixels inside it
+        y0, x0 = int(r0[k]) * cell, int(c0[k]) * cell
+        block = mask[y0:(int(r1[k]) + 1) * cell, x0:(int(c1[k]) + 1) * cell]
+        ys = np.nonzero(block.any(axis=1))[0]
+        xs = np.nonzero(block.any(axis=0))[0]
+        regions.append({
+            "x": int(x0 + xs[0]),
+            "y": int(y0 + ys[0]),
+            "width": int(xs[-1] - xs[0] + 1),
+            "height": int(ys[-1] - ys[0] + 1),
+            "changed_pixels": int(block.sum()),
+        })
+
+    regions.sort(key=lambda r: r["width"] * r["height"], reverse=True)
+    return regions
+
+
+def intersects(region: dict, box: dict, margin: int = 0) -> bool:
+    """Whether a region overlaps box grown by margin on every side."""
+    return (
+        region["x"] < box["x"] + box["width"] + margin
+        and box["x"] - margin < region["x"] + region["width"]
+        and region["y"] < box["y"] + box["height"] + margin
+        and box["y"] - margin < region["y"] + region["height"]
+    )
+
+
+def _save_diff_crop(after: "np.ndarray", mask: "np.ndarray", box: dict, path: Path, pad: int = 8) -> None:
+    """Save the after-image cropped to box, with changed pixels tinted red."""
+    height, width = mask.shape
+    x0, y0 = max(0, box["x"] - pad), max(0, box["y"] - pad)
+    x1 = min(width, box["x"] + box["width"] + pad)
+    y1 = min(height, box["y"] + box["height"] + pad)
+
+    crop = after[y0:y1, x0:x1].copy()
+    changed = mask[y0:y1, x0:x1]
+    crop[changed] = (crop[changed] + np.array([255, 0, 0], dtype=np.int16)) // 2
+    # Write-then-rename so concurrent readers (and crashes) never leave a partial PNG
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    Image.fromarray(crop.astype(np.uint8)).save(tmp_path, format="PNG")
+    os.replace(tmp_path, path)
+
+
+def compute_visual_diff(before_path: str, after_path: str, output_dir: Optional[str] = None,
+                        focus: Optional[dict] = None, margin: int = FOCUS_MARGIN) -> Optional[dict]:
+    """
+    Compare two screenshots and describe what changed.
+
+    Args:
+        before_path: Screenshot taken before the hover
+        after_path: Screenshot taken after the hover
+        output_dir: Where to save the cropped diff image (default: next to after_path)
+        focus: Hovered element's box ({x, y, width, height}, screenshot pixels);
+            only regions touching it (grown by margin) count as its hover effect,
+            so carousels, videos and animations elsewhere are ignored
+        margin: Pixels added around focus
+
+    Returns:
+        dict with changed_ratio, changed_pixels, regions, focus_regions (regions
+        near focus; all regions without one), bbox and diff_image, or None if
+        NumPy/Pillow are missing or the images can't be read
+    """
+    if not is_available():
+        _logger.debug("NumPy/Pillow not installed, skipping visual diff")
+        return None
+
+    try:
+        before = _load_rgb(before_path)
+        after = _load_rgb(after_path)
+    except (OSError, ValueError) as e:
+        _logger.warning(f"Visual diff skipped, could not read screenshots: {e}")
+        return None
+
+    mask = changed_mask(before, after)
+    changed_pixels = int(mask.sum())
+    result = {
+        "changed_ratio": round(changed_pixels / mask.size, 5) if mask.size else 0.0,
+        "changed_pixels": changed_pixels,
+        "regions": [],
+        "focus_regions": [],
+        "bbox": None,
+        "diff_image": None,
+    }
+    if changed_pixels < MIN_CHANGED_PIXELS:
+        return result
+
+    regions = find_regions(mask)
+    x0 = min(r["x"] for r in regions)
+    y0 = min(r["y"] for r in regions)
+    x1 = max(r["x"] + r["width"] for r in regions)
+    y1 = max(r["y"] + r["height"] for r in regions)
+    bbox = {"x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0}
+
+    # Named after both inputs, so repeated identical hovers reuse the same crop
+    out_dir = Path(output_dir) if output_dir else Path(after_path).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    diff_path = out_dir / f"diff_{Path(before_path).stem[:10]}_{Path(after_path).stem[:10]}.png"
+    if not diff_path.exists():
+        _save_diff_crop(after, mask, bbox, diff_path)
+
+    near = [r for r in regions if intersects(r, focus, margin)] if focus else regions
+    result.update({
+        "regions": regions[:MAX_REGIONS],
+        "focus_regions": near[:MAX_REGIONS],
+        "bbox": bbox,
+        "diff_image": str(diff_path),
+    })
+    return result
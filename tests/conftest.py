@@ -0,0 +1,74 @@
+"""
+Shared test doubles.
+"""
+
+import asyncio
+
+import pytest
+
+
+class FakeManager:
+    """
+    BrowserManager stand-in for page-level flows (hover_page, the crawler).
+
+    Args:
+        menus: Selectors get_page_structure reports as menu items
+        hoverables: Selectors find_hoverable_elements reports
+        fingerprints: selector -> component fingerprint (others resolve to None,
+            like selectors the real page cannot find)
+        behaviors: selector -> behavior hover_many reports (default: no_change)
+        site: url -> links get_links serves for the current url
+        session_id: Session the manager's records belong to
+    """
+
+    def __init__(self, menus=(), hoverables=(), fingerprints=None, behaviors=None, site=None, session_id=None):
+        self.menus = list(menus)
+        self.hoverables = list(hoverables)
+        self.fingerprints = fingerprints or {}
+        self.behaviors = behaviors or {}
+        self.site = site or {}
+        self.session_id = session_id
+        self.url = None
+        self.hovered = []
+        self.saved = []
+        # styles flag of every component_fingerprints call
+        self.fingerprint_styles = []
+
+    async def navigate(self, url):
+        self.url = url
+        return url
+
+    async def get_page_structure(self):
+        return {"menus": [{"name": s.lstrip("#"), "role": "menuitem", "selector": s} for s in self.menus]}
+
+    async def find_hoverable_elements(self):
+        return [{"text": s.lstrip("#"), "tag": "div", "selector": s} for s in self.hoverables]
+
+    async def component_fingerprints(self, selectors, styles=False):
+        self.fingerprint_styles.append(styles)
+        return {s: self.fingerprints.get(s) for s in selectors}
+
+    async def hover_many(self, targets, workers=1, deadline=None):
+        await asyncio.sleep(0)
+        self.hovered.extend(t["selector"] for t in targets)
+        return [{"selector": t["selector"], "behavior": self.behaviors.get(t["selector"], "no_change")}
+                for t in targets]
+
+    async def get_links(self):
+        return list(self.site.get(self.url, []))
+
+    def save_scenario_file(self, name, gherkin):
+        return f"scenarios/{name}.feature"
+
+    def save_behavior(self, name, data):
+        self.saved.append(name)
+        return len(self.saved)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_manager():
+    """FakeManager factory."""
+    return FakeManager
@@ -0,0 +1,97 @@
+"""
+Tests for the agent's tool execution.
+No browser or LLM needed.
+"""
+
+import asyncio
+
+from langchain_core.tools import tool
+
+from src.agent import run_tool_calls
+from src.tools import calls_conflict, tool_resources
+
+
+def _fake_tools(log):
+    """Stand-ins for the real tools that log when they start and finish."""
+    async def record(name, value):
+        log.append(("start", name, value))
+        await asyncio.sleep(0.05)
+        log.append(("end", name, value))
+        return f"{name}:{value}"
+
+    @tool
+    async def save_gherkin_scenario(element_name: str, gherkin_content: str, behavior_id: int = None) -> str:
+        """Fake save."""
+        return await record("save", element_name)
+
+    @tool
+    async def navigate_to_url(url: str) -> str:
+        """Fake navigation."""
+        return await record("navigate", url)
+
+    @tool
+    async def get_page_structure(cursor: int = 0) -> str:
+        """Fake structure."""
+        return await record("structure", cursor)
+
+    return {t.name: t for t in (save_gherkin_scenario, navigate_to_url, get_page_structure)}
+
+
+def _call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id}
+
+
+class TestToolResources:
+    """Tests for tool_resources / calls_conflict."""
+
+    def test_appends_overlap_writes_do_not(self):
+        """Linked scenario saves overlap; navigation and hovers serialize on the browser."""
+        save = tool_resources("save_gherkin_scenario", {"behavior_id": 1})
+        assert not calls_conflict(save, save)
+        assert calls_conflict(tool_resources("navigate_to_url"), tool_resources("get_page_structure"))
+        assert calls_conflict(tool_resources("hover_element"), tool_resources("hover_element"))
+        assert not calls_conflict(tool_resources("get_page_structure"), tool_resources("find_hoverable_elements"))
+
+    def test_unlinked_save_and_unknown_tools_serialize(self):
+        """Saves without behavior_id and unknown tools keep their issue order."""
+        unlinked = tool_resources("save_gherkin_scenario", {})
+        assert calls_conflict(unlinked, tool_resources("save_gherkin_scenario", {"behavior_id": 2}))
+        assert calls_conflict(tool_resources("no_such_tool"), tool_resources("generate_gherkin"))
+
+    def test_report_waits_for_scenarios(self):
+        """generate_report reads what scenario saves append."""
+        assert calls_conflict(tool_resources("save_gherkin_scenario", {"behavior_id": 1}),
+                              tool_resources("generate_report"))
+
+
+class TestRunToolCalls:
+    """Tests for run_tool_calls."""
+
+    async def test_independent_calls_overlap_in_order(self):
+        """Scenario saves should run concurrently and answer in call order."""
+        log = []
+        calls = [_call("save_gherkin_scenario", f"c{i}", element_name=f"M{i}", gherkin_content="x", behavior_id=i)
+                 for i in range(3)]
+
+        messages = await run_tool_calls(calls, _fake_tools(log))
+
+        assert [m.tool_call_id for m in messages] == ["c0", "c1", "c2"]
+        assert [m.content for m in messages] == ["save:M0", "save:M1", "save:M2"]
+        assert [event for event, _, _ in log[:3]] == ["start", "start", "start"]
+
+    async def test_conflicting_calls_serialize(self):
+        """Structure must not be read before the navigation issued before it finishes."""
+        log = []
+        calls = [_call("navigate_to_url", "n", url="https://example.com"), _call("get_page_structure", "s")]
+
+        messages = await run_tool_calls(calls, _fake_tools(log))
+
+        assert [m.tool_call_id for m in messages] == ["n", "s"]
+        assert [(e, n) for e, n, _ in log] == [
+            ("start", "navigate"), ("end", "navigate"), ("start", "structure"), ("end", "structure"),
+        ]
+
+    async def test_unknown_tool_reports_error(self):
+        """Unknown tools should produce an error message, not raise."""
+        messages = await run_tool_calls([_call("nope", "x")], {})
+        assert messages[0].content == "Error: Unknown tool nope"
@@ -0,0 +1,99 @@
+"""
+Tests for the SQLite behavior store.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.behavior_store import BehaviorStore
+
+
+class TestBehaviorStore:
+    """Tests for BehaviorStore."""
+
+    def test_add_and_read_back(self, tmp_path):
+        """Records should round-trip with their ID, in insertion order."""
+        store = BehaviorStore(tmp_path)
+        first = store.add("Products menu", {"selector": "#products", "behavior": "dropdown"})
+        second = store.add("Logo", {"selector": "#logo", "behavior": "no_change"})
+
+        records = store.all()
+        assert [r["id"] for r in records] == [first, second]
+        assert records[0]["selector"] == "#products"
+        assert store.get(second)["behavior"] == "no_change"
+        assert store.get(999) is None
+
+    def test_counts_and_link_total(self, tmp_path):
+        """Counts and link totals should be aggregated per behavior."""
+        store = BehaviorStore(tmp_path)
+        links = [{"text": "A", "href": "/a"}, {"text": "B", "href": "/b"}]
+        store.add("Products", {"behavior": "dropdown", "revealed_links": links})
+        store.add("Company", {"behavior": "dropdown", "revealed_links": links[:1]})
+        store.add("Logo", {"behavior": "no_change"})
+
+        assert store.counts() == {"dropdown": 2, "no_change": 1}
+        assert store.total() == 3
+        assert store.link_total("dropdown") == 3
+        assert store.link_total("tooltip") == 0
+
+    def test_lookups(self, tmp_path):
+        """Records should be found by behavior, selector and description."""
+        store = BehaviorStore(tmp_path)
+        store.add("Products menu", {"selector": "#products", "behavior": "dropdown"})
+        store.add("Info icon", {"selector": ".info", "behavior": "tooltip"})
+
+        assert [r["selector"] for r in store.find_by_behavior("tooltip")] == [".info"]
+        assert store.find_by_selector("#products")[0]["behavior"] == "dropdown"
+        assert store.find_by_description("Info icon")[0]["selector"] == ".info"
+        assert store.find_by_selector("#missing") == []
+
+    def test_imports_legacy_json_files(self, tmp_path):
+        """Sessions with behaviors/*.json should be imported on first open."""
+        behaviors_dir = tmp_path / "behaviors"
+        behaviors_dir.mkdir()
+        (behaviors_dir / "001_A.json").write_text(json.dumps({"element_description": "A", "behavior": "dropdown"}))
+        (behaviors_dir / "002_B.json").write_text(json.dumps({"element_description": "B", "behavior": "tooltip"}))
+        (behaviors_dir / "003_bad.json").write_text("{not json")
+
+        store = BehaviorStore(tmp_path)
+        assert [r["element_description"] for r in store.all()] == ["A", "B"]
+
+        # A second store on the same folder must not import again
+        assert BehaviorStore(tmp_path).total() == 2
+
+    def test_link_scenario_and_latest_unlinked(self, tmp_path):
+        """Linked records should no longer be returned as unlinked."""
+        store = BehaviorStore(tmp_path)
+        menu = store.add("Products menu", {"behavior": "dropdown"})
+        icon = store.add("Info icon", {"behavior": "tooltip"})
+        store.add("Logo", {"behavior": "no_change"})
+
+        assert store.latest_unlinked(element_description="Products menu")["id"] == menu
+        assert store.latest_unlinked(behaviors=["dropdown", "tooltip"])["id"] == icon
+
+        assert store.link_scenario(icon, "scenarios/Info_icon.feature")
+        assert store.get(icon)["scenario_file"] == "scenarios/Info_icon.feature"
+        assert store.latest_unlinked(behaviors=["dropdown", "tooltip"])["id"] == menu
+        assert not store.link_scenario(999, "scenarios/x.feature")
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Every connection the store opens should be closed after its transaction."""
+        opened = []
+        connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+        store = BehaviorStore(tmp_path)
+        store.add("Products", {"selector": "#products", "behavior": "dropdown"})
+        store.all()
+
+        assert opened
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
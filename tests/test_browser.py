@@ -3,9 +3,15 @@ Unit tests for browser session management.
 Tests the core BrowserManager functionality.
 """
 
+import time
+
 import pytest
 import pytest_asyncio
-from src.browser import BrowserManager, BrowserSession
+from src.runtime import run_on
+from src.browser import (
+    BrowserManager, BrowserSession, BrowserPool, _classify_new_elements,
+    _DOM_FINGERPRINT_JS, _EXTRACT_PAGE_JS, _SETTLE_FRAME_JS, _SETTLE_DONE_JS, SETTLE_QUIET_FRAMES,
+)
 
 
 class TestBrowserSession:
@@ -24,6 +30,341 @@ class TestBrowserSession:
         assert session.is_active() is False
 
 
+class TestClassifyNewElements:
+    """Tests for behavior classification of the hover delta."""
+
+    def test_no_new_elements_is_no_change(self):
+        """Empty delta should be no_change."""
+        assert _classify_new_elements([]) == ("no_change", [])
+
+    def test_new_links_are_dropdown(self):
+        """Revealed links should classify as dropdown."""
+        behavior, links = _classify_new_elements([
+            {"tag": "A", "className": "", "text": "Team", "href": "/team"},
+        ])
+        assert behavior == "dropdown"
+        assert links == [{"text": "Team", "href": "/team"}]
+
+    def test_tooltip_class_is_tooltip(self):
+        """Tooltip classes without links should classify as tooltip."""
+        behavior, _ = _classify_new_elements([
+            {"tag": "DIV", "className": "tooltip-inner", "text": "Hint", "href": ""},
+        ])
+        assert behavior == "tooltip"
+
+
+class FakePage:
+    """Minimal page double answering the fingerprint and extractor scripts."""
+
+    def __init__(self):
+        self.fingerprint = "https://example.com/|10|abc"
+        self.extractions = 0
+
+    def evaluate(self, script, *args):
+        if script is _DOM_FINGERPRINT_JS:
+            return self.fingerprint
+        if script is _EXTRACT_PAGE_JS:
+            self.extractions += 1
+            return {
+                "title": "Example", "url": "https://example.com/",
+                "menus": [], "buttons": [], "links": [], "landmarks": [],
+                "hover_candidates": [], "hoverables": [{"tag": "A", "text": "More", "selector": 'text="More"'}],
+            }
+        raise AssertionError("unexpected script")
+
+
+class TestStructureCache:
+    """Tests for the URL + DOM fingerprint structure cache."""
+
+    def test_repeated_queries_hit_cache(self):
+        """Structure and hoverables should share one extraction."""
+        manager = BrowserManager(headless=True)
+        manager._session.page = page = FakePage()
+
+        structure = manager._get_page_structure_sync()
+        hoverables = manager._find_hoverable_elements_sync()
+
+        assert structure["page_title"] == "Example"
+        assert hoverables[0]["selector"] == 'text="More"'
+        assert page.extractions == 1
+
+    def test_dom_change_invalidates(self):
+        """A different fingerprint should re-run the extractor."""
+        manager = BrowserManager(headless=True)
+        manager._session.page = page = FakePage()
+
+        manager._find_hoverable_elements_sync()
+        page.fingerprint = "https://example.com/|12|def"
+        manager._find_hoverable_elements_sync()
+
+        assert page.extractions == 2
+
+
+class TestDomFingerprint:
+    """Tests for the structure cache fingerprint on a real page."""
+
+    @pytest_asyncio.fixture
+    async def manager(self, tmp_path):
+        """Manager on a page with a collapsed menu."""
+        mgr = BrowserManager(headless=True, output_dir=str(tmp_path))
+        page = await mgr.get_page()
+        await run_on(mgr._executor, page.set_content, (
+            '<nav><ul><li><a href="/a">A</a>'
+            '<ul class="submenu" aria-hidden="true"><li><a href="/b">B</a></li></ul>'
+            '</li></ul></nav>'
+        ))
+        yield mgr
+        await mgr.close()
+
+    @pytest.mark.asyncio
+    async def test_attribute_toggle_changes_fingerprint(self, manager):
+        """Opening a menu by class or aria change alone should change the fingerprint."""
+        def fingerprint():
+            return manager._session.page.evaluate(_DOM_FINGERPRINT_JS)
+
+        def toggle(script):
+            manager._session.page.evaluate(script)
+            return fingerprint()
+
+        closed = await run_on(manager._executor, fingerprint)
+        opened = await run_on(manager._executor, 
+            toggle, "() => document.querySelector('.submenu').classList.add('open')"
+        )
+        shown = await run_on(manager._executor, 
+            toggle, "() => document.querySelector('.submenu').setAttribute('aria-hidden', 'false')"
+        )
+
+        assert len({closed, opened, shown}) == 3
+
+
+class TestComponentFingerprints:
+    """Tests for component fingerprints on a real page."""
+
+    @pytest_asyncio.fixture
+    async def manager(self, tmp_path):
+        """Manager on a page with a header nav and a footer."""
+        mgr = BrowserManager(headless=True, output_dir=str(tmp_path))
+        page = await mgr.get_page()
+        await run_on(mgr._executor, page.set_content, (
+            '<header><nav><ul><li><a id="products" href="/p">Products</a></li></ul></nav></header>'
+            '<footer><a id="contact" href="/c">Contact Us</a></footer>'
+        ))
+        yield mgr
+        await mgr.close()
+
+    @pytest.mark.asyncio
+    async def test_text_selectors_are_fingerprinted(self, manager):
+        """Playwright text= selectors resolve to the same fingerprint as CSS ones."""
+        fingerprints = await manager.component_fingerprints(
+            ['text="Products"', "#products", 'text="Contact Us"', 'text="Missing"', "#bad["]
+        )
+
+        assert fingerprints['text="Products"'] is not None
+        assert fingerprints['text="Products"'] == fingerprints["#products"]
+        assert fingerprints['text="Contact Us"'] not in (None, fingerprints["#products"])
+        assert fingerprints['text="Missing"'] is None
+        assert fingerprints["#bad["] is None
+
+
+class FakeSettlePage:
+    """Page double whose animation frames report scripted mutation counts."""
+
+    def __init__(self, mutations, frame_ms=5):
+        self.mutations = list(mutations)
+        self.frame_ms = frame_ms
+        self.frames = 0
+        self.waited = []
+        self.observer_removed = False
+
+    def evaluate(self, script, *args):
+        if script is _SETTLE_FRAME_JS:
+            time.sleep(self.frame_ms / 1000)
+            self.frames += 1
+            count = self.mutations.pop(0) if self.mutations else 1
+            return {"mutations": count, "animating": False}
+        if script is _SETTLE_DONE_JS:
+            self.observer_removed = True
+            return None
+        raise AssertionError("unexpected script")
+
+    def wait_for_timeout(self, ms):
+        self.waited.append(ms)
+
+
+class TestSettle:
+    """Tests for settle detection against scripted mutation counts."""
+
+    def test_quiet_window_ends_wait(self, tmp_path):
+        """Returns after SETTLE_QUIET_FRAMES frames without mutations."""
+        manager = BrowserManager(headless=True, output_dir=str(tmp_path))
+        manager._session.page = page = FakeSettlePage([3, 1, 0, 0, 5])
+
+        waited = manager._settle_sync(1000)
+
+        assert page.frames == 2 + SETTLE_QUIET_FRAMES
+        assert waited < 1000
+        assert page.observer_removed
+        assert page.waited == []
+
+    def test_max_wait_caps_busy_page(self, tmp_path):
+        """A page that keeps mutating is given up on after max_ms."""
+        manager = BrowserManager(headless=True, output_dir=str(tmp_path))
+        manager._session.page = page = FakeSettlePage([], frame_ms=10)
+
+        waited = manager._settle_sync(60)
+
+        assert 60 <= waited < 200
+        assert 3 <= page.frames <= 7
+        assert page.observer_removed
+
+    def test_min_wait_keeps_quiet_page_waiting(self, tmp_path):
+        """A quiet page still waits min_ms before settling."""
+        manager = BrowserManager(headless=True, output_dir=str(tmp_path))
+        manager._session.page = page = FakeSettlePage([0] * 100)
+
+        waited = manager._settle_sync(1000, min_ms=40)
+
+        assert 40 <= waited < 1000
+        assert page.frames > SETTLE_QUIET_FRAMES
+
+    def test_fixed_delay_without_settle(self, tmp_path):
+        """settle=False sleeps the full max_ms without probing the page."""
+        manager = BrowserManager(headless=True, output_dir=str(tmp_path), settle=False)
+        manager._session.page = page = FakeSettlePage([0, 0])
+
+        assert manager._settle_sync(300) == 300
+        assert page.waited == [300]
+        assert page.frames == 0
+
+
+class TestScreenshotStore:
+    """Tests for content-addressed screenshot storage."""
+
+    def test_identical_screenshots_share_blob(self, tmp_path):
+        """Same image bytes should be stored once and referenced twice."""
+        manager = BrowserManager(headless=True, output_dir=str(tmp_path))
+
+        first = manager._store_screenshot("Menu_before", b"same-png-bytes")
+        second = manager._store_screenshot("Menu_before", b"same-png-bytes")
+        other = manager._store_screenshot("Menu_after", b"other-png-bytes")
+
+        assert first == second
+        assert first != other
+        assert len(list(manager.screenshots_dir.glob("*.png"))) == 2
+        manifest = (manager.screenshots_dir / "manifest.jsonl").read_text().splitlines()
+        assert len(manifest) == 3
+        assert '"name": "001_Menu_before"' in manifest[0]
+
+
+def _age(pool, *session_ids, seconds=20):
+    """Pretend sessions were last acquired some seconds ago (past the acquire grace)."""
+    for session_id in session_ids:
+        pool._last_used[session_id] -= seconds
+
+
+class TestBrowserPool:
+    """Tests for per-session pooling (no browser launch needed)."""
+
+    @pytest_asyncio.fixture
+    async def pool(self):
+        """Create a small pool for testing."""
+        p = BrowserPool(max_size=2, idle_timeout=60, headless=True)
+        yield p
+        await p.close()
+
+    @pytest.mark.asyncio
+    async def test_same_session_returns_same_manager(self, pool):
+        """Acquiring a session twice should reuse its manager."""
+        m1 = await pool.acquire("thread-a")
+        m2 = await pool.acquire("thread-a")
+        assert m1 is m2
+        assert m1.session_id == "thread-a"
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_isolated(self, pool):
+        """Different sessions get different managers sharing one browser."""
+        m1 = await pool.acquire("thread-a")
+        m2 = await pool.acquire("thread-b")
+        assert m1 is not m2
+        assert m1._shared_browser is m2._shared_browser
+        assert len(pool) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, pool):
+        """Least recently used session is evicted past max_size."""
+        await pool.acquire("thread-a")
+        await pool.acquire("thread-b")
+        _age(pool, "thread-a", "thread-b")
+        await pool.acquire("thread-a")
+        await pool.acquire("thread-c")
+        assert "thread-a" in pool
+        assert "thread-b" not in pool
+        assert "thread-c" in pool
+
+    @pytest.mark.asyncio
+    async def test_just_acquired_session_not_evicted(self, pool):
+        """A session is protected between acquire() and its first operation."""
+        await pool.acquire("thread-a")
+        await pool.acquire("thread-b")
+        await pool.acquire("thread-c")
+        assert len(pool) == 3
+        _age(pool, "thread-a")
+        await pool.acquire("thread-c")
+        assert "thread-a" not in pool
+        assert len(pool) == 2
+
+    def test_headless_mismatch_warns(self, monkeypatch, caplog):
+        """Asking the existing global pool for another headless mode is logged."""
+        import src.browser as browser
+        monkeypatch.setattr(browser, "_pool", BrowserPool(headless=True))
+        with caplog.at_level("WARNING", logger="browser"):
+            assert browser.get_browser_pool(headless=False).headless is True
+        assert "ignoring headless=False" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_idle_timeout_eviction(self, pool):
+        """Sessions idle longer than idle_timeout are closed on next acquire."""
+        await pool.acquire("thread-a")
+        pool._last_used["thread-a"] -= 120
+        await pool.acquire("thread-b")
+        assert "thread-a" not in pool
+        assert "thread-b" in pool
+
+    @pytest.mark.asyncio
+    async def test_busy_session_not_evicted(self, pool):
+        """A session with an operation in flight survives LRU and idle eviction."""
+        busy = await pool.acquire("thread-a")
+        await pool.acquire("thread-b")
+        _age(pool, "thread-b")
+        with busy._busy():
+            pool._last_used["thread-a"] -= 120
+            await pool.acquire("thread-c")
+            assert "thread-a" in pool
+            assert "thread-b" not in pool
+            assert "thread-c" in pool
+
+    @pytest.mark.asyncio
+    async def test_all_busy_pool_grows_past_max_size(self, pool):
+        """When every candidate is busy, nothing is evicted until one finishes."""
+        a = await pool.acquire("thread-a")
+        b = await pool.acquire("thread-b")
+        _age(pool, "thread-a", "thread-b")
+        with a._busy(), b._busy():
+            await pool.acquire("thread-c")
+            assert len(pool) == 3
+        await pool.acquire("thread-c")
+        assert len(pool) == 2
+        assert "thread-a" not in pool
+
+    @pytest.mark.asyncio
+    async def test_release_removes_session(self, pool):
+        """release should drop the session from the pool."""
+        await pool.acquire("thread-a")
+        await pool.release("thread-a")
+        assert "thread-a" not in pool
+        assert len(pool) == 0
+
+
 class TestBrowserManager:
     """Tests for BrowserManager class."""
 
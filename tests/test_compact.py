@@ -0,0 +1,98 @@
+"""
+Tests for compact, token-budgeted tool outputs.
+"""
+
+from src.compact import CompactWriter, cell, parse, split_row
+from src.tools import _compact_hover_result, _compact_structure
+
+
+class TestCells:
+    """Tests for cell encoding."""
+
+    def test_round_trip(self):
+        """Escaped pipes and backslashes should split back into the original cells."""
+        values = ["a|b", "c\\d", 'text="x"']
+        assert split_row("|".join(cell(v) for v in values)) == values
+
+    def test_flags_and_whitespace(self):
+        """Booleans and None should be short, newlines collapsed."""
+        assert (cell(None), cell(False), cell(True)) == ("", "", "1")
+        assert cell("Products\n   menu") == "Products menu"
+
+
+class TestCompactWriter:
+    """Tests for CompactWriter."""
+
+    def test_everything_fits(self):
+        """Under budget there should be no cursor trailer."""
+        out = CompactWriter(budget=1000)
+        out.fields(title="Home", url="https://example.com", empty="")
+        out.line("")
+        out.table("links", [{"name": "Blog", "href": "/blog"}], [("name", "name"), ("href", "href")])
+        text = out.render()
+
+        assert "more:" not in text
+        assert "empty=" not in text
+        assert parse(text) == {"title": "Home", "url": "https://example.com", "links": [{"name": "Blog", "href": "/blog"}]}
+
+    def test_budget_and_cursor_page_through_all_rows(self):
+        """Paging with the advertised cursor should return every row exactly once."""
+        rows = [{"name": f"Item number {i}", "sel": f"#item-{i}"} for i in range(60)]
+        seen, cursor, calls = [], 0, 0
+        while True:
+            out = CompactWriter(budget=100, cursor=cursor)
+            out.table("items", rows[:40], [("name", "name"), ("sel", "sel")])
+            out.table("more_items", rows[40:], [("name", "name"), ("sel", "sel")])
+            decoded = parse(out.render())
+            seen.extend(decoded.get("items", []) + decoded.get("more_items", []))
+            calls += 1
+            if "more" not in decoded:
+                break
+            cursor = int(decoded["more"].rsplit("cursor=", 1)[1])
+
+        assert calls > 1
+        assert [r["sel"] for r in seen] == [r["sel"] for r in rows]
+
+    def test_always_makes_progress(self):
+        """A row larger than the budget should still be shown on its own."""
+        out = CompactWriter(budget=1)
+        out.table("rows", [{"v": "x" * 100}, {"v": "y"}], [("v", "v")])
+        text = out.render()
+        assert "x" * 100 in text
+        assert text.endswith("cursor=1")
+
+
+class TestToolEncoders:
+    """Tests for the tool-specific encoders."""
+
+    def test_structure_is_smaller_than_json(self):
+        """The compact page structure should be much smaller than indented JSON."""
+        import json
+        structure = {
+            "page_title": "Example",
+            "url": "https://example.com",
+            "summary": {"menus": 0, "buttons": 0, "links": 20, "landmarks": 0, "hover_candidates": 0},
+            "links": [{"role": "link", "name": f"Link {i}", "href": f"/page/{i}", "selector": f'text="Link {i}"',
+                       "hasPopup": None, "score": 0} for i in range(20)],
+        }
+        text = _compact_structure(structure)
+        decoded = parse(text)
+
+        assert decoded["counts"] == "menus:0 buttons:0 links:20 landmarks:0 hover_candidates:0"
+        assert decoded["links"][3] == {"name": "Link 3", "sel": 'text="Link 3"', "score": "0", "href": "/page/3"}
+        assert len(text) < len(json.dumps(structure, indent=2)) / 2
+
+    def test_hover_result_shortens_screenshot_paths(self):
+        """Screenshots should be referenced relative to the session folder."""
+        text = _compact_hover_result({
+            "behavior_id": 4, "behavior": "dropdown", "element_description": "Products",
+            "selector": "#products", "new_elements_count": 3,
+            "screenshot_before": "/abs/output/session/screenshots/001_products_before.png",
+            "revealed_links": [{"text": "A", "href": "/a"}],
+        })
+        decoded = parse(text)
+
+        assert decoded["id"] == "4"
+        assert decoded["beh"] == "dropdown"
+        assert decoded["shots"] == "screenshots/001_products_before.png"
+        assert decoded["links"] == [{"text": "A", "href": "/a"}]
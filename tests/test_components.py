@@ -0,0 +1,58 @@
+"""
+Tests for cross-page component deduplication.
+"""
+
+import asyncio
+
+from src.components import ComponentCache
+from src.main import hover_page
+
+
+class TestComponentCache:
+    """Tests for ComponentCache."""
+
+    async def test_first_claim_owns_later_claims_wait(self):
+        """The first claimant hovers; later claimants get the published result."""
+        cache = ComponentCache()
+        assert cache.claim("nav") is None
+        waiter = cache.claim("nav")
+        cache.resolve("nav", {"behavior": "dropdown"})
+        result = await waiter
+
+        assert result == {"behavior": "dropdown"}
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    async def test_failed_component_can_be_retried(self):
+        """Resolving with None should release the fingerprint."""
+        cache = ComponentCache()
+        cache.claim("nav")
+        waiter = cache.claim("nav")
+        cache.resolve("nav", None)
+
+        assert await waiter is None
+        assert cache.claim("nav") is None
+
+
+class TestHoverPageDedupe:
+    """Tests for hover_page with a shared ComponentCache."""
+
+    async def test_shared_component_hovered_once(self, fake_manager):
+        """The nav should be hovered on the first page only and reused on the second."""
+        cache = ComponentCache()
+        fingerprints = {"#products": "fp-nav", "#hero": "fp-hero", "#pricing": "fp-pricing"}
+        shared = {"menus": ["#products"], "fingerprints": fingerprints, "behaviors": {"#products": "dropdown"}}
+        first = fake_manager(hoverables=["#hero"], **shared)
+        second = fake_manager(hoverables=["#pricing"], **shared)
+        page1, page2 = await asyncio.gather(
+            hover_page(first, "https://example.com/", component_cache=cache),
+            hover_page(second, "https://example.com/pricing", component_cache=cache),
+        )
+
+        assert first.hovered == ["#products", "#hero"]
+        assert second.hovered == ["#pricing"]
+
+        reused = page2["results"][0]
+        assert reused["behavior"] == "dropdown"
+        assert reused["page_url"] == "https://example.com/pricing"
+        assert reused["reused_from"] == {"page_url": "https://example.com/", "behavior_id": 1}
+        assert "reused_from" not in page1["results"][0]
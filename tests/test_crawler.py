@@ -0,0 +1,96 @@
+"""
+Tests for the site crawler's URL frontier and crawl loop.
+"""
+
+import json
+import asyncio
+
+import pytest
+
+import src.crawler as crawler
+from src.crawler import URLFrontier, SiteCrawler, normalize_url
+
+
+class TestNormalizeUrl:
+    """Tests for normalize_url."""
+
+    def test_drops_fragment_and_lowercases_host(self):
+        """Fragments and host case should not create distinct pages."""
+        assert normalize_url("https://Example.com#top") == "https://example.com/"
+        assert normalize_url("https://example.com/a?b=1#c") == "https://example.com/a?b=1"
+
+    def test_rejects_non_pages(self):
+        """mailto:, javascript: and asset links should be skipped."""
+        assert normalize_url("mailto:hi@example.com") is None
+        assert normalize_url("javascript:void(0)") is None
+        assert normalize_url("https://example.com/brochure.pdf") is None
+
+
+class TestURLFrontier:
+    """Tests for URLFrontier."""
+
+    def test_same_origin_and_dedupe(self):
+        """Only new same-origin URLs should be queued."""
+        frontier = URLFrontier("https://example.com/", max_pages=10, max_depth=2)
+        assert frontier.add("https://example.com/about", 1)
+        assert not frontier.add("https://example.com/about#team", 1)
+        assert not frontier.add("https://other.com/", 1)
+        assert not frontier.add("http://example.com/about", 1)
+        assert frontier.accepted == 2
+
+    def test_budgets(self):
+        """Depth and page budgets should stop new URLs."""
+        frontier = URLFrontier("https://example.com/", max_pages=2, max_depth=1)
+        assert not frontier.add("https://example.com/deep", 2)
+        assert frontier.add("https://example.com/a", 1)
+        assert not frontier.add("https://example.com/b", 1)
+
+    def test_rejects_invalid_start(self):
+        """A start URL that isn't a page should raise."""
+        with pytest.raises(ValueError):
+            URLFrontier("ftp://example.com/")
+
+
+class TestSiteCrawler:
+    """Tests for the crawl loop (browser work replaced by a fake site)."""
+
+    async def test_crawls_site_within_budget(self, tmp_path, monkeypatch, fake_manager):
+        """Every reachable same-origin page should be visited once, up to max_depth."""
+        site = {
+            "https://example.com/": ["https://example.com/a", "https://example.com/b", "https://other.com/"],
+            "https://example.com/a": ["https://example.com/", "https://example.com/a/deep"],
+            "https://example.com/b": [],
+            "https://example.com/a/deep": ["https://example.com/a/deeper"],
+        }
+
+        async def fake_hover_page(manager, url, **kwargs):
+            manager.url = url
+            await asyncio.sleep(0)
+            return {"title": url, "results": [{
+                "behavior": "dropdown",
+                "revealed_links": [{"href": "https://example.com/b"}],
+            }]}
+
+        monkeypatch.setattr(crawler, "hover_page", fake_hover_page)
+        monkeypatch.setattr(SiteCrawler, "_new_worker", lambda self, index: (fake_manager(site=site), _NoExecutor()))
+
+        summary = await SiteCrawler(
+            "https://example.com", workers=3, max_pages=10, max_depth=2,
+            output_dir=str(tmp_path), session_id="crawl",
+        ).run()
+
+        visited = sorted(p["url"] for p in summary["pages"])
+        assert visited == [
+            "https://example.com/",
+            "https://example.com/a",
+            "https://example.com/a/deep",
+            "https://example.com/b",
+        ]
+        crawl_log = json.loads((tmp_path / "crawl" / "crawl.json").read_text())
+        assert len(crawl_log["pages"]) == 4
+        assert (tmp_path / "crawl" / "hover_report.md").exists()
+
+
+class _NoExecutor:
+    def shutdown(self, wait=True):
+        pass
@@ -0,0 +1,49 @@
+"""
+Tests for the benchmark fixture site and harness helpers.
+No browser needed.
+"""
+
+import re
+from urllib.request import urlopen
+
+from benchmarks.fixtures import EXPECTED_BEHAVIORS, LARGE_PAGE_NODES, FixtureSite, build_pages
+from benchmarks.run import percentiles
+
+
+class TestFixturePages:
+    """Tests for the generated pages."""
+
+    def test_every_expected_page_exists(self):
+        """Each benchmarked page should be generated, plus an index linking them."""
+        pages = build_pages()
+        assert set(EXPECTED_BEHAVIORS) <= set(pages)
+        for name in EXPECTED_BEHAVIORS:
+            assert f"/{name}.html" in pages["index"]
+
+    def test_large_pages_have_requested_node_counts(self):
+        """Large pages should be within 10% of their node target."""
+        pages = build_pages()
+        for name, nodes in LARGE_PAGE_NODES.items():
+            tags = len(re.findall(r"<[a-z]", pages[name]))
+            assert abs(tags - nodes) / nodes < 0.1, (name, tags)
+
+
+class TestFixtureSite:
+    """Tests for the local HTTP server."""
+
+    def test_serves_pages_locally(self):
+        """Pages should be served from 127.0.0.1 on a free port."""
+        with FixtureSite() as site:
+            assert site.url("tooltip").startswith("http://127.0.0.1:")
+            html = urlopen(site.url("tooltip")).read().decode("utf-8")
+        assert "role', 'tooltip'" in html
+
+
+class TestPercentiles:
+    """Tests for the latency summary."""
+
+    def test_nearest_rank(self):
+        """Percentiles should use nearest rank over the sorted samples."""
+        stats = percentiles([float(v) for v in range(1, 101)])
+        assert stats == {"n": 100, "p50": 50.0, "p90": 90.0, "p99": 99.0, "max": 100.0}
+        assert percentiles([]) == {}
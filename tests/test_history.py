@@ -0,0 +1,114 @@
+"""
+Tests for agent message-history compaction.
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.history import compact_history, compaction_boundary, summarize_tool_result
+from src.tools import _compact_hover_result
+
+
+def _hover_turn(i):
+    """One AI tool call plus its (long) hover result."""
+    call_id = f"call_{i}"
+    result = _compact_hover_result({
+        "behavior_id": i, "behavior": "dropdown", "element_description": f"Menu {i}",
+        "selector": f"#menu-{i}", "new_elements_count": 5,
+        "revealed_links": [{"text": f"Link {n}", "href": f"/section/{i}/page/{n}"} for n in range(10)],
+    })
+    return [
+        AIMessage(content="", tool_calls=[{"name": "hover_element", "args": {"selector": f"#menu-{i}"}, "id": call_id}]),
+        ToolMessage(content=result, tool_call_id=call_id, name="hover_element"),
+    ]
+
+
+def _history(turns):
+    messages = [SystemMessage(content="system"), HumanMessage(content="analyze https://example.com")]
+    for i in range(turns):
+        messages.extend(_hover_turn(i))
+    return messages
+
+
+class TestCompactionBoundary:
+    """Tests for compaction_boundary."""
+
+    def test_moves_in_chunks(self):
+        """The boundary should stay put between chunk multiples."""
+        assert compaction_boundary(10, keep=24, chunk=16) == 0
+        assert compaction_boundary(40, keep=24, chunk=16) == 16
+        assert compaction_boundary(55, keep=24, chunk=16) == 16
+        assert compaction_boundary(56, keep=24, chunk=16) == 32
+
+    def test_disabled(self):
+        """keep=0 should disable compaction."""
+        assert compaction_boundary(1000, keep=0, chunk=16) == 0
+
+
+class TestCompactHistory:
+    """Tests for compact_history."""
+
+    def test_short_history_untouched(self):
+        """Histories within the window should be sent as they are."""
+        messages = _history(3)
+        assert compact_history(messages, keep=24, chunk=16) == messages
+
+    def test_old_results_summarized_recent_kept(self):
+        """Old hover results become references to behaviors.db, recent ones stay verbatim."""
+        messages = _history(20)
+        compacted = compact_history(messages, keep=10, chunk=4)
+
+        assert compacted[:2] == messages[:2]
+        assert len(compacted) == len(messages)
+        assert compacted[3].content.startswith("[compacted] behavior #0 dropdown: Menu 0")
+        assert "behaviors.db" in compacted[3].content
+        assert compacted[-10:] == messages[-10:]
+        assert all(len(c.content) < len(m.content) for c, m in zip(compacted[3:28:2], messages[3:28:2]))
+        # The full history in state is not modified
+        assert not messages[3].content.startswith("[compacted]")
+
+    def test_prefix_stable_between_chunks(self):
+        """Adding a message within a chunk should only append to the prompt."""
+        messages = _history(20)
+        before = compact_history(messages[:-1], keep=10, chunk=8)
+        after = compact_history(messages, keep=10, chunk=8)
+        assert after[:len(before)] == before
+
+    def test_long_tool_call_arguments_elided(self):
+        """Saved Gherkin content in old tool calls should not be re-sent."""
+        gherkin = "Feature: Menu\n" + "  Then something happens\n" * 40
+        call = AIMessage(content="", tool_calls=[{
+            "name": "save_gherkin_scenario", "args": {"element_name": "Menu", "gherkin_content": gherkin}, "id": "g1",
+        }])
+        messages = _history(0) + [call, ToolMessage(content="Saved", tool_call_id="g1", name="save_gherkin_scenario")]
+        messages += [HumanMessage(content=str(i)) for i in range(4)]
+
+        compacted = compact_history(messages, keep=2, chunk=1)
+        args = compacted[2].tool_calls[0]["args"]
+        assert args["element_name"] == "Menu"
+        assert args["gherkin_content"] == f"[{len(gherkin)} chars, saved to disk]"
+
+
+class TestSummarizeToolResult:
+    """Tests for summarize_tool_result."""
+
+    def test_batch_keeps_interactive_ids(self):
+        """Batch summaries should keep the behavior ids the model still needs."""
+        content = (
+            "tested=40\ncounts=dropdown:1 no_change:39\n\n"
+            "results[40]{id|desc|sel|beh|new|error}:\n"
+            "1|Products|#products|dropdown|6|\n"
+            + "".join(f"{i}|Link {i}|#l{i}|no_change|0|\n" for i in range(2, 41))
+        )
+        summary = summarize_tool_result("hover_elements_batch", content)
+        assert "tested 40 (dropdown:1 no_change:39)" in summary
+        assert "#1 dropdown: Products" in summary
+        assert "Link 5" not in summary
+        assert "behaviors.db" in summary
+
+    def test_page_tools_point_back_to_the_tool(self):
+        """Page queries are not stored anywhere, so the summary says to re-run them."""
+        content = "title=Home\nurl=https://example.com/\ncounts=menus:4 links:120\n" + "x" * 400
+        summary = summarize_tool_result("get_page_structure", content)
+        assert "page structure of https://example.com/" in summary
+        assert "Call the tool again" in summary
+        assert "behaviors.db" not in summary
@@ -0,0 +1,84 @@
+"""
+Unit tests for the deterministic pipeline helpers.
+No browser needed.
+"""
+
+import json
+from pathlib import Path
+from src.main import collect_candidates, render_scenario
+from src.tools import write_tldr, write_report
+
+
+class TestCollectCandidates:
+    """Tests for merging structure and hoverable lists into targets."""
+
+    def test_dedupes_by_selector(self):
+        """Same selector from several groups should be hovered once."""
+        structure = {
+            "menus": [{"selector": "#products", "name": "Products", "role": "menuitem"}],
+            "hover_candidates": [{"selector": "#products", "name": "Products", "tag": "LI"}],
+            "links": [{"selector": 'text="Blog"', "name": "Blog", "role": "link"}],
+        }
+        hoverables = [{"selector": 'text="Blog"', "text": "Blog", "tag": "A"}]
+
+        targets = collect_candidates(structure, hoverables)
+
+        assert [t["selector"] for t in targets] == ["#products", 'text="Blog"']
+        assert targets[0]["description"] == "Products menuitem"
+
+    def test_respects_max_elements(self):
+        """max_elements should cap the target list."""
+        hoverables = [{"selector": f"#el{i}", "text": f"El {i}", "tag": "A"} for i in range(10)]
+        assert len(collect_candidates({}, hoverables, max_elements=3)) == 3
+
+    def test_max_elements_keeps_highest_scores(self):
+        """The cap should drop footer links before a dropdown trigger found later."""
+        structure = {
+            "links": [{"selector": f"#footer{i}", "name": f"Footer {i}", "role": "link", "landmark": "contentinfo"}
+                      for i in range(5)],
+            "hover_candidates": [{"selector": "#more", "name": "More", "tag": "BUTTON", "ariaPopup": "menu"}],
+        }
+        targets = collect_candidates(structure, [], max_elements=2)
+        assert [t["selector"] for t in targets] == ["#more", "#footer0"]
+
+
+class TestRenderScenario:
+    """Tests for per-element Gherkin rendering."""
+
+    def test_dropdown_lists_links(self):
+        """Dropdown scenarios should include the revealed links table."""
+        gherkin = render_scenario({
+            "element_description": "Products menu",
+            "behavior": "dropdown",
+            "revealed_links": [{"text": "iHz", "href": "/ihz"}],
+        })
+        assert "Feature: Hover Interaction - Products menu" in gherkin
+        assert "@hover @dropdown" in gherkin
+        assert "| iHz | /ihz |" in gherkin
+
+    def test_tooltip_scenario(self):
+        """Tooltip scenarios should expect a tooltip."""
+        gherkin = render_scenario({"element_description": "Info icon", "behavior": "tooltip"})
+        assert "a tooltip should become visible" in gherkin
+
+
+class TestWriteReport:
+    """Tests for TLDR/report generation from a session folder."""
+
+    def test_report_from_behavior_files(self, tmp_path):
+        """Report should be built from behaviors on disk without the agent."""
+        behaviors_dir = tmp_path / "behaviors"
+        behaviors_dir.mkdir()
+        (behaviors_dir / "001_Products.json").write_text(json.dumps({
+            "element_description": "Products menu",
+            "behavior": "dropdown",
+            "revealed_links": [{"text": "iHz", "href": "/ihz"}],
+        }))
+
+        tldr = write_tldr(tmp_path, "example.com", "s1")
+        report_path = write_report(tmp_path, "Report", tldr, "s1")
+
+        assert "Total Elements Tested | 1" in tldr
+        content = Path(report_path).read_text(encoding="utf-8")
+        assert "# Report" in content
+        assert "Dropdowns detected | 1" in content
@@ -0,0 +1,147 @@
+"""
+Tests for the parallel hover engine.
+Workers are stand-ins for BrowserManager; no browser needed.
+"""
+
+import time
+import asyncio
+from itertools import count
+
+import pytest
+
+from src import parallel
+from src.parallel import ParallelHoverEngine
+
+
+class FakeWorker:
+    """Hover worker that answers after a per-selector delay."""
+
+    failing = set()
+    created = []
+
+    def __init__(self, delays=None, **kwargs):
+        self.delays = delays or {}
+        self.kwargs = kwargs
+        self.hovered = []
+        self.closed = False
+        FakeWorker.created.append(self)
+        self.number = len(FakeWorker.created)
+
+    async def navigate(self, url):
+        if self.number in FakeWorker.failing:
+            raise RuntimeError(f"net::ERR_CONNECTION_REFUSED at {url}")
+        return "Title"
+
+    async def hover_and_detect(self, selector, element_name="", capture_screenshots=True, force=False):
+        await asyncio.sleep(self.delays.get(selector, 0))
+        if selector == "#broken":
+            raise TimeoutError("element detached")
+        self.hovered.append(selector)
+        return {"selector": selector, "behavior": "no_change"}
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeParent:
+    """Parent manager with a logged-in context."""
+
+    headless = True
+    session_id = None
+    output_dir = "output"
+    settle = True
+    diff_mode = "observer"
+    profile = False
+    recycle_policy = None
+
+    def __init__(self):
+        self._screenshot_seq = count(1)
+
+    async def export_storage_state(self):
+        return {"cookies": [{"name": "consent", "value": "yes"}], "origins": []}
+
+
+def engine_with(workers):
+    engine = ParallelHoverEngine("https://example.com", workers=len(workers))
+    engine._workers = workers
+    return engine
+
+
+class TestHoverAll:
+    """Tests for ParallelHoverEngine.hover_all."""
+
+    async def test_results_in_input_order(self):
+        """Results line up with targets even when later targets finish first."""
+        delays = {"#a": 0.05, "#b": 0.0, "#c": 0.03, "#d": 0.0}
+        workers = [FakeWorker(delays), FakeWorker(delays)]
+        targets = [{"selector": s} for s in delays]
+
+        results = await engine_with(workers).hover_all(targets)
+
+        assert [r["selector"] for r in results] == ["#a", "#b", "#c", "#d"]
+        hovered = workers[0].hovered + workers[1].hovered
+        assert sorted(hovered) == ["#a", "#b", "#c", "#d"]
+        assert workers[0].hovered and workers[1].hovered
+
+    async def test_failed_hover_becomes_error_entry(self):
+        """A raising hover is reported in place; the other targets still run."""
+        targets = [{"selector": "#ok"}, {"selector": "#broken"}, {"selector": "#next"}]
+
+        results = await engine_with([FakeWorker()]).hover_all(targets)
+
+        assert results[1]["behavior"] == "error"
+        assert "element detached" in results[1]["error"]
+        assert [results[0]["selector"], results[2]["selector"]] == ["#ok", "#next"]
+
+    async def test_past_deadline_leaves_targets_unstarted(self):
+        """Targets not started before the deadline come back as None."""
+        delays = {"#a": 0.05}
+        targets = [{"selector": "#a"}, {"selector": "#b"}, {"selector": "#c"}]
+
+        results = await engine_with([FakeWorker(delays)]).hover_all(
+            targets, deadline=time.monotonic() + 0.02
+        )
+
+        assert results[0]["selector"] == "#a"
+        assert results[1:] == [None, None]
+
+
+class TestStart:
+    """Tests for ParallelHoverEngine.start."""
+
+    @pytest.fixture(autouse=True)
+    def fake_workers(self, monkeypatch):
+        FakeWorker.created = []
+        FakeWorker.failing = set()
+        monkeypatch.setattr(parallel, "BrowserManager", FakeWorker)
+
+    async def test_unreachable_workers_dropped(self):
+        """Workers that cannot load the URL are closed and left out."""
+        FakeWorker.failing = {2}
+        engine = ParallelHoverEngine("https://example.com", workers=3, parent=FakeParent())
+        try:
+            await engine.start()
+            assert len(engine._workers) == 2
+            assert [w.closed for w in FakeWorker.created].count(True) == 1
+        finally:
+            await engine.close()
+
+    async def test_no_reachable_worker_raises(self):
+        """start() fails when no worker could load the URL."""
+        FakeWorker.failing = {1, 2}
+        engine = ParallelHoverEngine("https://example.com", workers=2)
+        with pytest.raises(RuntimeError, match="No hover worker"):
+            await engine.start()
+        await engine.close()
+
+    async def test_workers_inherit_parent_storage_and_tag_timings(self):
+        """Workers start from the parent's cookies and record worker.* timings."""
+        engine = ParallelHoverEngine("https://example.com", workers=2, parent=FakeParent())
+        try:
+            await engine.start()
+        finally:
+            await engine.close()
+
+        for worker in FakeWorker.created:
+            assert worker.kwargs["storage_state"]["cookies"][0]["name"] == "consent"
+            assert worker.kwargs["timing_prefix"] == "worker."
@@ -0,0 +1,146 @@
+"""
+Tests for the opt-in browser profiler.
+Uses stand-ins for the Playwright context and CDP session; no browser needed.
+"""
+
+import json
+
+from src.profiling import (
+    METRICS_FILENAME, SUMMARY_FILENAME, PageProfiler, load_windows, profiling_enabled, summarize_windows,
+)
+
+
+class FakeCDP:
+    """CDP session whose counters grow by a fixed step per getMetrics call."""
+
+    def __init__(self, step=None):
+        self.step = step or {"LayoutCount": 2, "RecalcStyleCount": 3, "ScriptDuration": 0.01}
+        self.values = {"LayoutCount": 0, "RecalcStyleCount": 0, "ScriptDuration": 0.0, "JSHeapUsedSize": 1000}
+        self.sent = []
+        self.detached = False
+
+    def send(self, method, params=None):
+        self.sent.append(method)
+        if method == "Performance.getMetrics":
+            metrics = [{"name": k, "value": v} for k, v in self.values.items()]
+            for name, step in self.step.items():
+                self.values[name] += step
+            return {"metrics": metrics}
+        return {}
+
+    def detach(self):
+        self.detached = True
+
+
+class FakeTracing:
+    def __init__(self):
+        self.started = None
+        self.stopped_to = None
+
+    def start(self, **kwargs):
+        self.started = kwargs
+
+    def stop(self, path=None):
+        self.stopped_to = path
+
+
+class FakeContext:
+    def __init__(self, cdp=None):
+        self.tracing = FakeTracing()
+        self._cdp = cdp
+
+    def new_cdp_session(self, page):
+        if self._cdp is None:
+            raise RuntimeError("CDP session is only supported in Chromium")
+        return self._cdp
+
+
+class TestPageProfiler:
+    """Tests for PageProfiler."""
+
+    def test_windows_written_and_trace_saved(self, tmp_path):
+        """Each window should produce one line of counter deltas; stop saves the trace."""
+        cdp = FakeCDP()
+        context = FakeContext(cdp)
+        profiler = PageProfiler(tmp_path / "profile")
+        profiler.start(context, page=object())
+
+        with profiler.window("navigate", "https://example.com"):
+            pass
+        with profiler.window("hover", "Products"):
+            pass
+        profiler.stop()
+
+        windows = load_windows(tmp_path / "profile")
+        assert [w["kind"] for w in windows] == ["navigate", "hover"]
+        assert windows[0]["LayoutCount"] == 2
+        assert windows[0]["RecalcStyleCount"] == 3
+        assert windows[0]["JSHeapUsedSize"] == 1000
+        assert context.tracing.started == {"screenshots": True, "snapshots": True}
+        assert context.tracing.stopped_to == str(profiler.trace_path)
+        assert cdp.sent[0] == "Performance.enable"
+        assert cdp.detached
+        assert (tmp_path / "profile" / SUMMARY_FILENAME).exists()
+
+    def test_without_cdp_only_traces(self, tmp_path):
+        """Non-Chromium contexts keep the trace and skip metric sampling."""
+        context = FakeContext(cdp=None)
+        profiler = PageProfiler(tmp_path / "profile")
+        profiler.start(context, page=object())
+
+        with profiler.window("hover", "Menu"):
+            pass
+        profiler.stop()
+
+        assert not (tmp_path / "profile" / METRICS_FILENAME).exists()
+        assert context.tracing.stopped_to == str(profiler.trace_path)
+
+    def test_window_recorded_when_block_raises(self, tmp_path):
+        """A failing hover should still be sampled."""
+        profiler = PageProfiler(tmp_path)
+        profiler.start(FakeContext(FakeCDP()), page=object())
+        try:
+            with profiler.window("hover", "Broken"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert [w["label"] for w in load_windows(tmp_path)] == ["Broken"]
+
+
+class TestSummarizeWindows:
+    """Tests for summarize_windows."""
+
+    def test_scans_attributed_to_us(self):
+        """Scans inside hovers count as ours; the rest of the hover is the site's."""
+        windows = [
+            {"kind": "navigate", "ms": 500, "LayoutCount": 4, "JSHeapUsedSize": 10},
+            {"kind": "extract", "ms": 80, "LayoutCount": 1, "RecalcStyleCount": 6},
+            {"kind": "hover", "ms": 300, "LayoutCount": 12, "RecalcStyleCount": 10, "JSHeapUsedSize": 30},
+            {"kind": "scan", "ms": 20, "LayoutCount": 2, "RecalcStyleCount": 8},
+        ]
+        summary = summarize_windows(windows)
+
+        assert summary["attribution"]["ours"]["LayoutCount"] == 3
+        assert summary["attribution"]["ours"]["RecalcStyleCount"] == 14
+        assert summary["attribution"]["site"]["LayoutCount"] == 14
+        assert summary["attribution"]["site"]["ms"] == 780
+        assert summary["kinds"]["hover"]["peak_js_heap"] == 30
+        assert summary["kinds"]["navigate"]["n"] == 1
+
+    def test_skips_unreadable_lines(self, tmp_path):
+        """A truncated last line should not break the summary."""
+        (tmp_path / METRICS_FILENAME).write_text(
+            json.dumps({"kind": "hover", "ms": 5, "LayoutCount": 1}) + "\n{\"kind\": \"ho", encoding="utf-8"
+        )
+        assert len(load_windows(tmp_path)) == 1
+
+
+class TestProfilingEnabled:
+    """Tests for profiling_enabled."""
+
+    def test_env_switch(self, monkeypatch):
+        """HOVER_PROFILE turns profiling on; it is off by default."""
+        monkeypatch.delenv("HOVER_PROFILE", raising=False)
+        assert not profiling_enabled()
+        monkeypatch.setenv("HOVER_PROFILE", "1")
+        assert profiling_enabled()
@@ -0,0 +1,141 @@
+"""
+Tests for page/context recycling.
+Uses stand-ins for the Playwright browser, context and page; no browser needed.
+"""
+
+from src.browser import BrowserManager, BrowserSession
+from src.recycling import RecyclePolicy
+
+
+class FakeCDP:
+    def __init__(self, heap):
+        self.heap = heap
+
+    def send(self, method, params=None):
+        if method == "Performance.getMetrics":
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": self.heap}]}
+        return {}
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "about:blank"
+        self.visits = []
+
+    def goto(self, url, wait_until=None):
+        self.url = url
+        self.visits.append(url)
+
+    def title(self):
+        return "Title"
+
+    def is_closed(self):
+        return False
+
+
+class FakeContext:
+    def __init__(self, heap, storage_state=None):
+        self.heap = heap
+        self.closed = False
+        self.page = FakePage()
+        self.initial_state = storage_state
+        self.cookies = list((storage_state or {}).get("cookies", []))
+
+    def new_page(self):
+        return self.page
+
+    def new_cdp_session(self, page):
+        return FakeCDP(self.heap)
+
+    def storage_state(self):
+        assert not self.closed
+        return {"cookies": list(self.cookies), "origins": []}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, heap=0):
+        self.heap = heap
+        self.contexts = []
+
+    def new_context(self, storage_state=None):
+        self.contexts.append(FakeContext(self.heap, storage_state))
+        return self.contexts[-1]
+
+
+def _manager(tmp_path, policy, heap=0):
+    """A BrowserManager wired to a fake browser with one open context."""
+    manager = BrowserManager(output_dir=str(tmp_path), profile=False, recycle_policy=policy)
+    browser = FakeBrowser(heap)
+    manager._session = BrowserSession(browser=browser, owns_browser=False)
+    manager._open_context_sync()
+    return manager, browser
+
+
+class TestRecyclePolicy:
+    """Tests for RecyclePolicy."""
+
+    def test_thresholds(self):
+        """Each threshold triggers on its own; 0 disables it."""
+        policy = RecyclePolicy(max_hovers=10, max_navigations=5, max_heap_mb=100)
+        assert policy.reason(9, 4) is None
+        assert policy.reason(10, 0) == "10 hovers"
+        assert policy.reason(0, 5) == "5 navigations"
+        assert policy.reason(0, 0, heap_bytes=150 * 2**20) == "JS heap 150 MB"
+        assert RecyclePolicy(max_hovers=0, max_navigations=0, max_heap_mb=0).reason(10**6, 10**6, 10**12) is None
+
+    def test_heap_sampled_periodically(self):
+        """The heap is only sampled every heap_check_every operations."""
+        policy = RecyclePolicy(heap_check_every=20)
+        assert [n for n in range(61) if policy.should_sample_heap(n)] == [20, 40, 60]
+        assert not RecyclePolicy(max_heap_mb=0).should_sample_heap(20)
+
+    def test_from_env(self, monkeypatch):
+        """BROWSER_RECYCLE_* variables override the defaults."""
+        monkeypatch.setenv("BROWSER_RECYCLE_HOVERS", "50")
+        monkeypatch.setenv("BROWSER_RECYCLE_HEAP_MB", "0")
+        policy = RecyclePolicy.from_env()
+        assert policy.max_hovers == 50
+        assert policy.max_heap_mb == 0
+
+
+class TestBrowserManagerRecycling:
+    """Tests for BrowserManager context recycling."""
+
+    def test_recycle_restores_url(self, tmp_path):
+        """Past the hover threshold the context is replaced and the URL reloaded."""
+        manager, browser = _manager(tmp_path, RecyclePolicy(max_hovers=3, max_heap_mb=0))
+        manager._session.page.goto("https://example.com/shop")
+        browser.contexts[0].cookies.append({"name": "session", "value": "logged-in"})
+        manager._hovers = 3
+
+        manager._maybe_recycle_sync(restore=True)
+
+        assert browser.contexts[0].closed
+        assert len(browser.contexts) == 2
+        assert browser.contexts[1].initial_state["cookies"] == [{"name": "session", "value": "logged-in"}]
+        assert manager._session.page.visits == ["https://example.com/shop"]
+        assert manager._hovers == 0
+        assert manager.recycles == 1
+
+    def test_navigation_threshold_skips_restore(self, tmp_path):
+        """Recycling before a navigation goes straight to the new URL."""
+        manager, browser = _manager(tmp_path, RecyclePolicy(max_navigations=2, max_heap_mb=0))
+        for n in range(3):
+            manager._navigate_sync(f"https://example.com/{n}")
+
+        assert len(browser.contexts) == 2
+        assert browser.contexts[1].page.visits == ["https://example.com/2"]
+        assert manager._navigations == 1
+        assert any(t["kind"] == "recycle" for t in manager.behaviors.timings())
+
+    def test_heap_threshold(self, tmp_path):
+        """A large sampled JS heap recycles the context."""
+        policy = RecyclePolicy(max_hovers=0, max_navigations=0, max_heap_mb=64, heap_check_every=1)
+        manager, browser = _manager(tmp_path, policy, heap=128 * 2**20)
+        manager._navigate_sync("https://example.com")
+        manager._maybe_recycle_sync(restore=True)
+        assert manager.recycles == 1
+        assert browser.contexts[1].page.visits == ["https://example.com"]
@@ -0,0 +1,154 @@
+"""
+Tests for the incremental report writer.
+"""
+
+import os
+
+from src.behavior_store import BehaviorStore
+from src.report import KeywordIndex, ReportWriter, cancel_refresh, flush_refreshes, refresh_report, schedule_refresh
+
+
+def _session(tmp_path):
+    """A session folder with one linked scenario and one unmatched dropdown."""
+    store = BehaviorStore(tmp_path)
+    store.add("Products menu", {
+        "behavior": "dropdown",
+        "scenario_file": str(tmp_path / "scenarios" / "Products_menu.feature"),
+        "screenshot_before": "screenshots/a.png",
+        "screenshot_after": "screenshots/b.png",
+    })
+    store.add("Company menu", {"behavior": "dropdown", "revealed_links": [{"text": "About", "href": "/about"}]})
+    scenarios = tmp_path / "scenarios"
+    scenarios.mkdir()
+    (scenarios / "Products_menu.feature").write_text("Feature: Products\n", encoding="utf-8")
+    return store
+
+
+class TestReportWriter:
+    """Tests for ReportWriter."""
+
+    def test_writes_all_sections(self, tmp_path):
+        """Report should contain scenarios, unmatched behaviors and the summary."""
+        _session(tmp_path)
+        path = ReportWriter(tmp_path).write("My Report", "## TLDR\n", "s1")
+
+        content = open(path, encoding="utf-8").read()
+        assert content.startswith("# My Report")
+        assert "Feature: Products" in content
+        assert "![Before](screenshots/a.png)" in content
+        assert "### Company menu" in content
+        assert "Total elements tested | 2" in content
+        assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+    def test_reuses_unchanged_sections(self, tmp_path):
+        """A second write should reuse every section whose inputs didn't change."""
+        _session(tmp_path)
+        ReportWriter(tmp_path).write("My Report", "", "s1")
+
+        writer = ReportWriter(tmp_path)
+        writer.write()
+        assert writer.rendered == 0
+        assert writer.reused == 2
+
+    def test_rerenders_changed_scenario(self, tmp_path):
+        """Editing a scenario file should re-render only that section."""
+        _session(tmp_path)
+        ReportWriter(tmp_path).write("My Report", "", "s1")
+
+        feature = tmp_path / "scenarios" / "Products_menu.feature"
+        feature.write_text("Feature: Products (edited)\n", encoding="utf-8")
+        os.utime(feature, ns=(0, 1))
+
+        writer = ReportWriter(tmp_path)
+        path = writer.write()
+        assert writer.rendered == 1
+        assert "Feature: Products (edited)" in open(path, encoding="utf-8").read()
+
+    def test_refresh_keeps_title_and_picks_up_new_behaviors(self, tmp_path):
+        """refresh_report should keep the last title and include new records."""
+        store = _session(tmp_path)
+        ReportWriter(tmp_path).write("My Report", "", "s1")
+        store.add("Info icon", {"behavior": "tooltip"})
+
+        content = open(refresh_report(tmp_path), encoding="utf-8").read()
+        assert content.startswith("# My Report")
+        assert "Session ID: `s1`" in content
+        assert "### Info icon" in content
+
+    def test_refresh_can_be_disabled(self, tmp_path, monkeypatch):
+        """LIVE_REPORT=0 should turn off live refreshes."""
+        monkeypatch.setenv("LIVE_REPORT", "0")
+        assert refresh_report(tmp_path) is None
+        assert not (tmp_path / "hover_report.md").exists()
+
+    def test_scheduled_refreshes_coalesce(self, tmp_path, monkeypatch):
+        """Saves within the interval should share one background refresh."""
+        monkeypatch.setenv("LIVE_REPORT_INTERVAL", "60")
+        _session(tmp_path)
+
+        assert schedule_refresh(tmp_path, "s1")
+        assert not schedule_refresh(tmp_path, "s1")
+        assert not (tmp_path / "hover_report.md").exists()
+
+        flush_refreshes()
+        assert "Session ID: `s1`" in (tmp_path / "hover_report.md").read_text(encoding="utf-8")
+        assert schedule_refresh(tmp_path, "s1")
+        flush_refreshes()
+
+    def test_final_write_cancels_pending_refresh(self, tmp_path, monkeypatch):
+        """write_report supersedes a pending refresh, which must not fire afterwards."""
+        from src.tools import write_report
+        monkeypatch.setenv("LIVE_REPORT_INTERVAL", "60")
+        _session(tmp_path)
+
+        assert schedule_refresh(tmp_path, "s1")
+        write_report(tmp_path, "Final Report", session_id="s1")
+
+        assert not cancel_refresh(tmp_path)
+        assert schedule_refresh(tmp_path, "s1")
+        assert cancel_refresh(tmp_path)
+
+
+class TestScenarioMatching:
+    """Tests for scenario-to-behavior matching."""
+
+    def test_explicit_link_beats_keyword_match(self, tmp_path):
+        """A linked scenario should use its behavior even if another description matches better."""
+        store = BehaviorStore(tmp_path)
+        store.add("Company menu item", {"behavior": "tooltip"})
+        linked = store.add("Top navigation entry", {"behavior": "dropdown"})
+        scenarios = tmp_path / "scenarios"
+        scenarios.mkdir()
+        (scenarios / "Company_menu.feature").write_text("Feature: Company\n", encoding="utf-8")
+        store.link_scenario(linked, str(scenarios / "Company_menu.feature"))
+
+        content = open(ReportWriter(tmp_path).write("R"), encoding="utf-8").read()
+        assert "**Behavior Detected:** `dropdown`" in content
+
+    def test_keyword_index_fallback(self):
+        """Unlinked scenarios should match the behavior sharing the most keywords."""
+        behaviors = [
+            {"id": 1, "element_description": "Products menu"},
+            {"id": 2, "element_description": "Company menu item"},
+        ]
+        index = KeywordIndex(behaviors)
+        assert index.match("Company_Menu")["id"] == 2
+        assert index.match("Menu")["id"] == 1
+        assert index.match("Footer_Contact_Link") == {}
+
+
+class TestMultiPageReport:
+    """Tests for crawl sessions with behaviors from several pages."""
+
+    def test_sections_grouped_by_page(self, tmp_path):
+        """Each page should get a heading and a row in the pages table."""
+        store = BehaviorStore(tmp_path)
+        store.add("Home menu", {"behavior": "dropdown", "page_url": "https://example.com/"})
+        store.add("About menu", {"behavior": "tooltip", "page_url": "https://example.com/about"})
+        store.add("Home logo", {"behavior": "no_change", "page_url": "https://example.com/"})
+
+        content = open(ReportWriter(tmp_path).write("Site"), encoding="utf-8").read()
+        home = content.index("### Page: https://example.com/\n")
+        about = content.index("### Page: https://example.com/about")
+        assert home < content.index("### Home menu") < about < content.index("### About menu")
+        assert "| https://example.com/ | 2 | 1 |" in content
@@ -0,0 +1,115 @@
+"""
+Tests for incremental runs (cross-run hover result cache).
+"""
+
+import sqlite3
+from urllib.parse import quote
+
+import pytest
+
+from src.browser import BrowserManager
+from src.main import hover_page
+from src.run_cache import RunCache, carry_forward
+
+
+class TestRunCache:
+    """Tests for RunCache."""
+
+    def test_hit_only_with_same_fingerprint(self, tmp_path):
+        """A result should be returned only while the fingerprint is unchanged."""
+        cache = RunCache(tmp_path)
+        assert cache.put("https://a/", "#nav", "fp1", {"behavior": "dropdown"}, "run1")
+
+        assert cache.lookup("https://a/", "#nav", "fp1") == {"session_id": "run1", "record": {"behavior": "dropdown"}}
+        assert cache.lookup("https://a/", "#nav", "fp2") is None
+        assert cache.lookup("https://b/", "#nav", "fp1") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_errors_not_cached(self, tmp_path):
+        """Unreachable and failed hovers should be retried next run."""
+        cache = RunCache(tmp_path)
+        assert not cache.put("https://a/", "#x", "fp", {"behavior": "unreachable"}, "run1")
+        assert cache.lookup("https://a/", "#x", "fp") is None
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Every connection the cache opens should be closed after its transaction."""
+        opened = []
+        connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+        cache = RunCache(tmp_path)
+        cache.put("https://a/", "#nav", "fp1", {"behavior": "dropdown"}, "run1")
+        cache.lookup("https://a/", "#nav", "fp1")
+
+        assert opened
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+
+class TestCarryForward:
+    """Tests for carry_forward."""
+
+    def test_copies_screenshots_and_scenario(self, tmp_path):
+        """Blobs should be adopted into the new session and the scenario text kept."""
+        old = BrowserManager(output_dir=str(tmp_path), session_id="run1")
+        blob = old._store_screenshot("nav_before", b"png-bytes")
+        scenario = old.save_scenario_file("Nav", "Feature: Nav\n")
+        cached = {"session_id": "run1", "record": {
+            "element_description": "Nav", "behavior": "dropdown", "behavior_id": 7,
+            "screenshot_before": blob, "scenario_file": scenario,
+        }}
+
+        new = BrowserManager(output_dir=str(tmp_path), session_id="run2")
+        record = carry_forward(new, cached)
+
+        assert record["screenshot_before"].startswith(str(new.screenshots_dir))
+        assert open(record["screenshot_before"], "rb").read() == b"png-bytes"
+        assert record["scenario_content"] == "Feature: Nav\n"
+        assert record["carried_forward"] == {"session_id": "run1", "behavior_id": 7}
+
+    def test_missing_blob_means_rehover(self, tmp_path):
+        """If the previous session was deleted the element must be hovered again."""
+        new = BrowserManager(output_dir=str(tmp_path), session_id="run2")
+        cached = {"session_id": "gone", "record": {"screenshot_before": str(tmp_path / "gone" / "x.png")}}
+        assert carry_forward(new, cached) is None
+
+
+class TestIncrementalHoverPage:
+    """Tests for hover_page with a RunCache."""
+
+    async def test_only_changed_elements_rehovered(self, tmp_path, fake_manager):
+        """The second run should hover only the element whose state changed."""
+        cache = RunCache(tmp_path)
+        first = fake_manager(menus=["#nav", "#logo"], fingerprints={"#nav": "a1", "#logo": "b1"}, session_id="run1")
+        await hover_page(first, "https://example.com/", run_cache=cache)
+        assert first.hovered == ["#nav", "#logo"]
+
+        second = fake_manager(menus=["#nav", "#logo"], fingerprints={"#nav": "a1", "#logo": "b2"}, session_id="run2")
+        page = await hover_page(second, "https://example.com/", run_cache=cache)
+        assert second.hovered == ["#logo"]
+        assert second.fingerprint_styles == [True]
+        assert page["results"][0]["carried_forward"]["session_id"] == "run1"
+        assert "carried_forward" not in page["results"][1]
+
+    async def test_text_selector_carried_forward_on_real_page(self, tmp_path):
+        """text="..." targets are fingerprinted by the page script and skipped on the next run."""
+        url = "data:text/html," + quote('<nav><ul><li><a href="/p">Products</a></li></ul></nav>')
+        cache = RunCache(tmp_path)
+        pages = []
+        for session_id in ("run1", "run2"):
+            manager = BrowserManager(headless=True, output_dir=str(tmp_path), session_id=session_id)
+            try:
+                pages.append(await hover_page(manager, url, run_cache=cache))
+            finally:
+                await manager.close()
+
+        selectors = [t["selector"] for t in pages[1]["targets"]]
+        assert 'text="Products"' in selectors
+        rerun = pages[1]["results"][selectors.index('text="Products"')]
+        assert rerun["carried_forward"]["session_id"] == "run1"
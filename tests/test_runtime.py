@@ -0,0 +1,68 @@
+"""
+Tests for the dedicated browser runtime thread.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.runtime import BrowserRuntime, benchmark_dispatch, run_on
+
+
+class TestBrowserRuntime:
+    """Tests for BrowserRuntime."""
+
+    async def test_commands_run_in_order_on_one_thread(self):
+        """Every command should run on the same thread, in submission order."""
+        runtime = BrowserRuntime("test-runtime")
+        seen = []
+
+        await asyncio.gather(*(runtime.run(lambda i=i: seen.append((i, threading.current_thread().name)))
+                               for i in range(20)))
+        runtime.shutdown()
+        assert [i for i, _ in seen] == list(range(20))
+        assert {name for _, name in seen} == {"test-runtime"}
+
+    async def test_exceptions_propagate(self):
+        """Errors raised on the runtime thread should reach the awaiting caller."""
+        runtime = BrowserRuntime("test-runtime")
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await runtime.run(fail)
+        with pytest.raises(ValueError):
+            runtime.call(fail)
+        runtime.shutdown()
+
+    def test_nested_call_does_not_deadlock(self):
+        """A command calling back into the runtime should run inline."""
+        runtime = BrowserRuntime("test-runtime")
+        assert runtime.call(lambda: runtime.call(lambda: 42)) == 42
+        runtime.shutdown()
+
+    def test_shutdown_rejects_new_commands(self):
+        """After shutdown the runtime should refuse work."""
+        runtime = BrowserRuntime("test-runtime")
+        assert runtime.submit(lambda: 1).result() == 1
+        runtime.shutdown()
+        with pytest.raises(RuntimeError):
+            runtime.submit(lambda: 2)
+
+    async def test_run_on_accepts_plain_executors(self):
+        """run_on should fall back to run_in_executor for other executors."""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert await run_on(executor, lambda x: x * 2, 21) == 42
+
+
+class TestBenchmarkDispatch:
+    """Tests for the dispatch microbenchmark."""
+
+    def test_reports_every_variant(self):
+        """The benchmark should time the legacy path, run_in_executor and the runtime."""
+        timings = benchmark_dispatch(calls=50)
+        assert set(timings) == {"legacy_thread_hop_us", "run_in_executor_us", "browser_runtime_us"}
+        assert all(value > 0 for value in timings.values())
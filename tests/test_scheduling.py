@@ -0,0 +1,84 @@
+"""
+Tests for hover candidate scoring and budgeted scheduling.
+No browser needed.
+"""
+
+import asyncio
+import time
+
+from src.browser import BrowserManager
+from src.scheduling import budget_deadline, past_deadline, rank_candidates, score_candidate, sort_by_score
+
+
+class TestScoreCandidate:
+    """Tests for score_candidate."""
+
+    def test_signals_add_up(self):
+        """Popup, expanded state and a child list should outrank a plain link."""
+        dropdown = {"ariaPopup": "true", "ariaExpanded": "false", "childList": True, "landmark": "navigation"}
+        plain = {"role": "link", "landmark": "main"}
+        assert score_candidate(dropdown) == 4 + 3 + 3 + 2
+        assert score_candidate(plain) == 0
+
+    def test_footer_links_score_below_zero(self):
+        """Links in the contentinfo landmark should come last."""
+        assert score_candidate({"role": "link", "landmark": "contentinfo"}) < 0
+
+    def test_false_attributes_ignored(self):
+        """aria-haspopup="false" is not a popup."""
+        assert score_candidate({"hasPopup": "false"}) == 0
+
+    def test_sort_keeps_document_order_for_ties(self):
+        """Equal scores should stay in document order."""
+        items = [{"selector": "#a"}, {"selector": "#b", "dataToggle": "dropdown"}, {"selector": "#c"}]
+        assert [i["selector"] for i in sort_by_score(items)] == ["#b", "#a", "#c"]
+
+
+class TestRankCandidates:
+    """Tests for rank_candidates."""
+
+    def test_merges_signals_across_groups(self):
+        """A link that is also a hoverable with an expand arrow gets both signals."""
+        structure = {
+            "links": [
+                {"selector": "#privacy", "name": "Privacy", "role": "link", "landmark": "contentinfo"},
+                {"selector": "#solutions", "name": "Solutions", "role": "link", "landmark": "navigation"},
+            ],
+        }
+        hoverables = [{"selector": "#solutions", "text": "Solutions", "tag": "A", "hasExpandButton": True,
+                       "childList": True}]
+
+        targets = rank_candidates(structure, hoverables)
+
+        assert [t["selector"] for t in targets] == ["#solutions", "#privacy"]
+        assert targets[0]["description"] == "Solutions link"
+        assert targets[0]["score"] == 2 + 3 + 2
+
+
+class TestBudget:
+    """Tests for the wall-clock budget."""
+
+    def test_deadline(self):
+        """No budget never expires; an elapsed one does."""
+        assert budget_deadline(None) is None
+        assert not past_deadline(None)
+        assert past_deadline(budget_deadline(1, started=time.monotonic() - 2))
+
+    async def test_hover_many_stops_at_deadline(self, tmp_path):
+        """Targets not started before the deadline come back as None."""
+        manager = BrowserManager(output_dir=str(tmp_path), profile=False)
+        hovered = []
+
+        async def fake_hover(selector, element_name="", capture_screenshots=True, force=False):
+            hovered.append(selector)
+            await asyncio.sleep(0.05)
+            return {"selector": selector, "behavior": "no_change"}
+
+        manager.hover_and_detect = fake_hover
+        targets = [{"selector": f"#el{i}"} for i in range(10)]
+
+        results = await manager.hover_many(targets, workers=1, deadline=budget_deadline(0.12))
+
+        assert hovered == [t["selector"] for t in targets[:len(hovered)]]
+        assert 1 <= len(hovered) < 10
+        assert results[len(hovered):] == [None] * (10 - len(hovered))
@@ -0,0 +1,87 @@
+"""
+Tests for per-phase timing and session metrics.
+"""
+
+import json
+import time
+
+from src.behavior_store import BehaviorStore
+from src.timing import PhaseTimer, aggregate_session, render_performance, summarize
+from src.tools import write_tldr
+
+
+class TestPhaseTimer:
+    """Tests for PhaseTimer."""
+
+    def test_phases_accumulate(self):
+        """Repeated phases should add up and total should cover everything."""
+        timer = PhaseTimer()
+        with timer.phase("settle"):
+            time.sleep(0.01)
+        with timer.phase("settle"):
+            time.sleep(0.01)
+        timer.add("hover", 5.0)
+        timings = timer.as_dict()
+
+        assert timings["settle"] >= 20
+        assert timings["hover"] == 5.0
+        assert timings["total"] >= timings["settle"]
+
+    def test_phase_recorded_on_error(self):
+        """A phase that raises should still be timed."""
+        timer = PhaseTimer()
+        try:
+            with timer.phase("hover"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert "hover" in timer.as_dict()
+
+
+class TestAggregateSession:
+    """Tests for aggregate_session / metrics.json."""
+
+    def _store(self, tmp_path):
+        store = BehaviorStore(tmp_path)
+        store.add("A", {"behavior": "dropdown", "timings": {"reset": 100, "settle": 300, "total": 450}})
+        store.add("B", {"behavior": "no_change", "timings": {"reset": 120, "settle": 500, "total": 700}})
+        store.add("C", {"behavior": "dropdown", "timings": {"reset": 9999, "total": 9999},
+                        "carried_forward": {"session_id": "old"}})
+        store.add_timing("navigate", 800.0, "https://example.com/")
+        store.add_timing("extract", 40.0, "https://example.com/")
+        return store
+
+    def test_aggregates_hover_and_page_phases(self, tmp_path):
+        """Stats should cover fresh hovers only and name the bottleneck."""
+        metrics = aggregate_session(self._store(tmp_path))
+
+        assert metrics["hovers"] == 2
+        assert metrics["hover_phases"]["settle"]["total_ms"] == 800
+        assert metrics["hover_phases"]["reset"]["max"] == 120
+        assert metrics["page"]["navigate"]["n"] == 1
+        assert metrics["bottleneck"] == "settle"
+
+    def test_tldr_shows_performance_and_writes_metrics(self, tmp_path):
+        """write_tldr should include the performance table and save metrics.json."""
+        self._store(tmp_path)
+        tldr = write_tldr(tmp_path, "example.com", "s1")
+
+        assert "### Performance" in tldr
+        assert "dominated by **settle**" in tldr
+        assert "| page: navigate | 1 |" in tldr
+        metrics = json.loads((tmp_path / "metrics.json").read_text())
+        assert metrics["hover_phases"]["total"]["n"] == 2
+
+    def test_untimed_session_has_no_section(self, tmp_path):
+        """Old sessions without timings should not get an empty table."""
+        BehaviorStore(tmp_path).add("A", {"behavior": "dropdown"})
+        assert render_performance(aggregate_session(BehaviorStore(tmp_path))) == ""
+
+    def test_summarize(self):
+        """summarize should give count, total, mean and percentiles."""
+        stats = summarize([10.0, 20.0, 30.0, 40.0])
+        assert stats["n"] == 4
+        assert stats["total_ms"] == 100.0
+        assert stats["mean_ms"] == 25.0
+        assert stats["p50"] == 20.0
+        assert stats["max"] == 40.0
@@ -8,6 +8,7 @@ import json
 import shutil
 from pathlib import Path
 from src.tools import generate_gherkin, generate_report
+from src.compact import parse
 from src.browser import close_browser
 
 
@@ -186,6 +187,79 @@ class TestGenerateReport:
         assert "Total elements tested:** 0" in content
 
 
+class FakeBatchManager:
+    """Manager whose hover_many answers from a canned list of results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.saved = []
+
+    async def hover_many(self, targets, workers=None, capture_screenshots=True, deadline=None):
+        return [dict(r) if r is not None else None for r in self.results]
+
+    def save_behavior(self, element_name, behavior_data):
+        self.saved.append((element_name, behavior_data["selector"]))
+        return len(self.saved)
+
+
+class TestHoverElementsBatch:
+    """Tests for hover_elements_batch with a stand-in manager (no browser needed)."""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        import src.browser
+        import src.tools
+        manager = FakeBatchManager([
+            {"selector": "#products", "behavior": "dropdown", "new_elements_count": 2,
+             "revealed_links": [{"text": "Saws", "href": "/saws"}]},
+            {"selector": "#gone", "behavior": "unreachable", "error": "element not found"},
+            {"selector": "#about", "behavior": "no_change"},
+            None,
+        ])
+
+        async def get_manager(headless=True, session_id=None):
+            return manager
+
+        monkeypatch.setattr(src.browser, "get_browser_manager", get_manager)
+        monkeypatch.setattr(src.tools, "schedule_refresh", lambda *args: False)
+        return manager
+
+    async def test_results_persisted_in_input_order(self, manager):
+        """Every hovered result is saved and IDs follow the input order."""
+        from src.tools import hover_elements_batch
+
+        result = await hover_elements_batch.ainvoke({"elements": [
+            {"selector": "#products", "description": "Products menu"},
+            {"selector": "#gone", "description": "Old banner"},
+            {"selector": "#about"},
+            {"selector": "#footer", "description": "Footer link"},
+        ]})
+        data = parse(result)
+
+        assert manager.saved == [("Products menu", "#products"), ("Old banner", "#gone"), ("#about", "#about")]
+        assert [row["id"] for row in data["results"]] == ["1", "2", "3"]
+        assert [row["sel"] for row in data["results"]] == ["#products", "#gone", "#about"]
+        assert data["links"] == [{"id": "1", "text": "Saws", "href": "/saws"}]
+
+    async def test_unreachable_and_skipped_listed(self, manager):
+        """Unreachable elements stay in the results table, unstarted ones in skipped."""
+        from src.tools import hover_elements_batch
+
+        result = await hover_elements_batch.ainvoke({"elements": [
+            {"selector": "#products", "description": "Products menu"},
+            {"selector": "#gone", "description": "Old banner"},
+            {"selector": "#about", "description": "About"},
+            {"selector": "#footer", "description": "Footer link"},
+        ], "max_seconds": 30})
+        data = parse(result)
+
+        assert data["tested"] == "3"
+        assert data["skipped"] == [{"desc": "Footer link", "sel": "#footer"}]
+        gone = data["results"][1]
+        assert gone["beh"] == "unreachable"
+        assert gone["error"] == "element not found"
+
+
 class TestToolIntegration:
     """Integration tests that require browser."""
 
@@ -206,14 +280,14 @@ class TestToolIntegration:
 
     @pytest.mark.asyncio
     async def test_find_elements_tool(self):
-        """find_hoverable_elements tool should return JSON."""
+        """find_hoverable_elements tool should return a compact table."""
         from src.tools import navigate_to_url, find_hoverable_elements
 
         await navigate_to_url.ainvoke("https://example.com")
         result = await find_hoverable_elements.ainvoke({})
 
-        # Should be valid JSON
-        elements = json.loads(result)
+        # Should decode to a table of hoverables
+        elements = parse(result).get("hoverables", [])
         assert isinstance(elements, list)
 
     @pytest.mark.asyncio
@@ -227,10 +301,10 @@ class TestToolIntegration:
             "description": "Docs navigation link"
         })
 
-        # Should be valid JSON
-        data = json.loads(result)
-        assert "behavior" in data
-        assert "element_description" in data
+        # Should decode to behavior fields
+        data = parse(result)
+        assert "beh" in data
+        assert data["desc"] == "Docs navigation link"
 
 
 class TestEndToEndWorkflow:
@@ -253,7 +327,7 @@ class TestEndToEndWorkflow:
 
         # 2. Find elements
         elements_json = await find_hoverable_elements.ainvoke({})
-        elements = json.loads(elements_json)
+        elements = parse(elements_json)["hoverables"]
         assert len(elements) > 0
 
         # 3. Hover on first element with text
@@ -266,10 +340,11 @@ class TestEndToEndWorkflow:
         behaviors = []
         if test_element:
             hover_result = await hover_element.ainvoke({
-                "selector": test_element["selector"],
+                "selector": test_element["sel"],
                 "description": test_element["text"]
             })
-            behaviors.append(json.loads(hover_result))
+            data = parse(hover_result)
+            behaviors.append({"selector": data["sel"], "element_description": data["desc"], "behavior": data["beh"]})
 
         # 4. Generate Gherkin
         gherkin = generate_gherkin.invoke(json.dumps(behaviors))
@@ -0,0 +1,103 @@
+"""
+Unit tests for the pixel-level screenshot diff.
+Skipped when NumPy/Pillow are not installed.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from src.browser import BrowserManager
+from src.visual_diff import compute_visual_diff, find_regions, label_cells
+
+
+def _save(path, array):
+    Image.fromarray(array.astype(np.uint8)).save(path)
+    return str(path)
+
+
+class TestFindRegions:
+    """Tests for changed-region bounding boxes."""
+
+    def test_separate_regions(self):
+        """Two distant blobs should give two tight boxes."""
+        mask = np.zeros((100, 200), dtype=bool)
+        mask[10:20, 10:30] = True
+        mask[60:90, 150:190] = True
+
+        regions = find_regions(mask)
+
+        assert len(regions) == 2
+        assert regions[0] == {"x": 150, "y": 60, "width": 40, "height": 30, "changed_pixels": 1200}
+        assert regions[1]["x"] == 10 and regions[1]["width"] == 20
+
+    def test_diagonal_cells_are_connected(self):
+        """Cells touching only at a corner belong to the same region."""
+        grid = np.zeros((5, 5), dtype=bool)
+        grid[0, 0] = grid[1, 1] = grid[2, 2] = True
+        grid[4, 0] = True
+        labels = label_cells(grid)
+        assert labels[0, 0] == labels[1, 1] == labels[2, 2]
+        assert labels[4, 0] not in (0, labels[0, 0])
+
+
+class TestComputeVisualDiff:
+    """Tests for the full before/after comparison."""
+
+    def test_identical_images_have_no_regions(self, tmp_path):
+        """Identical screenshots should report no change."""
+        img = np.full((60, 80, 3), 255)
+        before = _save(tmp_path / "before.png", img)
+        after = _save(tmp_path / "after.png", img)
+
+        result = compute_visual_diff(before, after)
+
+        assert result["changed_ratio"] == 0
+        assert result["regions"] == []
+        assert result["diff_image"] is None
+
+    def test_dropdown_region_is_cropped(self, tmp_path):
+        """A panel appearing should be boxed and saved as a diff crop."""
+        img = np.full((120, 160, 3), 255)
+        before = _save(tmp_path / "before.png", img)
+        img[40:100, 20:80] = (30, 30, 30)
+        after = _save(tmp_path / "after.png", img)
+
+        result = compute_visual_diff(before, after, output_dir=str(tmp_path))
+
+        assert result["bbox"] == {"x": 20, "y": 40, "width": 60, "height": 60}
+        assert result["changed_ratio"] == pytest.approx(3600 / (120 * 160), abs=1e-4)
+        crop = Image.open(result["diff_image"])
+        assert crop.size == (76, 76)
+        assert not list(tmp_path.rglob("*.tmp"))
+
+
+class TestHoverVisualDiff:
+    """Tests for BrowserManager._apply_visual_diff."""
+
+    def _result(self, tmp_path, changed, focus):
+        img = np.full((200, 300, 3), 255)
+        before = _save(tmp_path / "before.png", img)
+        y, x = changed
+        img[y:y + 20, x:x + 20] = (0, 0, 0)
+        after = _save(tmp_path / "after.png", img)
+        return {"behavior": "no_change", "screenshot_before": before, "screenshot_after": after,
+                "timings": {"total": 10.0}, "_visual_focus": focus}
+
+    async def test_change_on_element_is_style_change(self, tmp_path):
+        """A pixel change over the hovered element should count as its hover effect."""
+        manager = BrowserManager(output_dir=str(tmp_path))
+        result = await manager._apply_visual_diff(
+            self._result(tmp_path, (20, 20), {"x": 10, "y": 10, "width": 60, "height": 30}))
+        assert result["behavior"] == "style_change"
+        assert "_visual_focus" not in result
+        assert result["timings"]["total"] >= 10.0
+
+    async def test_change_elsewhere_is_ignored(self, tmp_path):
+        """An animation far from the element (e.g. a carousel) should not."""
+        manager = BrowserManager(output_dir=str(tmp_path))
+        result = await manager._apply_visual_diff(
+            self._result(tmp_path, (150, 250), {"x": 10, "y": 10, "width": 60, "height": 30}))
+        assert result["behavior"] == "no_change"
+        assert result["visual_diff"]["regions"] and not result["visual_diff"]["focus_regions"]